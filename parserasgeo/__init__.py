@@ -1,4 +1,5 @@
-from .prg import ParseRASGeo, CrossSectionNotFound
+from .prg import ParseRASGeo, CrossSectionNotFound, iter_features, transform
+from .registry import register_feature
 from .prplan import ParseRASPlan
 from .prprj import ParseRASProject
 from .prflow import UnsteadyFlow, SteadyFlow
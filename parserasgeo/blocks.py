@@ -0,0 +1,318 @@
+"""
+Block level access to geometry files.
+
+GeoBuffer holds the raw bytes of a geometry file, optionally memory mapped. scan_blocks() finds where every top
+level feature starts and ends in these bytes without decoding or importing it. LazyFeature holds one of these
+blocks and imports it the first time it is needed, this is what ParseRASGeo(lazy=True) stores in geo_list.
+"""
+import io
+import locale
+import mmap
+import os
+import re
+
+from .features.tools import is_changed, mark_unchanged
+from .registry import lookup_feature_at
+
+
+def decode(raw, encoding=None):
+    """
+    Decodes raw bytes from a geometry file the same way open(filename, 'rt') would
+
+    :param raw: bytes
+    :param encoding: defaults to the preferred encoding of the system
+    :return: string with '\n' line endings
+    """
+    if encoding is None:
+        encoding = locale.getpreferredencoding(False)
+    return raw.decode(encoding).replace('\r\n', '\n')
+
+
+def scan_blocks(data):
+    """
+    Splits a geometry file into top level features and unknown lines. Features are not imported.
+
+    :param data: bytes like object holding the geometry file, e.g. bytes or mmap
+    :return: generator of (FeatureType, start, end) byte offsets. FeatureType is None for unknown lines
+    """
+    size = len(data)
+    eol = data.find(b'\n')
+    # Blank lines are searched for as a line break followed by another one
+    if eol > 0 and data[eol - 1:eol] == b'\r':
+        blank = b'\n\r\n'
+    else:
+        blank = b'\n\n'
+
+    pos = 0
+    while pos < size:
+        eol = data.find(b'\n', pos)
+        eol = size if eol < 0 else eol + 1
+        feature_type = lookup_feature_at(data, pos, eol)
+        if feature_type is None:
+            yield None, pos, eol
+            pos = eol
+        elif feature_type.ends_before is None:
+            end = _blank_line_end(data, eol, blank)
+            yield feature_type, pos, end
+            pos = end
+        else:
+            end = _next_line_start(data, eol, feature_type.ends_before)
+            yield feature_type, pos, end
+            pos = end
+
+
+def _blank_line_end(data, pos, blank):
+    """
+    Returns offset of the end of the first blank line at or after pos, skipping over descriptions. This is
+    where nodes and river/reaches end. Returns len(data) if there is no blank line.
+    """
+    size = len(data)
+    while True:
+        end = data.find(blank, pos - 1)
+        end = size if end < 0 else end + len(blank)
+        # Descriptions may contain blank lines
+        begin = data.find(b'\nBEGIN DESCRIPTION:', pos - 1, end)
+        if begin < 0:
+            return end
+        pos = data.find(b'\nEND DESCRIPTION:', begin)
+        if pos < 0:
+            return size
+        pos += 1
+
+
+def _next_line_start(data, pos, prefixes):
+    """
+    Returns offset of the first line at or after pos that starts with one of prefixes (ignoring leading
+    whitespace), or len(data)
+    """
+    pattern = _patterns.get(prefixes)
+    if pattern is None:
+        alternatives = b'|'.join(re.escape(prefix.encode('ascii')) for prefix in prefixes)
+        pattern = _patterns[prefixes] = re.compile(b'\n[ \t]*(?:' + alternatives + b')')
+    match = pattern.search(data, pos - 1)
+    if match is None:
+        return len(data)
+    return match.start() + 1
+
+
+# ends_before prefixes -> compiled pattern
+_patterns = {}
+
+
+def node_station(data, start):
+    """
+    Returns the station of the node starting at start as text, e.g. '12345.6*' for
+    'Type RM Length L Ch R = 1 ,12345.6*,...'
+
+    :param data: bytes like object holding the geometry file
+    :param start: offset of the 'Type RM Length L Ch R =' line
+    :return: stripped station string
+    """
+    first = data.find(b',', start)
+    second = data.find(b',', first + 1)
+    return data[first + 1:second].decode('ascii').strip()
+
+
+class GeoBuffer(object):
+    """
+    Raw bytes of a geometry file
+    """
+    def __init__(self, filename, use_mmap=False):
+        """
+        :param filename: name of geometry file
+        :param use_mmap: if True the file is memory mapped instead of read into memory. Only the pages that are
+                         scanned or decoded are read from disk.
+        """
+        self.filename = filename
+        self._map = None
+        with open(filename, 'rb') as geo_file:
+            # Empty files can't be mapped
+            if use_mmap and os.fstat(geo_file.fileno()).st_size > 0:
+                self._map = mmap.mmap(geo_file.fileno(), 0, access=mmap.ACCESS_READ)
+                self.data = self._map
+            else:
+                self.data = geo_file.read()
+
+    def __len__(self):
+        return len(self.data)
+
+    def text(self, start, end):
+        """
+        Returns decoded text between byte offsets start and end
+        """
+        return decode(self.data[start:end])
+
+    def is_file(self, filename):
+        """
+        Returns True if filename is the file this buffer was read from
+        """
+        return os.path.exists(filename) and os.path.samefile(filename, self.filename)
+
+    def detach(self):
+        """
+        Copies a memory mapped file into memory and closes the map. Must be called before the file is
+        overwritten.
+        """
+        if self._map is not None:
+            self.data = self._map[:]
+            self._map.close()
+            self._map = None
+
+    def close(self):
+        """
+        Closes the memory map, if any. The buffer may not be used afterwards.
+        """
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self.data = b''
+
+
+def import_blocks(filename, blocks, debug=False):
+    """
+    Imports features from part of a geometry file. Used by ParseRASGeo(workers=N) in worker processes, the file
+    is memory mapped by each worker so only block offsets have to be sent to it.
+
+    :param filename: name of geometry file
+    :param blocks: list of (start, end, river, reach) of features, see scan_blocks()
+    :param debug: passed to the features
+    :return: list of imported features in the same order as blocks
+    """
+    buffer = GeoBuffer(filename, use_mmap=True)
+    try:
+        features = []
+        for start, end, river, reach in blocks:
+            eol = buffer.data.find(b'\n', start, end)
+            feature_type = lookup_feature_at(buffer.data, start, end if eol < 0 else eol + 1)
+            features.append(LazyFeature(feature_type, buffer, start, end, river, reach, debug).load())
+        return features
+    finally:
+        buffer.close()
+
+
+class LazyFeature(object):
+    """
+    A top level feature that has not been imported yet. See ParseRASGeo(lazy=True)
+    """
+    __slots__ = ('feature_type', 'buffer', 'start', 'end', 'river', 'reach', 'debug', 'station')
+
+    def __init__(self, feature_type, buffer, start, end, river, reach, debug=False, station=None):
+        """
+        :param feature_type: registry.FeatureType of the feature
+        :param buffer: GeoBuffer holding the geometry file
+        :param start: byte offset of first line of feature
+        :param end: byte offset of end of feature
+        :param river: name of river the feature is on
+        :param reach: name of reach the feature is on
+        :param station: station of nodes as text, see node_station(). None for other features
+        """
+        self.feature_type = feature_type
+        self.buffer = buffer
+        self.start = start
+        self.end = end
+        self.river = river
+        self.reach = reach
+        self.debug = debug
+        self.station = station
+
+    @property
+    def feature_class(self):
+        return self.feature_type.feature_class
+
+    def text(self):
+        """
+        Returns the original text of the feature
+        """
+        return self.buffer.text(self.start, self.end)
+
+    def load(self):
+        """
+        Imports the feature
+
+        :return: feature, e.g. a CrossSection
+        """
+        geo_file = io.StringIO(self.text())
+        feature = self.feature_type.factory(self.river, self.reach, self.debug)
+        feature.import_geo(next(geo_file), geo_file)
+        return feature
+
+    def __str__(self):
+        return self.text()
+
+    def __repr__(self):
+        return '<Lazy ' + self.feature_class.__name__ + ' at byte ' + str(self.start) + '>'
+
+
+def track_changes(feature):
+    """
+    Marks the parts of a feature that was just imported as unchanged, see features.tools.Part
+
+    :param feature: imported feature
+    :return: tuple of the items of its geo_list to pass to unchanged_since(), None if it has no geo_list
+    """
+    items = getattr(feature, 'geo_list', None)
+    if items is None:
+        return None
+    items = tuple(items)
+    for item in items:
+        if not isinstance(item, str):
+            mark_unchanged(item)
+    return items
+
+
+def unchanged_since(feature, items):
+    """
+    Returns True if feature has the same items in its geo_list as when track_changes() returned items and none of
+    its parts has been changed, i.e. its original text may be copied instead of calling str() on it
+    """
+    if items is None:
+        return False
+    geo_list = feature.geo_list
+    if len(geo_list) != len(items) or any([a is not b for a, b in zip(geo_list, items)]):
+        return False
+    return not any([is_changed(item) for item in items if not isinstance(item, str)])
+
+
+class SourceTracker(object):
+    """
+    Blocks of a geometry file that imported features came from. Parts of the features are marked as unchanged when
+    they are added, see features.tools.Part. A feature with the same items in its geo_list and no changed part at
+    write time has not been changed and its original text can be copied instead of calling str() on it.
+    """
+    def __init__(self, filename):
+        """
+        :param filename: name of geometry file the features are imported from
+        """
+        self.filename = filename
+        stat = os.stat(filename)
+        self._stat = (stat.st_size, stat.st_mtime_ns)
+        # id(feature) -> (feature, start, end, tuple of the items of its geo_list)
+        self._features = {}
+
+    def add(self, feature, start, end):
+        """
+        Records that feature was just imported from bytes start to end of the file
+        """
+        items = track_changes(feature)
+        if items is not None:
+            self._features[id(feature)] = (feature, start, end, items)
+
+    def source_unchanged(self):
+        """
+        Returns True if the geometry file has not been changed since the features were imported
+        """
+        try:
+            stat = os.stat(self.filename)
+        except OSError:
+            return False
+        return (stat.st_size, stat.st_mtime_ns) == self._stat
+
+    def clean_span(self, feature):
+        """
+        Returns (start, end) of the original text of feature if it has not been changed since it was imported,
+        otherwise None
+        """
+        entry = self._features.get(id(feature))
+        if entry is None or entry[0] is not feature or not unchanged_since(feature, entry[3]):
+            return None
+        return entry[1], entry[2]
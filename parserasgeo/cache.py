@@ -0,0 +1,157 @@
+"""
+On disk cache of imported geometry files, see ParseRASGeo(cache=...).
+
+Entries are pickled geo_lists stored in a cache directory. An entry is keyed on the size, modification time and
+SHA-1 of the geometry file, so any change to the file is a miss. Entries are evicted by age and by total size of
+the cache every time an entry is stored, or explicitly with evict().
+"""
+import gc
+import hashlib
+import os
+import pickle
+import tempfile
+import time
+
+# Bump when the pickled form of features changes, old entries are then ignored
+CACHE_VERSION = 7
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'parserasgeo')
+MAX_CACHE_BYTES = 2 * 1024 ** 3
+MAX_CACHE_AGE = 30 * 24 * 3600  # seconds
+
+_SUFFIX = '.geo.pickle'
+
+
+def cache_dir_for(cache):
+    """
+    Returns the cache directory for the cache argument of ParseRASGeo
+
+    :param cache: True for DEFAULT_CACHE_DIR, or name of directory
+    :return: name of directory
+    """
+    if cache is True:
+        return DEFAULT_CACHE_DIR
+    return cache
+
+
+def cache_key(geo_filename):
+    """
+    Returns key of the cache entry for geo_filename
+
+    :param geo_filename: name of geometry file
+    :return: hex string
+    """
+    stat = os.stat(geo_filename)
+    content = hashlib.sha1()
+    with open(geo_filename, 'rb') as geo_file:
+        for chunk in iter(lambda: geo_file.read(1024 * 1024), b''):
+            content.update(chunk)
+    key = hashlib.sha1((str(stat.st_size) + ' ' + str(stat.st_mtime_ns) + ' ' + content.hexdigest() + ' ' +
+                        str(CACHE_VERSION)).encode('ascii'))
+    return key.hexdigest()
+
+
+def load(cache_dir, key):
+    """
+    Returns the geo_list cached under key, or None if there is no usable entry
+
+    :param cache_dir: name of cache directory
+    :param key: see cache_key()
+    :return: list or None
+    """
+    filename = os.path.join(cache_dir, key + _SUFFIX)
+    # Unpickling creates many small objects, collecting garbage in between roughly doubles the load time
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        with open(filename, 'rb') as entry:
+            version, geo_list = pickle.load(entry)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, ValueError):
+        return None
+    finally:
+        if gc_enabled:
+            gc.enable()
+    if version != CACHE_VERSION:
+        return None
+    # Age is measured from the last use. The entry may have been evicted since or the cache may be read only, it
+    # is still used.
+    try:
+        os.utime(filename)
+    except OSError:
+        pass
+    return geo_list
+
+
+def store(cache_dir, key, geo_list, max_bytes=MAX_CACHE_BYTES, max_age=MAX_CACHE_AGE):
+    """
+    Stores geo_list under key and evicts old entries, see evict(). Nothing is stored if the cache directory can
+    not be written, e.g. it is read only or the disk is full.
+
+    :param cache_dir: name of cache directory, created if needed
+    :param key: see cache_key()
+    :param geo_list: ParseRASGeo.geo_list, must not hold blocks.LazyFeatures
+    :return: True if geo_list was stored
+    """
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Written to a temporary file first so a concurrent reader never sees a partial entry
+        handle, temp_filename = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+    except OSError:
+        return False
+    try:
+        with os.fdopen(handle, 'wb') as entry:
+            pickle.dump((CACHE_VERSION, geo_list), entry, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_filename, os.path.join(cache_dir, key + _SUFFIX))
+    except BaseException as error:
+        try:
+            os.remove(temp_filename)
+        except OSError:
+            pass
+        if isinstance(error, OSError):
+            return False
+        raise
+    evict(cache_dir, max_bytes=max_bytes, max_age=max_age)
+    return True
+
+
+def evict(cache_dir=DEFAULT_CACHE_DIR, max_bytes=MAX_CACHE_BYTES, max_age=MAX_CACHE_AGE):
+    """
+    Removes entries that were last used more than max_age seconds ago, then removes the least recently used
+    entries until the cache holds no more than max_bytes.
+
+    :param cache_dir: name of cache directory
+    :param max_bytes: maximum total size of entries, None for no limit
+    :param max_age: maximum seconds since an entry was last used, None for no limit
+    :return: number of entries removed
+    """
+    try:
+        names = os.listdir(cache_dir)
+    except OSError:
+        return 0
+
+    entries = []
+    for name in names:
+        if not name.endswith(_SUFFIX):
+            continue
+        filename = os.path.join(cache_dir, name)
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, filename))
+    entries.sort()
+
+    now = time.time()
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for last_used, size, filename in entries:
+        too_old = max_age is not None and now - last_used > max_age
+        too_big = max_bytes is not None and total > max_bytes
+        if not (too_old or too_big):
+            continue
+        try:
+            os.remove(filename)
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    return removed
@@ -0,0 +1,173 @@
+"""
+In memory indexes of the features in ParseRASGeo.geo_list, used by get_cross_sections(), get_culverts(), etc.
+
+Features are indexed by class and (river, reach), by station id, and per reach by station value in a sorted list
+so station ranges are found with bisect. The index holds positions in geo_list rather than features, so
+LazyFeatures that are imported and replaced in geo_list stay indexed. It is rebuilt when features are added to,
+removed from or replaced in geo_list or their river, reach or station changes. The count of these changes is the
+generation of geo_list, a features.tools.IndexedList, so changes to one geometry do not rebuild the indexes of
+another.
+"""
+from bisect import bisect_left, bisect_right
+
+from .blocks import LazyFeature
+from .features import RiverReach
+from .features.station import Station
+from .features.tools import IndexedList
+
+
+def describe(item):
+    """
+    Returns the class, river, reach, station id and station value of a feature or LazyFeature. Values that do
+    not apply to the feature are None.
+
+    :param item: feature or blocks.LazyFeature
+    :return: (feature class, river, reach, station id, station value)
+    """
+    if type(item) is LazyFeature:
+        feature_class = item.feature_class
+        river, reach = item.river, item.reach
+        station = None if item.station is None else Station(item.station)
+    else:
+        feature_class = type(item)
+        if isinstance(item, RiverReach):
+            river, reach = item.header.river_name, item.header.reach_name
+        else:
+            river, reach = getattr(item, 'river', None), getattr(item, 'reach', None)
+        station = getattr(getattr(item, 'header', None), 'station', None)
+
+    if isinstance(station, Station):
+        return feature_class, river, reach, station.id, station.value
+    # Culverts, bridges and lateral weirs store the station as a number
+    return feature_class, river, reach, None, station
+
+
+def adopt(geo_list, item):
+    """
+    Registers a feature and its header with geo_list, so setting their river, reach or station rebuilds the
+    FeatureIndex of geo_list. Does nothing for LazyFeatures, which are registered once imported, or if geo_list is
+    not an IndexedList.
+
+    :param geo_list: ParseRASGeo.geo_list
+    :param item: feature or blocks.LazyFeature in geo_list
+    """
+    if type(item) is LazyFeature or not isinstance(geo_list, IndexedList):
+        return
+    geo_list.adopt(item)
+    header = getattr(item, 'header', None)
+    if header is not None:
+        geo_list.adopt(header)
+
+
+class FeatureIndex(object):
+    """
+    Positions of the features in a geo_list, see module docstring
+    """
+    def __init__(self, geo_list):
+        """
+        :param geo_list: ParseRASGeo.geo_list
+        """
+        self.geo_list = geo_list
+        self.size = len(geo_list)
+        self.generation = getattr(geo_list, 'generation', None)
+        # feature class -> {(river, reach): [positions]}
+        self._by_reach = {}
+        # feature class -> {station id: [positions]}
+        self._by_id = {}
+        # feature class -> {(river, reach): ([station values], [positions])}, sorted by station value
+        self._by_value = {}
+
+        values = {}
+        for position, item in enumerate(geo_list):
+            if isinstance(item, str):
+                continue
+            adopt(geo_list, item)
+            feature_class, river, reach, station_id, station_value = describe(item)
+            self._by_reach.setdefault(feature_class, {}).setdefault((river, reach), []).append(position)
+            if station_id is not None:
+                self._by_id.setdefault(feature_class, {}).setdefault(station_id, []).append(position)
+            if station_value is not None:
+                values.setdefault(feature_class, {}).setdefault((river, reach), []).append((station_value, position))
+
+        for feature_class, reaches in values.items():
+            by_value = self._by_value[feature_class] = {}
+            for key, pairs in reaches.items():
+                pairs.sort()
+                by_value[key] = ([value for value, _ in pairs], [position for _, position in pairs])
+
+    def is_current(self, geo_list):
+        """
+        Returns False if geo_list is not the list that was indexed, its length has changed or an indexed value
+        has changed since
+        """
+        return (geo_list is self.geo_list and len(geo_list) == self.size and
+                getattr(geo_list, 'generation', None) == self.generation)
+
+    def positions(self, feature_class, river=None, reach=None, station_id=None, station_value=None):
+        """
+        Returns the positions in geo_list of the features that may match. Features are not checked against river
+        and reach when station_id is given, callers must filter the features.
+
+        :param feature_class: class of features, subclasses are included
+        :param river: Optional string of the name of river
+        :param reach: Optional string of the name of reach
+        :param station_id: Optional string of the station as text
+        :param station_value: Optional number or 2-tuple (low, high) of numbers or None
+        :return: sorted list of positions
+        """
+        if station_value is not None and not isinstance(station_value, tuple):
+            station_value = (station_value, station_value)
+
+        result = []
+        for indexed_class, reaches in self._by_reach.items():
+            if not issubclass(indexed_class, feature_class):
+                continue
+            if station_id is not None:
+                result.extend(self._by_id.get(indexed_class, {}).get(station_id, ()))
+            elif station_value is not None:
+                by_value = self._by_value.get(indexed_class, {})
+                low, high = station_value
+                for key in _matching_keys(by_value, river, reach):
+                    values, positions = by_value[key]
+                    first = 0 if low is None else bisect_left(values, low)
+                    last = len(values) if high is None else bisect_right(values, high)
+                    result.extend(positions[first:last])
+            else:
+                for key in _matching_keys(reaches, river, reach):
+                    result.extend(reaches[key])
+        result.sort()
+        return result
+
+    def nearest(self, feature_classes, river, reach, station_value, tolerance):
+        """
+        Returns the position in geo_list of the feature on river and reach whose station value is closest to
+        station_value, or None if there is none within tolerance
+
+        :param feature_classes: class or tuple of classes of features, subclasses are included
+        :param river: name of river
+        :param reach: name of reach
+        :param station_value: number
+        :param tolerance: largest difference between station values that is a match
+        :return: position or None
+        """
+        best = None
+        for indexed_class, by_value in self._by_value.items():
+            if not issubclass(indexed_class, feature_classes) or (river, reach) not in by_value:
+                continue
+            values, positions = by_value[(river, reach)]
+            i = bisect_left(values, station_value - tolerance)
+            while i < len(values) and values[i] <= station_value + tolerance:
+                distance = abs(values[i] - station_value)
+                if best is None or distance < best[0]:
+                    best = (distance, positions[i])
+                i += 1
+        return None if best is None else best[1]
+
+
+def _matching_keys(reaches, river, reach):
+    """
+    Returns the (river, reach) keys of reaches that match river and reach, which may be None for any
+    """
+    if river is not None and reach is not None:
+        return [(river, reach)] if (river, reach) in reaches else []
+    return [key for key in reaches if (river is None or key[0] == river) and (reach is None or key[1] == reach)]
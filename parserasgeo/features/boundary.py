@@ -1,13 +1,15 @@
-from .feature import Feature
+from .feature import CompositeFeature, Feature
 from .station import Station
-from .tools import pad_left, print_list_by_group, split_by_n
+from .tools import pad_left, format_block, split_by_n
 
 
-class Boundary(Feature):
+class Boundary(CompositeFeature):
     """
     Boundary condition.
     """
 
+    items_attribute = 'uflow_list'
+
     def __init__(self):
         # Load all boundary parts
         self.header = Header()
@@ -41,9 +43,6 @@ class Boundary(Feature):
                 break
         return line
 
-    def __str__(self):
-        return "".join((str(l) for l in self.uflow_list))
-
 
 class Header(Feature):
     def __init__(self):
@@ -109,7 +108,7 @@ class Hydrograph(Feature):
         return line
 
     def __str__(self):
-        s = "Hydrograph=" + print_list_by_group(self.values, 8, 10)
+        s = "Hydrograph=" + format_block(self.values, 8, 10)
         return s
 
 
@@ -1,5 +1,6 @@
-from .tools import fl_int #  , split_by_n_str, pad_left, print_list_by_group, split_block_obs, split_by_n
+from .tools import fl_int, Indexed, Part #  , split_by_n_str, pad_left, print_list_by_group, split_block_obs, split_by_n
 from .description import Description
+from .feature import CompositeFeature
 
 
 class Feature(object):
@@ -23,10 +24,11 @@ class Feature(object):
 
 
 # TODO: possibly move header into Bridge
-class Header(object):
+class Header(Part):
+    station = Indexed()
+
     def __init__(self):
 
-        self.station = None
         self.node_type = None
         self.value1 = None
         self.value2 = None
@@ -62,7 +64,12 @@ class Header(object):
         return s
 
 
-class Bridge(object):
+class Bridge(CompositeFeature):
+    end_text = '\n'
+
+    river = Indexed()
+    reach = Indexed()
+
     def __init__(self, river, reach):
         self.river = river
         self.reach = reach
@@ -94,12 +101,6 @@ class Bridge(object):
                 line = next(geo_file)
         return line
 
-    def __str__(self):
-        s = ''
-        for line in self.geo_list:
-            s += str(line)
-        return s + '\n'
-
     @staticmethod
     def test(line):
         return Header.test(line)
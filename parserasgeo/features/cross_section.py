@@ -1,7 +1,12 @@
-from .tools import fl_int, split_by_n_str, pad_left, print_list_by_group, split_block_obs, split_by_n
+from .tools import (fl_int, pad_left, format_block, read_block, split_fields, count_fields, decode_fixed,
+                    decode_floats, Decoded, Indexed, OptionalPart, OriginalBlock, Part)
+from .points import PointsView, number
 from .description import Description
+from .feature import CompositeFeature
 from .station import Station
 from math import sqrt, cos, radians
+from array import array
+from bisect import bisect_left
 
 # Global debug, this is set when initializing CrossSection
 DEBUG = False
@@ -31,10 +36,12 @@ class Feature(object):
     def __str__(self):
         pass
 
-class Levee(object):
+class Levee(Part):
     """
     Levees. This is poorly implemented and only grabs the line past the "=" as a string
     """
+    __slots__ = ('value',)
+
     def __init__(self):
         self.value = None
 
@@ -51,11 +58,13 @@ class Levee(object):
     def __str__(self):
         return 'Levee=' + self.value  # + '\n' - not needed since it's just a dumb string (with the \n)
 
-class RatingCurve(object):
+class RatingCurve(Part):
     """
     Rating Curves. This is poorly implemented and only grabs the values on the first line and not the
     curve itself.
     """
+    __slots__ = ('value1', 'value2')
+
     def __init__(self):
         self.value1 = None
         self.value2 = None
@@ -76,10 +85,12 @@ class RatingCurve(object):
         return 'XS Rating Curve= ' + str(self.value1) + ' ,' + str(self.value2) + '\n'
 
 
-class Skew(object):
+class Skew(Part):
     """
     Cross section skew angle
     """
+    __slots__ = ('angle',)
+
     def __init__(self):
         self.angle = None
 
@@ -98,9 +109,12 @@ class Skew(object):
 
 
 # TODO: possibly move header into CrossSection
-class Header(object):
+class Header(Part):
+    __slots__ = ('_station', 'node_type', 'lob_length', 'channel_length', 'rob_length')
+
+    station = Indexed()
+
     def __init__(self):
-        self.station = None
         self.node_type = None
         self.lob_length = None
         self.channel_length = None
@@ -149,8 +163,13 @@ class Header(object):
         return s
 
 
-class CutLine(object):
+class CutLine(Part):
+    __slots__ = ('_raw', 'number_pts', '_points')
+
+    points = Decoded()
+
     def __init__(self):
+        self._raw = None  # lines of the points until they are decoded
         self.number_pts = None
         self.points = []  # [(x1,y1),(x2,y2),(x3,y3),...] Values are currently stored as strings
 
@@ -164,17 +183,23 @@ class CutLine(object):
         vals = line.split('=')
         assert vals[0] == 'XS GIS Cut Line' and len(vals) == 2
         self.number_pts = int(vals[1])
-        line = next(geo_file)
-        while line[:1] == ' ' or line[:1].isdigit() or line[:1] == '-' or line[:1] == '.':
-            vals = split_by_n_str(line, 16)
-            for i in range(0, len(vals), 2):
-                self.points.append((vals[i], vals[i + 1]))
-            line = next(geo_file)
-        assert self.points != []
+        lines, line = read_block(next(geo_file), geo_file)
+        assert count_fields(lines, 16) >= 2
+        self._raw = lines
         return line
 
+    def decode(self):
+        """
+        Decodes the points from the lines read by import_geo()
+        """
+        lines, self._raw = self._raw, None
+        vals = split_fields(lines, 16)
+        self._points = list(zip(vals[0::2], vals[1::2]))
+
     def __str__(self):
         s = 'XS GIS Cut Line=' + str(self.number_pts) + '\n'
+        if self._raw is not None:
+            return s + ''.join(self._raw)
         pts = [self.points[i:i + 2] for i in range(0, len(self.points), 2)]
         for pt in pts:
             if len(pt) == 2:
@@ -188,9 +213,36 @@ class LastEdit(object):
     pass
 
 
-class StationElevation(object):
+class StationElevation(Part):
+    """
+    Cross section station/elevation points. Stations and elevations are stored in two arrays of doubles, points
+    is a list of (sta, elev) tuples view of them for code that works on tuples. The points are decoded on first
+    access.
+    """
+    __slots__ = ('_raw', '_stations', '_elevations', '_original')
+
+    stations = Decoded()
+    elevations = Decoded()
+    original = Decoded()
+
     def __init__(self):
-        self.points = []  # [(sta0, elev0), (sta1, elev1), ... ] Values stored as float/int
+        self._raw = None  # lines of the points until they are decoded
+        self.stations = array('d')
+        self.elevations = array('d')
+        self.original = None  # tools.OriginalBlock of the points as read
+
+    @property
+    def points(self):
+        """
+        [(sta0, elev0), (sta1, elev1), ... ] Values are float/int. Changes to the list change the arrays.
+        """
+        return PointsView(self, 'stations', 'elevations')
+
+    @points.setter
+    def points(self, points):
+        points = list(points)
+        self.stations = array('d', [pt[0] for pt in points])
+        self.elevations = array('d', [pt[1] for pt in points])
 
     @staticmethod
     def test(line):
@@ -205,12 +257,75 @@ class StationElevation(object):
         :param sta: float, station of interest
         :return: double, elevation
         """
-        # TODO - implement more efficient search
-        for pt in self.points:
-            if pt[0] == sta:
-                return pt[1]
-        raise AttributeError('No station matching ' + str(sta) + ' in current XS.')
+        try:
+            return number(self.elevations[self.stations.index(sta)])
+        except ValueError:
+            raise AttributeError('No station matching ' + str(sta) + ' in current XS.')
+
+    def shift(self, elevation=0, station=0):
+        """
+        Adds elevation to all elevations and station to all stations
+        """
+        if elevation:
+            self.elevations = array('d', [elev + elevation for elev in self.elevations])
+        if station:
+            self.stations = array('d', [sta + station for sta in self.stations])
+
+    def scale(self, elevation=1, station=1):
+        """
+        Multiplies all elevations by elevation and all stations by station
+        """
+        if elevation != 1:
+            self.elevations = array('d', [elev * elevation for elev in self.elevations])
+        if station != 1:
+            self.stations = array('d', [sta * station for sta in self.stations])
+
+    def clip(self, low=None, high=None):
+        """
+        Limits elevations to the range low to high. Either may be None for no limit.
+        """
+        elevations = self.elevations
+        if low is not None:
+            elevations = [max(elev, low) for elev in elevations]
+        if high is not None:
+            elevations = [min(elev, high) for elev in elevations]
+        self.elevations = array('d', elevations)
+
+    def min_elevation(self):
+        """
+        Returns lowest elevation, e.g. the thalweg
+        """
+        return number(min(self.elevations))
 
+    def max_elevation(self):
+        """
+        Returns highest elevation
+        """
+        return number(max(self.elevations))
+
+    def resample(self, stations):
+        """
+        Replaces the points with points at stations, elevations are interpolated linearly between the current
+        points. Stations outside of the current points take the elevation of the first or last point.
+
+        :param stations: iterable of stations in increasing order
+        """
+        old_stations = self.stations
+        old_elevations = self.elevations
+        new_stations = array('d', stations)
+        new_elevations = array('d')
+        for sta in new_stations:
+            i = bisect_left(old_stations, sta)
+            if i == 0:
+                new_elevations.append(old_elevations[0])
+            elif i == len(old_stations):
+                new_elevations.append(old_elevations[-1])
+            else:
+                sta0, sta1 = old_stations[i - 1], old_stations[i]
+                elev0, elev1 = old_elevations[i - 1], old_elevations[i]
+                new_elevations.append(elev0 + (elev1 - elev0) * (sta - sta0) / (sta1 - sta0))
+        self.stations = new_stations
+        self.elevations = new_elevations
 
     def import_geo(self, line, geo_file):
         """
@@ -220,33 +335,51 @@ class StationElevation(object):
         :return: line in geo_file after sta/elev data
         """
         num_pts = int(line[10:])
-        line = next(geo_file)
-        while line[:1] == ' ' or line[:1].isdigit() or line[:1] == '-' or line[:1] == '.':
-            vals = split_by_n(line, 8)
-            for i in range(0, len(vals), 2):
-                self.points.append((vals[i], vals[i + 1]))
-            line = next(geo_file)
+        lines, line = read_block(next(geo_file), geo_file)
+        num_values = count_fields(lines, 8)
         if DEBUG:
-            print('len(self.points)=', len(self.points), 'num_pts=', num_pts)
-        assert len(self.points) == num_pts
+            print('len(self.points)=', num_values // 2, 'num_pts=', num_pts)
+        assert num_values == 2 * num_pts
+        self._raw = lines
         return line
 
+    def decode(self):
+        """
+        Decodes the points from the lines read by import_geo()
+        """
+        lines, self._raw = self._raw, None
+        vals = decode_floats(lines, 8)
+        self._stations = vals[0::2]
+        self._elevations = vals[1::2]
+        self._original = OriginalBlock(lines, 8, vals)
+
     def __str__(self):
-        s = '#Sta/Elev= ' + str(len(self.points)) + ' \n'
-        # unpack tuples
-        sta_elev_list = [x for tup in self.points for x in tup]
+        if self._raw is not None:
+            return '#Sta/Elev= ' + str(count_fields(self._raw, 8) // 2) + ' \n' + ''.join(self._raw)
+        s = '#Sta/Elev= ' + str(len(self.stations)) + ' \n'
+        # interleave stations and elevations
+        sta_elev_list = [None] * (2 * len(self.stations))
+        sta_elev_list[0::2] = self.stations
+        sta_elev_list[1::2] = self.elevations
         # convert to padded columns of 8
-        temp_str = print_list_by_group(sta_elev_list, 8, 10)
+        temp_str = format_block(sta_elev_list, 8, 10, self.original)
         s += temp_str
         return s
 
 
-class IEFA(object):
+class IEFA(Part):
+    __slots__ = ('_raw', 'num_iefa', 'type', '_iefa_list', 'iefa_permanence', '_original')
+
+    iefa_list = Decoded()
+    original = Decoded()
+
     def __init__(self):
+        self._raw = None  # lines of iefa_list until they are decoded
         self.num_iefa = None
         self.type = None
         self.iefa_list = []
         self.iefa_permanence = []
+        self.original = None  # tools.OriginalBlock of iefa_list as read
 
     @staticmethod
     def test(line):
@@ -258,15 +391,11 @@ class IEFA(object):
         values = line.split(',')
         self.num_iefa = int(values[0][-3:])
         self.type = int(values[1])
-        line = next(geo_file)
-        # Due to possible blank lines in geometry file, all data must be treated as a string
-        while line[:1] == ' ' or line[:1].isdigit() or line[:1] == '-' or line[:1] == '.':
-            values = split_block_obs(line, 8)
-            assert len(values) % 3 == 0
-            for i in range(0, len(values), 3):
-                self.iefa_list.append((values[i], values[i + 1], values[i + 2]))
-            line = next(geo_file)
-        assert self.num_iefa == len(self.iefa_list)
+        lines, line = read_block(next(geo_file), geo_file)
+        num_values = count_fields(lines, 8)
+        assert num_values % 3 == 0
+        assert self.num_iefa == num_values // 3
+        self._raw = lines
 
         # Process IEFA permanence
         if line != 'Permanent Ineff=\n':
@@ -282,14 +411,27 @@ class IEFA(object):
                 else:
                     raise ValueError(value + ' found in IEFA permanence filed. Should be T or F. Aborting')
             line = next(geo_file)
-        assert len(self.iefa_list) == len(self.iefa_permanence)
+        assert self.num_iefa == len(self.iefa_permanence)
 
         return line
 
+    def decode(self):
+        """
+        Decodes iefa_list from the lines read by import_geo()
+        """
+        lines, self._raw = self._raw, None
+        # Due to possible blank lines in geometry file, blank values are kept as ''
+        values = decode_fixed(lines, 8, blanks=True)
+        self._iefa_list = list(zip(values[0::3], values[1::3], values[2::3]))
+        self._original = OriginalBlock(lines, 8, values)
+
     def __str__(self):
-        temp_iefa = [x for tup in self.iefa_list for x in tup]
         s = '#XS Ineff= ' + str(self.num_iefa) + ' ,' + pad_left(self.type, 2) + ' \n'
-        s += print_list_by_group(temp_iefa, 8, 9)
+        if self._raw is not None:
+            s += ''.join(self._raw)
+        else:
+            temp_iefa = [x for tup in self.iefa_list for x in tup]
+            s += format_block(temp_iefa, 8, 9, self.original)
         s += 'Permanent Ineff=\n'
         for value in self.iefa_permanence:
             if value:
@@ -300,11 +442,18 @@ class IEFA(object):
         return s
 
 
-class Obstruction(object):
+class Obstruction(Part):
+    __slots__ = ('_raw', 'num_blocked', 'blocked_type', '_blocked', '_original')
+
+    blocked = Decoded()
+    original = Decoded()
+
     def __init__(self):
+        self._raw = None  # lines of blocked until they are decoded
         self.num_blocked = None
         self.blocked_type = None
         self.blocked = []  # [(start_sta1, end_sta1, elev1), (start_sta2, end_sta2, elev2), ...]
+        self.original = None  # tools.OriginalBlock of blocked as read
 
     @staticmethod
     def test(line):
@@ -317,28 +466,43 @@ class Obstruction(object):
         self.num_blocked = int(values[0][-3:])
         self.blocked_type = int(values[1])
 
-        line = next(geo_file)
-        # Due to possible missing elevation all values must be treated as strings
-        while line[:1] == ' ' or line[:1].isdigit() or line[:1] == '-' or line[:1] == '.':
-            values = split_block_obs(line, 8)
-            assert len(values) % 3 == 0
-            for i in range(0, len(values), 3):
-                self.blocked.append((values[i], values[i + 1], values[i + 2]))
-            line = next(geo_file)
-        assert self.num_blocked == len(self.blocked)
+        lines, line = read_block(next(geo_file), geo_file)
+        num_values = count_fields(lines, 8)
+        assert num_values % 3 == 0
+        assert self.num_blocked == num_values // 3
+        self._raw = lines
         return line
 
+    def decode(self):
+        """
+        Decodes blocked from the lines read by import_geo()
+        """
+        lines, self._raw = self._raw, None
+        # Due to possible missing elevation, blank values are kept as ''
+        values = decode_fixed(lines, 8, blanks=True)
+        self._blocked = list(zip(values[0::3], values[1::3], values[2::3]))
+        self._original = OriginalBlock(lines, 8, values)
+
     def __str__(self):
+        s = '#Block Obstruct= ' + str(self.num_blocked) + ' ,' + pad_left(self.blocked_type, 2) + ' \n'
+        if self._raw is not None:
+            return s + ''.join(self._raw)
         # unpack tuples
         blocked_list = [x for tup in self.blocked for x in tup]
-        s = '#Block Obstruct= ' + str(self.num_blocked) + ' ,' + pad_left(self.blocked_type, 2) + ' \n'
-        s += print_list_by_group(blocked_list, 8, 9)
+        s += format_block(blocked_list, 8, 9, self.original)
         return s
 
 
-class Mannings_n(object):
+class Mannings_n(Part):
+    __slots__ = ('_raw', '_values', '_original', 'horizontal')
+
+    values = Decoded()
+    original = Decoded()
+
     def __init__(self):
+        self._raw = None  # lines of values until they are decoded
         self.values = []  # [(sta1, n1, 0), (sta2, n2, 0), ...]
+        self.original = None  # tools.OriginalBlock of values as read
         self.horizontal = None  # 0 or -1
 
     @staticmethod
@@ -356,25 +520,32 @@ class Mannings_n(object):
         self.horizontal = values[1]
 
         # Parse stations and n-values
-        line = next(geo_file)
-
-        # Make sure we're still reading n-values
-        while line[:1] == ' ' or line[:1].isdigit() or line[:1] == '-'or line[:1] == '.':
-            values = split_by_n(line, 8)
-            if len(values) % 3 != 0:
-                raise ValueError ('Error processing n-values: ' + line + '\n' + str(values))
-            for i in range(0, len(values), 3):
-                self.values.append((values[i], values[i + 1], values[i + 2]))
-            line = next(geo_file)
-        assert test_length == len(self.values)
+        lines, line = read_block(next(geo_file), geo_file)
+        num_values = count_fields(lines, 8)
+        if num_values % 3 != 0:
+            raise ValueError('Error processing n-values: ' + ''.join(lines))
+        assert test_length == num_values // 3
+        self._raw = lines
         return line
 
+    def decode(self):
+        """
+        Decodes values from the lines read by import_geo()
+        """
+        lines, self._raw = self._raw, None
+        values = decode_fixed(lines, 8)
+        self._values = list(zip(values[0::3], values[1::3], values[2::3]))
+        self._original = OriginalBlock(lines, 8, values)
+
     def __str__(self):
+        if self._raw is not None:
+            return ('#Mann= ' + str(count_fields(self._raw, 8) // 3) + ' ,{:>2} , 0 \n'.format(self.horizontal) +
+                    ''.join(self._raw))
         s = '#Mann= ' + str(len(self.values)) + ' ,{:>2} , 0 \n'.format(self.horizontal)
         # n-values - unpack tuples
         n_list = [x for tup in self.values for x in tup]
         # convert to padded columns of 8
-        temp_str = print_list_by_group(n_list, 8, 9)
+        temp_str = format_block(n_list, 8, 9, self.original)
         s += temp_str
         return s
 
@@ -418,7 +589,9 @@ class Mannings_n(object):
             return None
 
 
-class BankStation(object):
+class BankStation(Part):
+    __slots__ = ('left', 'right')
+
     def __init__(self):
         self.left = None
         self.right = None
@@ -441,7 +614,9 @@ class BankStation(object):
         return 'Bank Sta=' + str(self.left) + ',' + str(self.right) + '\n'
 
 # TODO: implement contraction/expansion
-class ExpansionContraction(object):
+class ExpansionContraction(Part):
+    __slots__ = ('exp_coeff', 'contract_coeff')
+
     def __init__(self):
         self.exp_coeff = None
         self.contract_coeff = None
@@ -459,7 +634,34 @@ class ExpansionContraction(object):
         pass
 
 
-class CrossSection(object):
+class CrossSection(CompositeFeature):
+    __slots__ = ('_river', '_reach', '_header', '_description', '_cutline', '_iefa', '_mannings_n', '_obstruct',
+                 '_bank_sta', '_sta_elev', '_skew', '_levee', '_rating_curve', 'geo_list', 'channel_n',
+                 'is_interpolated')
+
+    end_text = '\n'
+
+    river = Indexed()
+    reach = Indexed()
+
+    # Cross section parts, only created if the cross section has them
+    # TODO: Add "Node Name=" tag, see harvard gulch/dry gulch for example
+    header = OptionalPart(Header)
+    description = OptionalPart(Description)
+    cutline = OptionalPart(CutLine)
+    iefa = OptionalPart(IEFA)
+    mannings_n = OptionalPart(Mannings_n)
+    obstruct = OptionalPart(Obstruction)
+    bank_sta = OptionalPart(BankStation)
+    sta_elev = OptionalPart(StationElevation)
+    skew = OptionalPart(Skew)
+    levee = OptionalPart(Levee)
+    rating_curve = OptionalPart(RatingCurve)
+    # (attribute, class) of the parts in the order lines are tested against them
+    part_types = [('header', Header), ('description', Description), ('cutline', CutLine), ('iefa', IEFA),
+                  ('mannings_n', Mannings_n), ('obstruct', Obstruction), ('bank_sta', BankStation),
+                  ('sta_elev', StationElevation), ('skew', Skew), ('levee', Levee), ('rating_curve', RatingCurve)]
+
     def __init__(self, river, reach, debug=False):
         # Set global debug
         global DEBUG
@@ -468,21 +670,8 @@ class CrossSection(object):
         self.river = river
         self.reach = reach
 
-        # Load all cross sections parts
-        # TODO: Add "Node Name=" tag, see harvard gulch/dry gulch for example
-        self.cutline = CutLine()
-        self.header = Header()
-        self.description = Description()
-        self.sta_elev = StationElevation()
-        self.iefa = IEFA()
-        self.mannings_n = Mannings_n()
-        self.obstruct = Obstruction()
-        self.bank_sta = BankStation()
-        self.skew = Skew()
-        self.levee = Levee()
-        self.rating_curve = RatingCurve()
-        self.parts = [self.header, self.description, self.cutline, self.iefa, self.mannings_n, self.obstruct, self.bank_sta,
-                      self.sta_elev, self.skew, self.levee, self.rating_curve]
+        for attribute, _ in self.part_types:
+            setattr(self, '_' + attribute, None)
 
         self.geo_list = []  # holds all parts and unknown lines (as strings)
         
@@ -492,12 +681,16 @@ class CrossSection(object):
         self.is_interpolated = None
         
     def import_geo(self, line, geo_file):
+        # Each part is only imported once
+        part_types = list(self.part_types)
         while line != '\n':
-            for part in self.parts:
-                if part.test(line):
-                    # print str(type(part))+' found!'
+            for part_type in part_types:
+                attribute, part_class = part_type
+                if part_class.test(line):
+                    part = part_class()
                     line = part.import_geo(line, geo_file)
-                    self.parts.remove(part)
+                    setattr(self, attribute, part)
+                    part_types.remove(part_type)
                     self.geo_list.append(part)
                     break
             else:  # Unknown line, add as text
@@ -600,12 +793,6 @@ class CrossSection(object):
                 self.mannings_n.values.pop(ind)
                 self.mannings_n.values.insert(ind, temp_tuple)
 
-    def __str__(self):
-        s = ''
-        for line in self.geo_list:
-            s += str(line)
-        return s + '\n'
-
     @staticmethod
     def test(line):
         return Header.test(line)
@@ -1,6 +1,7 @@
 from __future__ import print_function
-from .tools import fl_int, split_by_n, print_list_by_group#  , split_by_n_str, pad_left, print_list_by_group, split_block_obs, split_by_n
+from .tools import fl_int, split_by_n, format_block, Indexed, Part#  , split_by_n_str, pad_left, print_list_by_group, split_block_obs, split_by_n
 from .description import Description
+from .feature import CompositeFeature
 from collections import namedtuple
 from math import ceil
 
@@ -8,6 +9,9 @@ import sys
 
 DEBUG = False
 
+# upstream and downstream station distances of a culvert barrel
+DistanceTuple = namedtuple('DistanceTuple', ['upstream', 'downstream'])
+
 class Feature(object):
     """
     This is a template for other features.
@@ -29,9 +33,10 @@ class Feature(object):
 
 
 # TODO: possibly move header into Culvert
-class Header(object):
+class Header(Part):
+    station = Indexed()
+
     def __init__(self):
-        self.station = None
         self.node_type = None
         self.value1 = None
         self.value2 = None
@@ -69,7 +74,7 @@ class Header(object):
                                                                                                     # header if figured out
         return s
 
-class Deck(object):
+class Deck(Part):
     """
     Culvert bridge deck and other coefficients
     """
@@ -180,16 +185,16 @@ class Deck(object):
         s += ',' + self.other_coef + '\n'
 
         # Sta/elev/low chord blocks
-        s += print_list_by_group(self.us_sta, 8, 10)
-        s += print_list_by_group(self.us_elev, 8, 10)
+        s += format_block(self.us_sta, 8, 10)
+        s += format_block(self.us_elev, 8, 10)
         s += ''.join(self.us_low_chord)
-        s += print_list_by_group(self.ds_sta, 8, 10)
-        s += print_list_by_group(self.ds_elev, 8, 10)
+        s += format_block(self.ds_sta, 8, 10)
+        s += format_block(self.ds_elev, 8, 10)
         s += ''.join(self.ds_low_chord)
         return s
 
 
-class CulvertGroup(object):
+class CulvertGroup(Part):
     """
     A group of culverts (either single or multiple)
     """
@@ -227,9 +232,6 @@ class CulvertGroup(object):
         return False
 
     def import_geo(self, line, geo_file):
-        # a named tuple subclass for station distances
-        DistanceTuple = namedtuple('DistanceTuple', ['upstream', 'downstream'])
-
         equals_ind = line.index('=')
         line = line[equals_ind+1:]
         values = line.split(',')
@@ -422,7 +424,12 @@ class CulvertGroup(object):
 
         return s
 
-class Culvert(object):
+class Culvert(CompositeFeature):
+    end_text = '\n'
+
+    river = Indexed()
+    reach = Indexed()
+
     def __init__(self, river, reach, debug=False):
         global DEBUG
         DEBUG = debug
@@ -462,12 +469,6 @@ class Culvert(object):
 
         return line
 
-    def __str__(self):
-        s = ''
-        for line in self.geo_list:
-            s += str(line)
-        return s + '\n'
-
     @staticmethod
     def test(line):
         return Header.test(line)
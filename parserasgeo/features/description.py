@@ -1,10 +1,13 @@
+from .tools import Part
 #from tools import fl_int #  , split_by_n_str, pad_left, print_list_by_group, split_block_obs, split_by_n
 
 
-class Description(object):
+class Description(Part):
     """
     This is a template for other features.
     """
+    __slots__ = ('text',)
+
     def __init__(self):
         self.text = []
         pass
@@ -1,8 +1,11 @@
 from abc import ABC, abstractmethod
 
+from .tools import chunks_of
+
 
 class Feature(ABC):
     """Features implement this class"""
+    __slots__ = ()
 
     @staticmethod
     @abstractmethod
@@ -27,3 +30,42 @@ class Feature(ABC):
 
         :returns: string representation of Feature instance
         """
+
+    def iter_chunks(self):
+        """Yield the serialized feature in chunks, see tools.chunks_of()
+
+        Features made of parts stream their parts instead of building the
+        whole string, see CompositeFeature.
+        :returns: iterable of strings that join to str(self)
+        """
+        yield str(self)
+
+    def write_to(self, fp):
+        """Write the serialized feature to an open text file in chunks
+
+        :param fp: file object, e.g. from open(filename, 'wt')
+        """
+        fp.writelines(self.iter_chunks())
+
+
+class CompositeFeature(Feature):
+    """Features made of parts and unknown lines implement this class
+
+    The parts and lines are written in the order they were read.
+    """
+    __slots__ = ()
+
+    # Name of the attribute holding the list of parts and unknown lines
+    items_attribute = 'geo_list'
+    # Text written after the items, e.g. the blank line that ends a node
+    end_text = ''
+
+    def iter_chunks(self):
+        """Yield the text of the parts and lines in chunks, see tools.chunks_of()"""
+        for item in getattr(self, self.items_attribute):
+            yield from chunks_of(item)
+        if self.end_text:
+            yield self.end_text
+
+    def __str__(self):
+        return ''.join(self.iter_chunks())
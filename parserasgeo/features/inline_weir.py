@@ -1,11 +1,13 @@
 from .description import Description
-from .feature import Feature
+from .feature import CompositeFeature, Feature
 from .station import Station
+from .tools import Indexed, Part
 
 
-class Header(Feature):
+class Header(Part, Feature):
+    station = Indexed()
+
     def __init__(self):
-        self.station = None
         self.node_type = None
 
     @staticmethod
@@ -29,7 +31,12 @@ class Header(Feature):
         return s
 
 
-class InlineWeir(Feature):
+class InlineWeir(CompositeFeature):
+    end_text = "\n"
+
+    river = Indexed()
+    reach = Indexed()
+
     def __init__(self, river, reach):
         self.river = river
         self.reach = reach
@@ -51,10 +58,6 @@ class InlineWeir(Feature):
                 line = next(geo_file)
         return line
 
-    def __str__(self):
-        s = "".join(map(str, self.geo_list))
-        return s + "\n"
-
     @staticmethod
     def test(line):
         return Header.test(line)
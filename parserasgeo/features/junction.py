@@ -1,5 +1,6 @@
-from .tools import fl_int #  , split_by_n_str, pad_left, print_list_by_group, split_block_obs, split_by_n
+from .tools import fl_int, Part #  , split_by_n_str, pad_left, print_list_by_group, split_block_obs, split_by_n
 from .description import Description
+from .feature import CompositeFeature
 
 class Feature(object):
     """
@@ -22,7 +23,7 @@ class Feature(object):
 
 
 # TODO: possibly move header into LateralWeir
-class Header(object):
+class Header(Part):
     def __init__(self):
         self.name = None
 
@@ -43,7 +44,9 @@ class Header(object):
         s = 'Junct Name=' + self.name + '\n'
         return s
 
-class Junction(object):
+class Junction(CompositeFeature):
+    end_text = '\n'
+
     def __init__(self):
 
         # Load all cross sections parts
@@ -66,12 +69,6 @@ class Junction(object):
                 line = next(geo_file)
         return line
 
-    def __str__(self):
-        s = ''
-        for line in self.geo_list:
-            s += str(line)
-        return s + '\n'
-
     @staticmethod
     def test(line):
         return Header.test(line)
@@ -1,12 +1,36 @@
 from .tools import (
     fl_int,
+    Indexed,
+    OptionalPart,
+    Part,
+    PrefixMatcher,
 )  #  , split_by_n_str, pad_left, print_list_by_group, split_block_obs, split_by_n
 from .description import Description
+from .feature import CompositeFeature
 
+# Common indicators of new features in HEC-RAS geometry files
+NEW_FEATURE_PREFIXES = (
+    "River Reach=",
+    "Type RM Length L Ch R =",  # New river reach/cross section
+    "Storage Area=",
+    "SA/2D Flow Area=",
+    "Culvert=",
+    "Bridge=",
+    "Inline Structure=",
+    "Junction=",
+    "Boundary=",
+)
+
+# Returns True if a line starts a new feature, shared by the lateral weir and its parts that read points
+is_new_feature = PrefixMatcher(NEW_FEATURE_PREFIXES)
+
+
+class Header(Part):
+    __slots__ = ("_station", "node_type", "value1", "value2", "value3")
+
+    station = Indexed()
 
-class Header(object):
     def __init__(self):
-        self.station = None
         self.node_type = None
         self.value1 = None
         self.value2 = None
@@ -48,7 +72,9 @@ class Header(object):
         return s
 
 
-class LateralWeirNodeName(object):
+class LateralWeirNodeName(Part):
+    __slots__ = ("name",)
+
     def __init__(self):
         self.name = None
 
@@ -66,7 +92,9 @@ class LateralWeirNodeName(object):
         return f"Node Name={self.name}\n"
 
 
-class LateralWeirLastEditedTime(object):
+class LateralWeirLastEditedTime(Part):
+    __slots__ = ("time",)
+
     def __init__(self):
         self.time = None
 
@@ -84,7 +112,9 @@ class LateralWeirLastEditedTime(object):
         return f"Node Last Edited Time={self.time}\n"
 
 
-class LateralWeirSS(object):
+class LateralWeirSS(Part):
+    __slots__ = ("values",)
+
     def __init__(self):
         self.values = None
 
@@ -102,7 +132,9 @@ class LateralWeirSS(object):
         return f"Lateral Weir SS={self.values}\n"
 
 
-class LateralWeirSE(object):
+class LateralWeirSE(Part):
+    __slots__ = ("num_points", "station_elevation_points")
+
     def __init__(self):
         self.num_points: int = 0
         self.station_elevation_points = []
@@ -126,11 +158,11 @@ class LateralWeirSE(object):
                 line = next(geo_file)
                 
                 # Check if this line starts a new feature
-                if self._is_new_feature(line):
+                if is_new_feature(line):
                     # Put the line back by raising StopIteration to signal end
                     raise StopIteration
                 
-                coords = split_by_n_str(line.rstrip(), 8)
+                coords = split_by_n_str(line, 8)
                 for i in range(0, len(coords), 2):
                     if i + 1 < len(coords) and points_read < self.num_points:
                         self.station_elevation_points.append(
@@ -145,37 +177,21 @@ class LateralWeirSE(object):
             # If there's no more data, return an empty string or indicate end
             return ""
 
-    def _is_new_feature(self, line):
-        """Check if line starts a new feature"""
-        # Common indicators of new features in HEC-RAS geometry files
-        feature_indicators = [
-            "River Reach=",
-            "Type RM Length L Ch R =",  # New river reach/cross section
-            "Storage Area=",
-            "SA/2D Flow Area=",
-            "Lateral Weir Pos=",  # New lateral weir
-            "Culvert=",
-            "Bridge=",
-            "Inline Structure=",
-            "Junction=",
-            "Boundary=",
-        ]
-        stripped_line = line.strip()
-        return any(stripped_line.startswith(indicator) for indicator in feature_indicators)
-
     def __str__(self):
-        result = f"Lateral Weir SE={self.num_points} \n"
-        from .tools import print_list_by_group
+        result = f"Lateral Weir SE= {self.num_points} \n"
+        from .tools import format_block
 
         # Flatten station/elevation pairs
         sta_elev_list = [x for tup in self.station_elevation_points for x in tup]
         # Format in groups with 8 character width and 10 columns per line
         if sta_elev_list:
-            result += print_list_by_group(sta_elev_list, 8, 10)
+            result += format_block(sta_elev_list, 8, 10)
         return result
 
 
-class LateralWeirOverflowMethod2D(object):
+class LateralWeirOverflowMethod2D(Part):
+    __slots__ = ("value",)
+
     def __init__(self):
         self.value = None
 
@@ -193,7 +209,9 @@ class LateralWeirOverflowMethod2D(object):
         return f"LW OverFlow Method 2D={self.value}\n"
 
 
-class LateralWeirOverflowVelocity2D(object):
+class LateralWeirOverflowVelocity2D(Part):
+    __slots__ = ("value",)
+
     def __init__(self):
         self.value = None
 
@@ -211,7 +229,9 @@ class LateralWeirOverflowVelocity2D(object):
         return f"LW OverFlow Use Velocity Into 2D={self.value}\n"
 
 
-class LateralWeirWSCriteria(object):
+class LateralWeirWSCriteria(Part):
+    __slots__ = ("value",)
+
     def __init__(self):
         self.value = None
 
@@ -229,7 +249,9 @@ class LateralWeirWSCriteria(object):
         return f"Lateral Weir WSCriteria={self.value} \n"
 
 
-class LateralWeirFlapGates(object):
+class LateralWeirFlapGates(Part):
+    __slots__ = ("value",)
+
     def __init__(self):
         self.value = None
 
@@ -247,7 +269,9 @@ class LateralWeirFlapGates(object):
         return f"Lateral Weir Flap Gates={self.value} \n"
 
 
-class LateralWeirHagersEQN(object):
+class LateralWeirHagersEQN(Part):
+    __slots__ = ("values",)
+
     def __init__(self):
         self.values = None
 
@@ -262,10 +286,12 @@ class LateralWeirHagersEQN(object):
         return next(geo_file)
 
     def __str__(self):
-        return f"Lateral Weir Hagers EQN= {self.values},,,,,\n"
+        return f"Lateral Weir Hagers EQN= {self.values}\n"
 
 
-class LateralWeirType(object):
+class LateralWeirType(Part):
+    __slots__ = ("value",)
+
     def __init__(self):
         self.value = None
 
@@ -280,10 +306,12 @@ class LateralWeirType(object):
         return next(geo_file)
 
     def __str__(self):
-        return f"Lateral Weir Type={self.value} \n"
+        return f"Lateral Weir Type= {self.value} \n"
+
 
+class LateralWeirConnectionPosDist(Part):
+    __slots__ = ("values",)
 
-class LateralWeirConnectionPosDist(object):
     def __init__(self):
         self.values = None
 
@@ -301,7 +329,9 @@ class LateralWeirConnectionPosDist(object):
         return f"Lateral Weir Connection Pos and Dist={self.values}\n"
 
 
-class LateralWeirPosition(object):
+class LateralWeirPosition(Part):
+    __slots__ = ("position",)
+
     def __init__(self):
         self.position = None
 
@@ -316,10 +346,12 @@ class LateralWeirPosition(object):
         return next(geo_file)
 
     def __str__(self):
-        return f"Lateral Weir Pos={self.position} \n"
+        return f"Lateral Weir Pos= {self.position} \n"
+
 
+class LateralWeirEnd(Part):
+    __slots__ = ("end_values",)
 
-class LateralWeirEnd(object):
     def __init__(self):
         self.end_values = None
 
@@ -337,7 +369,9 @@ class LateralWeirEnd(object):
         return f"Lateral Weir End={self.end_values}\n"
 
 
-class LateralWeirDistance(object):
+class LateralWeirDistance(Part):
+    __slots__ = ("distance",)
+
     def __init__(self):
         self.distance = None
 
@@ -355,7 +389,9 @@ class LateralWeirDistance(object):
         return f"Lateral Weir Distance={self.distance}\n"
 
 
-class LateralWeirTWMultipleXS(object):
+class LateralWeirTWMultipleXS(Part):
+    __slots__ = ("value",)
+
     def __init__(self):
         self.value = None
 
@@ -373,7 +409,9 @@ class LateralWeirTWMultipleXS(object):
         return f"Lateral Weir TW Multiple XS={self.value}\n"
 
 
-class LateralWeirWD(object):
+class LateralWeirWD(Part):
+    __slots__ = ("width",)
+
     def __init__(self):
         self.width = None
 
@@ -391,9 +429,12 @@ class LateralWeirWD(object):
         return f"Lateral Weir WD={self.width}\n"
 
 
-class LateralWeirCoef(object):
+class LateralWeirCoef(Part):
+    __slots__ = ("coefficient", "original")
+
     def __init__(self):
         self.coefficient = None
+        self.original = None  # (coefficient, text) as read, the text is written while coefficient is unchanged
 
     @staticmethod
     def test(line):
@@ -402,14 +443,22 @@ class LateralWeirCoef(object):
         return False
 
     def import_geo(self, line, geo_file):
-        self.coefficient = line.split("=", 1)[1].strip()
+        text = line.split("=", 1)[1].rstrip("\n")
+        if text.strip():
+            self.coefficient = fl_int(text)
+        self.original = (self.coefficient, text)
         return next(geo_file)
 
     def __str__(self):
-        return f"Lateral Weir Coef={self.coefficient}\n"
+        if self.original is not None and self.coefficient == self.original[0]:
+            return f"Lateral Weir Coef={self.original[1]}\n"
+        coefficient = "" if self.coefficient is None else self.coefficient
+        return f"Lateral Weir Coef={coefficient}\n"
+
 
+class LateralWeirDivRC(Part):
+    __slots__ = ("value",)
 
-class LateralWeirDivRC(object):
     def __init__(self):
         self.value = None
 
@@ -427,7 +476,9 @@ class LateralWeirDivRC(object):
         return f"LW Div RC={self.value}\n"
 
 
-class LateralWeirCenterline(object):
+class LateralWeirCenterline(Part):
+    __slots__ = ("num_points", "points")
+
     def __init__(self):
         self.num_points = None
         self.points = []  # [(x1,y1),(x2,y2),(x3,y3),...] Values are currently stored as strings
@@ -449,12 +500,12 @@ class LateralWeirCenterline(object):
             line = next(geo_file)
             
             # Check if this line starts a new feature
-            if self._is_new_feature(line):
+            if is_new_feature(line):
                 # Put the line back by raising StopIteration to signal end
                 raise StopIteration
             
             # Split the line into chunks of 16 characters for coordinates
-            coords = split_by_n_str(line.rstrip(), 16)
+            coords = split_by_n_str(line, 16)
             # Group coordinates into pairs (x, y)
             for i in range(0, len(coords), 2):
                 if i + 1 < len(coords) and points_read < self.num_points:
@@ -468,28 +519,10 @@ class LateralWeirCenterline(object):
             # If there's no more data, return an empty string or indicate end
             return ""
 
-    def _is_new_feature(self, line):
-        """Check if line starts a new feature"""
-        # Common indicators of new features in HEC-RAS geometry files
-        feature_indicators = [
-            "River Reach=",
-            "Type RM Length L Ch R =",  # New river reach/cross section
-            "Storage Area=",
-            "SA/2D Flow Area=",
-            "Lateral Weir Pos=",  # New lateral weir
-            "Culvert=",
-            "Bridge=",
-            "Inline Structure=",
-            "Junction=",
-            "Boundary=",
-        ]
-        stripped_line = line.strip()
-        return any(stripped_line.startswith(indicator) for indicator in feature_indicators)
-
     def __str__(self):
         from .tools import pad_left
 
-        s = f"Lateral Weir Centerline={self.num_points}\n"
+        s = f"Lateral Weir Centerline= {self.num_points}\n"
         # Format coordinates in pairs, 16 characters wide, right aligned
         # Process pairs of coordinates (x, y) and put them on lines
         for i in range(0, len(self.points), 2):  # 2 pairs per line (4 coordinates)
@@ -503,99 +536,130 @@ class LateralWeirCenterline(object):
         return s
 
 
-class LateralWeir(object):
+class LateralWeir(CompositeFeature):
+    __slots__ = ("_river", "_reach", "_header", "_description", "_node_name", "_last_edited_time", "_pos", "_end",
+                 "_distance", "_tw_multiple_xs", "_wd", "_coef", "_overflow_method_2d", "_overflow_velocity_2d",
+                 "_ws_criteria", "_flap_gates", "_hagers_eqn", "_ss", "_se", "_type", "_connection_pos_dist",
+                 "_div_rc", "_centerline", "geo_list")
+
+    river = Indexed()
+    reach = Indexed()
+
+    # Lateral Weir components, only created if the lateral weir has them
+    header = OptionalPart(Header)
+    description = OptionalPart(Description)
+    node_name = OptionalPart(LateralWeirNodeName)
+    last_edited_time = OptionalPart(LateralWeirLastEditedTime)
+    pos = OptionalPart(LateralWeirPosition)
+    end = OptionalPart(LateralWeirEnd)
+    distance = OptionalPart(LateralWeirDistance)
+    tw_multiple_xs = OptionalPart(LateralWeirTWMultipleXS)
+    wd = OptionalPart(LateralWeirWD)
+    coef = OptionalPart(LateralWeirCoef)
+    overflow_method_2d = OptionalPart(LateralWeirOverflowMethod2D)
+    overflow_velocity_2d = OptionalPart(LateralWeirOverflowVelocity2D)
+    ws_criteria = OptionalPart(LateralWeirWSCriteria)
+    flap_gates = OptionalPart(LateralWeirFlapGates)
+    hagers_eqn = OptionalPart(LateralWeirHagersEQN)
+    ss = OptionalPart(LateralWeirSS)
+    se = OptionalPart(LateralWeirSE)
+    type = OptionalPart(LateralWeirType)
+    connection_pos_dist = OptionalPart(LateralWeirConnectionPosDist)
+    div_rc = OptionalPart(LateralWeirDivRC)
+    centerline = OptionalPart(LateralWeirCenterline)
+
+    # (attribute, class) of all parts that can be parsed
+    part_types = [
+        ("header", Header),
+        ("description", Description),
+        ("node_name", LateralWeirNodeName),
+        ("last_edited_time", LateralWeirLastEditedTime),
+        ("pos", LateralWeirPosition),
+        ("end", LateralWeirEnd),
+        ("distance", LateralWeirDistance),
+        ("tw_multiple_xs", LateralWeirTWMultipleXS),
+        ("wd", LateralWeirWD),
+        ("coef", LateralWeirCoef),
+        ("overflow_method_2d", LateralWeirOverflowMethod2D),
+        ("overflow_velocity_2d", LateralWeirOverflowVelocity2D),
+        ("ws_criteria", LateralWeirWSCriteria),
+        ("flap_gates", LateralWeirFlapGates),
+        ("hagers_eqn", LateralWeirHagersEQN),
+        ("ss", LateralWeirSS),
+        ("se", LateralWeirSE),
+        ("type", LateralWeirType),
+        ("connection_pos_dist", LateralWeirConnectionPosDist),
+        ("div_rc", LateralWeirDivRC),
+        ("centerline", LateralWeirCenterline),
+    ]
+
+    # Text before "=" of the first line of a part -> (attribute, class). The header also starts new features, see
+    # NEW_FEATURE_PREFIXES, so it is imported before the other parts rather than routed.
+    part_routes = {
+        "BEGIN DESCRIPTION:\n": ("description", Description),
+        "Node Name": ("node_name", LateralWeirNodeName),
+        "Node Last Edited Time": ("last_edited_time", LateralWeirLastEditedTime),
+        "Lateral Weir Pos": ("pos", LateralWeirPosition),
+        "Lateral Weir End": ("end", LateralWeirEnd),
+        "Lateral Weir Distance": ("distance", LateralWeirDistance),
+        "Lateral Weir TW Multiple XS": ("tw_multiple_xs", LateralWeirTWMultipleXS),
+        "Lateral Weir WD": ("wd", LateralWeirWD),
+        "Lateral Weir Coef": ("coef", LateralWeirCoef),
+        "LW OverFlow Method 2D": ("overflow_method_2d", LateralWeirOverflowMethod2D),
+        "LW OverFlow Use Velocity Into 2D": ("overflow_velocity_2d", LateralWeirOverflowVelocity2D),
+        "Lateral Weir WSCriteria": ("ws_criteria", LateralWeirWSCriteria),
+        "Lateral Weir Flap Gates": ("flap_gates", LateralWeirFlapGates),
+        "Lateral Weir Hagers EQN": ("hagers_eqn", LateralWeirHagersEQN),
+        "Lateral Weir SS": ("ss", LateralWeirSS),
+        "Lateral Weir SE": ("se", LateralWeirSE),
+        "Lateral Weir Type": ("type", LateralWeirType),
+        "Lateral Weir Connection Pos and Dist": ("connection_pos_dist", LateralWeirConnectionPosDist),
+        "LW Div RC": ("div_rc", LateralWeirDivRC),
+        "Lateral Weir Centerline": ("centerline", LateralWeirCenterline),
+    }
+
     def __init__(self, river, reach):
         self.river = river
         self.reach = reach
 
-        # Initialize all Lateral Weir components
-        self.header = Header()
-        self.description = Description()
-        self.node_name = LateralWeirNodeName()
-        self.last_edited_time = LateralWeirLastEditedTime()
-        self.pos = LateralWeirPosition()
-        self.end = LateralWeirEnd()
-        self.distance = LateralWeirDistance()
-        self.tw_multiple_xs = LateralWeirTWMultipleXS()
-        self.wd = LateralWeirWD()
-        self.coef = LateralWeirCoef()
-        self.overflow_method_2d = LateralWeirOverflowMethod2D()
-        self.overflow_velocity_2d = LateralWeirOverflowVelocity2D()
-        self.ws_criteria = LateralWeirWSCriteria()
-        self.flap_gates = LateralWeirFlapGates()
-        self.hagers_eqn = LateralWeirHagersEQN()
-        self.ss = LateralWeirSS()
-        self.se = LateralWeirSE()
-        self.type = LateralWeirType()
-        self.connection_pos_dist = LateralWeirConnectionPosDist()
-        self.div_rc = LateralWeirDivRC()
-        self.centerline = LateralWeirCenterline()
-
-        # Define all parts that can be parsed
-        self.parts = [
-            self.header,
-            self.description,
-            self.node_name,
-            self.last_edited_time,
-            self.pos,
-            self.end,
-            self.distance,
-            self.tw_multiple_xs,
-            self.wd,
-            self.coef,
-            self.overflow_method_2d,
-            self.overflow_velocity_2d,
-            self.ws_criteria,
-            self.flap_gates,
-            self.hagers_eqn,
-            self.ss,
-            self.se,
-            self.type,
-            self.connection_pos_dist,
-            self.div_rc,
-            self.centerline,
-        ]
+        for attribute, _ in self.part_types:
+            setattr(self, "_" + attribute, None)
 
         self.geo_list = []  # holds all parts and unknown lines (as strings)
 
     def import_geo(self, line, geo_file):
+        # Each part is only imported once, the lateral weir ends when all parts have been imported
+        num_remaining = len(self.part_types)
+
+        # The header starts with 'Type RM Length L Ch R =' which is also the start of the next feature
+        if Header.test(line):
+            self.header = Header()
+            line = self.header.import_geo(line, geo_file)
+            num_remaining -= 1
+            self.geo_list.append(self.header)
+
         # Process all parts until we've processed everything
-        while line and self.parts:
+        while line and num_remaining:
             # Check if this line starts a new feature
-            if self._is_new_feature(line):
+            if is_new_feature(line):
                 # Stop processing this lateral weir and return the line
                 return line
-            
+
             found_part = False
-            for part in self.parts[:]:  # Use slice to iterate over a copy
-                if hasattr(part, "test") and part.test(line):
-                    # Special handling for LateralWeirSE to track number of points for station elevation
-                    if isinstance(part, LateralWeirSE):
-                        line = part.import_geo(line, geo_file)
-                        # After importing, store reference to the processed SE part
-                        self.parts.remove(part)
-                        self.geo_list.append(part)
-                        found_part = True
-                        break
-                    # Special handling for LateralWeirCenterline to track number of points for coordinates
-                    elif isinstance(part, LateralWeirCenterline):
-                        line = part.import_geo(line, geo_file)
-                        # After importing, store reference to the processed centerline part
-                        self.parts.remove(part)
-                        self.geo_list.append(part)
-                        found_part = True
-                        break
-                    else:
-                        try:
-                            line = part.import_geo(line, geo_file)
-                        except StopIteration:
-                            self.parts.remove(part)
-                            self.geo_list.append(part)
-                            break
-                        self.parts.remove(part)
-                        self.geo_list.append(part)
-                        found_part = True
-                        break
+            route = self.part_routes.get(line.partition("=")[0])
+            if route is not None and getattr(self, "_" + route[0]) is None:
+                attribute, part_class = route
+                part = part_class()
+                try:
+                    line = part.import_geo(line, geo_file)
+                    found_part = True
+                except StopIteration:
+                    # SE and centerline raise StopIteration when their points run in to the next feature
+                    if part_class is LateralWeirSE or part_class is LateralWeirCenterline:
+                        raise
+                setattr(self, attribute, part)
+                num_remaining -= 1
+                self.geo_list.append(part)
 
             if not found_part:
                 # If no part matched, we might have reached the end or an unknown line
@@ -604,121 +668,10 @@ class LateralWeir(object):
                 try:
                     line = next(geo_file)
                 except StopIteration:
+                    line = ""
                     break
-            else:
-                # Continue with the next line
-                pass
-
-        # Handle any remaining parts if needed
-        # This could happen if the file ends but there are still unprocessed parts
-        for remaining_part in self.parts[:]:
-            self.parts.remove(remaining_part)
-            self.geo_list.append(remaining_part)
-
-    def _is_new_feature(self, line):
-        """Check if line starts a new feature"""
-        # Common indicators of new features in HEC-RAS geometry files
-        feature_indicators = [
-            "River Reach=",
-            "Type RM Length L Ch R =",  # New river reach/cross section
-            "Storage Area=",
-            "SA/2D Flow Area=",
-            "Lateral Weir Pos=",  # New lateral weir
-            "Culvert=",
-            "Bridge=",
-            "Inline Structure=",
-            "Junction=",
-            "Boundary=",
-        ]
-        stripped_line = line.strip()
-        return any(stripped_line.startswith(indicator) for indicator in feature_indicators)
-
-    def __str__(self):
-        s = ""
-        # Build the string with proper ordering based on the original file format
-        # Only add components that have been properly initialized
-        
-        # Add header if it has meaningful data
-        if self.header and hasattr(self.header, 'station') and self.header.station is not None:
-            s += str(self.header)
-        
-        # Add node name if it has meaningful data
-        if self.node_name and hasattr(self.node_name, 'name') and self.node_name.name is not None:
-            s += str(self.node_name)
-        
-        # Add last edited time if it has meaningful data
-        if self.last_edited_time and hasattr(self.last_edited_time, 'time') and self.last_edited_time.time is not None:
-            s += str(self.last_edited_time)
-        
-        # Add position if it has meaningful data
-        if self.pos and hasattr(self.pos, 'pos') and self.pos.pos is not None:
-            s += str(self.pos)
-        
-        # Add end if it has meaningful data
-        if self.end and hasattr(self.end, 'end_values') and self.end.end_values is not None:
-            s += str(self.end)
-        
-        # Add distance if it has meaningful data
-        if self.distance and hasattr(self.distance, 'distance') and self.distance.distance is not None:
-            s += str(self.distance)
-        
-        # Add TW multiple XS if it has meaningful data
-        if self.tw_multiple_xs and hasattr(self.tw_multiple_xs, 'tw_multiple_xs') and self.tw_multiple_xs.tw_multiple_xs is not None:
-            s += str(self.tw_multiple_xs)
-        
-        # Add WD if it has meaningful data
-        if self.wd and hasattr(self.wd, 'width') and self.wd.width is not None:
-            s += str(self.wd)
-        
-        # Add coefficient if it has meaningful data
-        if self.coef and hasattr(self.coef, 'coefficient') and self.coef.coefficient is not None:
-            s += str(self.coef)
-        
-        # Add overflow method 2D if it has meaningful data
-        if self.overflow_method_2d and hasattr(self.overflow_method_2d, 'overflow_method') and self.overflow_method_2d.overflow_method is not None:
-            s += str(self.overflow_method_2d)
-        
-        # Add overflow velocity 2D if it has meaningful data
-        if self.overflow_velocity_2d and hasattr(self.overflow_velocity_2d, 'velocity') and self.overflow_velocity_2d.velocity is not None:
-            s += str(self.overflow_velocity_2d)
-        
-        # Add WS criteria if it has meaningful data
-        if self.ws_criteria and hasattr(self.ws_criteria, 'ws_criteria') and self.ws_criteria.ws_criteria is not None:
-            s += str(self.ws_criteria)
-        
-        # Add flap gates if it has meaningful data
-        if self.flap_gates and hasattr(self.flap_gates, 'flap_gates') and self.flap_gates.flap_gates is not None:
-            s += str(self.flap_gates)
-        
-        # Add hagers equation if it has meaningful data
-        if self.hagers_eqn and hasattr(self.hagers_eqn, 'hagers_eqn') and self.hagers_eqn.hagers_eqn is not None:
-            s += str(self.hagers_eqn)
-        
-        # Add SS if it has meaningful data
-        if self.ss and hasattr(self.ss, 'values') and self.ss.values is not None:
-            s += str(self.ss)
-        
-        # Add type if it has meaningful data
-        if self.type and hasattr(self.type, 'weir_type') and self.type.weir_type is not None:
-            s += str(self.type)
-        
-        # Add connection pos dist if it has meaningful data
-        if self.connection_pos_dist and hasattr(self.connection_pos_dist, 'connection_pos_dist') and self.connection_pos_dist.connection_pos_dist is not None:
-            s += str(self.connection_pos_dist)
-        
-        # Add SE if it has meaningful data
-        if self.se and hasattr(self.se, 'num_points') and self.se.num_points is not None:
-            s += str(self.se)
-        
-        # Add centerline if it has meaningful data
-        if self.centerline and hasattr(self.centerline, 'num_points') and self.centerline.num_points is not None:
-            s += str(self.centerline)
-        
-        # Add LW Div RC if it has meaningful data
-        if self.div_rc and hasattr(self.div_rc, 'div_rc') and self.div_rc.div_rc is not None:
-            s += str(self.div_rc)
 
-        return s
+        return line
 
     @staticmethod
     def test(line):
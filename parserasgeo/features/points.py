@@ -0,0 +1,93 @@
+"""
+List of (x, y) tuples view of coordinates stored in two arrays
+"""
+from array import array
+from collections.abc import MutableSequence
+
+
+def number(value):
+    """
+    Returns value as an int if it is a whole number, otherwise as is. Same as fl_int() for floats.
+    """
+    if value.is_integer():
+        return int(value)
+    return value
+
+
+class PointsView(MutableSequence):
+    """
+    Behaves like a list of (x, y) tuples, but reads and writes the arrays owner.<x_name> and owner.<y_name>.
+    Whole numbers are returned as int as fl_int() does.
+    """
+    def __init__(self, owner, x_name, y_name):
+        """
+        :param owner: object holding the arrays
+        :param x_name: name of attribute of owner holding the x values, e.g. 'stations'
+        :param y_name: name of attribute of owner holding the y values, e.g. 'elevations'
+        """
+        self._owner = owner
+        self._x_name = x_name
+        self._y_name = y_name
+
+    def _arrays(self):
+        return getattr(self._owner, self._x_name), getattr(self._owner, self._y_name)
+
+    def __len__(self):
+        return len(getattr(self._owner, self._x_name))
+
+    def __getitem__(self, index):
+        xs, ys = self._arrays()
+        if isinstance(index, slice):
+            return [(number(x), number(y)) for x, y in zip(xs[index], ys[index])]
+        return number(xs[index]), number(ys[index])
+
+    def __setitem__(self, index, value):
+        xs, ys = self._arrays()
+        if isinstance(index, slice):
+            value = list(value)
+            xs[index] = array('d', [point[0] for point in value])
+            ys[index] = array('d', [point[1] for point in value])
+        else:
+            xs[index], ys[index] = value
+
+    def __delitem__(self, index):
+        xs, ys = self._arrays()
+        del xs[index]
+        del ys[index]
+
+    def insert(self, index, value):
+        xs, ys = self._arrays()
+        xs.insert(index, value[0])
+        ys.insert(index, value[1])
+
+    def __iter__(self):
+        xs, ys = self._arrays()
+        for x, y in zip(xs, ys):
+            yield number(x), number(y)
+
+    def copy(self):
+        """
+        Returns the points as a new list of tuples, as list.copy()
+        """
+        return list(self)
+
+    def sort(self, key=None, reverse=False):
+        """
+        Sorts the points in place, as list.sort()
+        """
+        self[:] = sorted(self, key=key, reverse=reverse)
+
+    def __add__(self, other):
+        return list(self) + list(other)
+
+    def __radd__(self, other):
+        return list(other) + list(self)
+
+    def __eq__(self, other):
+        try:
+            return list(self) == list(other)
+        except TypeError:
+            return NotImplemented
+
+    def __repr__(self):
+        return repr(list(self))
@@ -1,4 +1,5 @@
-from .tools import  split_by_n_str
+from .tools import read_block, split_fields, Indexed, Part
+from .feature import CompositeFeature
 # Global debug, this is set when initializing RiverReach
 DEBUG = False
 
@@ -22,7 +23,9 @@ class Feature(object):
         pass
 
 
-class RiverReach(object):
+class RiverReach(CompositeFeature):
+    end_text = '\n'
+
     def __init__(self, debug=False):
         # Set global debug
         global DEBUG
@@ -51,21 +54,14 @@ class RiverReach(object):
                 line = next(geo_file)
         return line
 
-    def __str__(self):
-        s = ''
-        for line in self.geo_list:
-            s += str(line)
-        return s + '\n'
-
     @staticmethod
     def test(line):
         return Header.test(line)
 
 
-class Header(object):
-    def __init__(self):
-        self.river_name = None
-        self.reach_name = None
+class Header(Part):
+    river_name = Indexed()
+    reach_name = Indexed()
 
     @staticmethod
     def test(line):
@@ -88,7 +84,7 @@ class Header(object):
         return s
 
 
-class Geo(object):
+class Geo(Part):
     def __init__(self):
         self.points = []  # [(x1, y1), (x2, y2), ... ] all values are strings so that the exported file is identical
 
@@ -100,12 +96,9 @@ class Geo(object):
 
     def import_geo(self, line, geo_file):
         _num_points = int(line[9:].strip())
-        line = next(geo_file)
-        while line[:1] == ' ' or line[:1].isdigit() or line[:1] == '-':
-            vals = split_by_n_str(line, 16)
-            for i in range(0, len(vals), 2):
-                self.points.append((vals[i], vals[i + 1]))
-            line = next(geo_file)
+        lines, line = read_block(next(geo_file), geo_file)
+        vals = split_fields(lines, 16)
+        self.points.extend(zip(vals[0::2], vals[1::2]))
         assert len(self.points) == _num_points
         return line
 
@@ -120,7 +113,7 @@ class Geo(object):
         return s
 
 
-class Text(object):
+class Text(Part):
     def __init__(self):
         self.position = None  # (x, y) as a string
         self.reverse = None  # int, 0 (normal) or -1 (reversed)
@@ -0,0 +1,79 @@
+"""
+Memory mapped sidecar files of coordinate blocks, see storage_area.CoordinateBlock.spill().
+
+A sidecar holds the x values and then the y values of a block as doubles, followed by the text of the block. The
+file is mapped read only, so values and text are paged in from disk as they are used rather than held in memory,
+and the operating system may drop the pages again under memory pressure.
+"""
+import mmap
+from array import array
+
+# Encoding of the text in sidecars
+ENCODING = 'utf-8'
+# Approximate number of bytes of text decoded at a time when the block is written
+CHUNK_BYTES = 1 << 20
+
+
+class CoordinateSidecar(object):
+    """
+    A mapped sidecar file. x and y are read only memoryviews of doubles into the map.
+    """
+    __slots__ = ('filename', 'count', '_map', 'x', 'y')
+
+    def __init__(self, filename, count):
+        """
+        Maps an existing sidecar file, see create()
+
+        :param filename: name of sidecar file
+        :param count: number of points in the file
+        """
+        self.filename = filename
+        self.count = count
+        with open(filename, 'rb') as sidecar_file:
+            # Empty files can not be mapped
+            data = mmap.mmap(sidecar_file.fileno(), 0, access=mmap.ACCESS_READ) if count else b''
+        self._map = data
+        view = memoryview(data)
+        self.x = view[:8 * count].cast('d')
+        self.y = view[8 * count:16 * count].cast('d')
+
+    @classmethod
+    def create(cls, filename, x, y, chunks):
+        """
+        Writes a sidecar file and maps it. The text is written one chunk at a time, so the whole text of a large
+        block is never held in memory.
+
+        :param filename: name of sidecar file, it is overwritten
+        :param x: sequence of x values
+        :param y: sequence of y values, same length as x
+        :param chunks: iterable of strings that join to the text of the block, e.g. its lines
+        :return: CoordinateSidecar
+        """
+        if len(x) != len(y):
+            raise ValueError('x and y have different lengths: ' + str(len(x)) + ', ' + str(len(y)))
+        with open(filename, 'wb') as sidecar_file:
+            array('d', x).tofile(sidecar_file)
+            array('d', y).tofile(sidecar_file)
+            for chunk in chunks:
+                sidecar_file.write(chunk.encode(ENCODING))
+        return cls(filename, len(x))
+
+    def text_chunks(self):
+        """
+        Yields the text of the block in chunks of whole lines of about CHUNK_BYTES
+        """
+        data = self._map
+        start = 16 * self.count
+        end = len(data)
+        while start < end:
+            stop = data.find(b'\n', min(start + CHUNK_BYTES, end) - 1)
+            stop = end if stop == -1 else stop + 1
+            yield data[start:stop].decode(ENCODING)
+            start = stop
+
+    def __reduce__(self):
+        # Copies and unpickled blocks map the same file
+        return CoordinateSidecar, (self.filename, self.count)
+
+    def __repr__(self):
+        return '<CoordinateSidecar ' + str(self.filename) + ' ' + str(self.count) + ' points>'
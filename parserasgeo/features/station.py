@@ -1,4 +1,6 @@
 class Station(object):
+    __slots__ = ('_raw_station', '_id', '_value', '_is_interpolated')
+
     def __init__(self, station):
         self._raw_station = station
         self._id = station.strip()
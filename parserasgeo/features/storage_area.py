@@ -1,166 +1,31 @@
-from .tools import split_by_n_str, fl_int
+import os
+from array import array
+
+from .points import PointsView
+from .feature import CompositeFeature
+from .sidecar import CoordinateSidecar
+from .tools import split_fields, count_fields, format_block, Decoded, OptionalPart, OriginalBlock, Part
 
 # Global debug, this is set when initializing StorageArea
 DEBUG = False
 
+# First lines of the features that end a storage area
+NEW_FEATURE_PREFIXES = (
+    "River Reach=",
+    "Type RM Length L Ch R =",
+    "Storage Area=",
+    "SA/2D Flow Area=",
+)
 
-class StorageArea(object):
-    def __init__(self, debug=False):
-        # Set global debug
-        global DEBUG
-        DEBUG = debug
+# Width of the coordinates of surface lines and 2D points
+COORDINATE_WIDTH = 16
+# Number of points formatted at a time when a block without its original text is streamed, a whole number of lines
+CHUNK_POINTS = 1 << 14
 
-        # Storage area components
-        self.header = Header()
-        self.surface_line = SurfaceLine()
-        self.storage_type = StorageType()
-        self.area = Area()
-        self.min_elev = MinElev()
-        self.is_2d = Is2D()
-        self.point_generation_data = PointGenerationData()
-        self.points_2d = Points2D()
-        self.perimeter_time = PerimeterTime()
-        self.mannings = Mannings()
-        self.cell_volume_filter = CellVolumeFilter()
-        self.cell_min_area_fraction = CellMinAreaFraction()
-        self.face_profile_filter = FaceProfileFilter()
-        self.face_area_elev_profile_filter = FaceAreaElevProfileFilter()
-        self.face_area_elev_conveyance_ratio = FaceAreaElevConveyanceRatio()
-        self.face_min_length_ratio = FaceMinLengthRatio()
-
-        self.components = [
-            self.header,
-            self.surface_line,
-            self.storage_type,
-            self.area,
-            self.min_elev,
-            self.is_2d,
-            self.point_generation_data,
-            self.points_2d,
-            self.perimeter_time,
-            self.mannings,
-            self.cell_volume_filter,
-            self.cell_min_area_fraction,
-            self.face_profile_filter,
-            self.face_area_elev_profile_filter,
-            self.face_area_elev_conveyance_ratio,
-            self.face_min_length_ratio,
-        ]
 
-        self.geo_list = []  # holds all parts and unknown lines (as strings)
+class Header(Part):
+    __slots__ = ("name", "description", "has_description")
 
-    def import_geo(self, line, geo_file):
-        # Add the header first since we know this is the start of a storage area
-        if self.header.test(line):
-            line = self.header.import_geo(line, geo_file)
-            self.geo_list.append(self.header)
-
-        # Continue reading the storage area components in sequence
-        try:
-            while not self._is_new_feature(line):
-                # Check for each component in order of appearance
-                if self.surface_line and self.surface_line.test(line):
-                    line = self.surface_line.import_geo(line, geo_file)
-                    self.geo_list.append(self.surface_line)
-                elif self.storage_type and self.storage_type.test(line):
-                    line = self.storage_type.import_geo(line, geo_file)
-                    self.geo_list.append(self.storage_type)
-                elif self.area and self.area.test(line):
-                    line = self.area.import_geo(line, geo_file)
-                    self.geo_list.append(self.area)
-                elif self.min_elev and self.min_elev.test(line):
-                    line = self.min_elev.import_geo(line, geo_file)
-                    self.geo_list.append(self.min_elev)
-                elif self.is_2d and self.is_2d.test(line):
-                    line = self.is_2d.import_geo(line, geo_file)
-                    self.geo_list.append(self.is_2d)
-                elif self.point_generation_data and self.point_generation_data.test(
-                    line
-                ):
-                    line = self.point_generation_data.import_geo(line, geo_file)
-                    self.geo_list.append(self.point_generation_data)
-                elif self.points_2d and self.points_2d.test(line):
-                    line = self.points_2d.import_geo(line, geo_file)
-                    self.geo_list.append(self.points_2d)
-                elif self.perimeter_time and self.perimeter_time.test(line):
-                    line = self.perimeter_time.import_geo(line, geo_file)
-                    self.geo_list.append(self.perimeter_time)
-                elif self.mannings and self.mannings.test(line):
-                    line = self.mannings.import_geo(line, geo_file)
-                    self.geo_list.append(self.mannings)
-                elif self.cell_volume_filter and self.cell_volume_filter.test(line):
-                    line = self.cell_volume_filter.import_geo(line, geo_file)
-                    self.geo_list.append(self.cell_volume_filter)
-                elif self.cell_min_area_fraction and self.cell_min_area_fraction.test(
-                    line
-                ):
-                    line = self.cell_min_area_fraction.import_geo(line, geo_file)
-                    self.geo_list.append(self.cell_min_area_fraction)
-                elif self.face_profile_filter and self.face_profile_filter.test(line):
-                    line = self.face_profile_filter.import_geo(line, geo_file)
-                    self.geo_list.append(self.face_profile_filter)
-                elif (
-                    self.face_area_elev_profile_filter
-                    and self.face_area_elev_profile_filter.test(line)
-                ):
-                    line = self.face_area_elev_profile_filter.import_geo(line, geo_file)
-                    self.geo_list.append(self.face_area_elev_profile_filter)
-                elif (
-                    self.face_area_elev_conveyance_ratio
-                    and self.face_area_elev_conveyance_ratio.test(line)
-                ):
-                    line = self.face_area_elev_conveyance_ratio.import_geo(
-                        line, geo_file
-                    )
-                    self.geo_list.append(self.face_area_elev_conveyance_ratio)
-                elif self.face_min_length_ratio and self.face_min_length_ratio.test(
-                    line
-                ):
-                    line = self.face_min_length_ratio.import_geo(line, geo_file)
-                    self.geo_list.append(self.face_min_length_ratio)
-                else:
-                    # No matching component found - check if it's a new feature
-                    if self._is_new_feature(line):
-                        break
-                    elif line.strip() == "":
-                        # Empty line, add as text and continue
-                        self.geo_list.append(line)
-                        line = next(geo_file)
-                        continue
-                    else:
-                        # Unknown line, add as text and continue
-                        self.geo_list.append(line)
-                        line = next(geo_file)
-
-        except StopIteration:
-            # End of file reached
-            pass
-
-        return line
-
-    def _is_new_feature(self, line):
-        """Check if line starts a new feature"""
-        # Common indicators of new features in HEC-RAS geometry files
-        feature_indicators = [
-            "River Reach=",
-            "Type RM Length L Ch R =",
-            "Storage Area=",
-            "SA/2D Flow Area=",
-        ]
-        return any(line.startswith(indicator) for indicator in feature_indicators)
-
-    def __str__(self):
-        s = ""
-        for line in self.geo_list:
-            s += str(line)
-        return s
-
-    @staticmethod
-    def test(line):
-        return Header.test(line)
-
-
-class Header(object):
     def __init__(self):
         self.name = None
         self.description = None
@@ -196,94 +61,207 @@ class Header(object):
             return f"Storage Area={self.name},,\n"
 
 
-class SurfaceLine(object):
-    def __init__(self):
-        self.count = None
-        self.points = []  # [(x1, y1), (x2, y2), ... ]
+class CoordinateBlock(Part):
+    """
+    Block of (x, y) coordinates of a storage area, base of SurfaceLine and Points2D. The coordinates are stored in
+    two arrays of doubles, x and y, and points is a list of (x, y) tuples view of them. The lines of the block are
+    decoded in bulk on first access, and written as they were read until a coordinate changes. Large blocks can be
+    moved to a memory mapped file with spill().
+    """
+    __slots__ = ("_raw", "_count", "_x", "_y", "_original", "_sidecar")
 
-    @staticmethod
-    def test(line):
-        stripped_line = line.strip()
-        if stripped_line[:20] == "Storage Area Surface":
-            return True
-        return False
+    # First line of the block up to the number of points, and number of values per line
+    prefix = None
+    num_columns = None
+
+    x = Decoded()
+    y = Decoded()
+    original = Decoded()
+
+    def __init__(self):
+        self._raw = None  # lines of the coordinates until they are decoded
+        self._count = None  # number of points in the first line until they are decoded, or as assigned to count
+        self.x = array("d")
+        self.y = array("d")
+        self.original = None  # tools.OriginalBlock of the coordinates as read
+        self._sidecar = None  # sidecar.CoordinateSidecar the coordinates were spilled to
+
+    @property
+    def count(self):
+        """
+        Number of points, as written in the first line of the block. Once the block is decoded this is the number
+        of points in x and y, unless a count has been assigned. Assign None to count the points again.
+        """
+        if self._count is not None:
+            return self._count
+        return len(self.x)
+
+    @count.setter
+    def count(self, count):
+        if self._raw is not None:
+            self.decode()
+        self._count = count
+
+    @property
+    def points(self):
+        """[(x1, y1), (x2, y2), ... ] Values are float/int. Changes to the list change the arrays."""
+        return PointsView(self, "x", "y")
+
+    @points.setter
+    def points(self, points):
+        points = list(points)
+        self.x = array("d", [point[0] for point in points])
+        self.y = array("d", [point[1] for point in points])
 
     def import_geo(self, line, geo_file):
-        # Extract number of surface line points
-        parts = line.split("=")
-        if len(parts) > 1:
-            self.count = int(parts[1].strip())
-
-        # Read the coordinate pairs
-        line = next(geo_file)
-        points_read = 0
-
-        while points_read < self.count and line.strip():
-            if line.strip() and not self._starts_new_storage_area_component(line):
-                # Parse coordinates - typically formatted as continuous numbers without commas
-                # Each line contains one coordinate pair for surface line
-                line = line.rstrip()  # Keep leading spaces, only remove trailing newline
-                if line:
-                    # Try to split the line into a pair of coordinates
-                    # For surface line, each line contains one coordinate pair
-                    clean_line = line.replace(",", "")  # Remove any commas if present
-                    # Parse fixed-width format - 16 chars per coordinate
-                    coords = []
-                    pos = 0
-                    while pos < len(clean_line):
-                        coord_chunk = clean_line[pos : pos + 16].strip()
-                        if coord_chunk:
-                            coords.append(coord_chunk)
-                        pos += 16
-
-                    # Group into pairs (x, y) - for surface line, there should be exactly 2 coordinates
-                    if len(coords) >= 2 and points_read < self.count:
-                        self.points.append((coords[0], coords[1]))
-                        points_read += 1
-            else:
-                break  # Found a new storage area component or end of section
+        self._count = int(line.split("=")[1])
 
-            if points_read < self.count:
-                try:
-                    line = next(geo_file)
-                except StopIteration:
-                    break  # End of file reached
+        # Read the lines of coordinates, they are decoded on first access
+        lines = []
+        line = next(geo_file, "")
+        while line[:1] == " " or line[:1].isdigit() or line[:1] == "-" or line[:1] == ".":
+            lines.append(line)
+            line = next(geo_file, "")
+        self._raw = lines
 
         if DEBUG:
-            print(f"Imported {len(self.points)} surface line points for storage area")
+            print(f"Imported {count_fields(lines, COORDINATE_WIDTH) // 2} points of {self.prefix}")
 
-        # Return the next line after the surface line data
-        try:
-            return next(geo_file)
-        except StopIteration:
-            return line  # Return the last line if we're at the end of the file
-
-    def _starts_new_storage_area_component(self, line):
-        """Check if line starts a new storage area component"""
-        storage_area_components = [
-            "Storage Area Type=",
-            "Storage Area Area=",
-            "Storage Area Min Elev=",
-            "Storage Area Is2D=",
-            "Storage Area Point Generation Data=",
-            "Storage Area 2D Points=",
-            "River Reach=",
-            "Type RM Length L Ch R =",
-        ]
-        return any(line.startswith(comp) for comp in storage_area_components)
+        return line
+
+    def decode(self):
+        """Decodes the coordinates from the lines read by import_geo()"""
+        lines, self._raw = self._raw, None
+        self._count = None
+        values, num_fields = _decode_values(lines)
+        self._x = values[0::2]
+        self._y = values[1::2]
+        self._original = OriginalBlock(lines, COORDINATE_WIDTH, values) if len(values) == num_fields else None
+
+    def spill(self, filename):
+        """
+        Moves the coordinates to a memory mapped sidecar file, see sidecar.py. They are then paged in from disk as
+        they are used rather than held in memory, and the block is written by streaming the file. x and y become
+        read only views of the file, assign new arrays to x, y or points to change the coordinates. A block that
+        has not been decoded yet, e.g. while it is imported, is spilled without decoding it: its lines are written
+        to the file as they were read and only the coordinates are converted.
+
+        :param filename: name of sidecar file, it is overwritten
+        """
+        sidecar = self._sidecar
+        if sidecar is not None and os.path.exists(filename) and os.path.samefile(filename, sidecar.filename):
+            raise ValueError("Coordinates are already mapped from " + str(filename))
+        x = y = None
+        if self._raw is not None:
+            values, num_fields = _decode_values(self._raw)
+            if len(values) == num_fields:
+                x, y = values[0::2], values[1::2]
+            else:
+                # Blank fields are not kept, _spilled_chunks() expects whole points on every line
+                self.decode()
+        if x is None:
+            x, y = self.x, self.y
+        # The text is streamed to the file as it would be written now, without the first line
+        sidecar = CoordinateSidecar.create(filename, x, y, self._text_chunks())
+        self._raw = None
+        self._count = None
+        self._sidecar = sidecar
+        self._x = sidecar.x
+        self._y = sidecar.y
+        self._original = None
+
+    def iter_chunks(self):
+        """Yields the text of the block, see tools.chunks_of()"""
+        yield f"{self.prefix} {self.count}\n"
+        yield from self._text_chunks()
+
+    def _text_chunks(self):
+        """Yields the text of the block after its first line, in chunks rather than as one string"""
+        if self._raw is not None:
+            yield from self._raw
+        elif self._sidecar is not None:
+            yield from self._spilled_chunks()
+        elif self.original is not None:
+            yield format_block(_interleave(self.x, self.y), COORDINATE_WIDTH, self.num_columns, self.original)
+        else:
+            x, y = self.x, self.y
+            for start in range(0, len(x), CHUNK_POINTS):
+                stop = start + CHUNK_POINTS
+                yield format_block(_interleave(x[start:stop], y[start:stop]), COORDINATE_WIDTH, self.num_columns)
+
+    def _spilled_chunks(self):
+        """Yields the text of a spilled block without holding all of it in memory"""
+        sidecar = self._sidecar
+        x, y = self.x, self.y
+        if x is sidecar.x and y is sidecar.y:
+            yield from sidecar.text_chunks()
+            return
+        if len(x) != sidecar.count or len(y) != sidecar.count:
+            # Points were added or removed, values no longer line up with the text in the sidecar
+            original = OriginalBlock(list(sidecar.text_chunks()), COORDINATE_WIDTH,
+                                     _interleave(sidecar.x, sidecar.y))
+            yield format_block(_interleave(x, y), COORDINATE_WIDTH, self.num_columns, original)
+            return
+        # The text in the sidecar is written by format_block(), so chunks of whole lines hold whole points
+        start = 0
+        for text in sidecar.text_chunks():
+            lines = text.splitlines(True)
+            end = start + count_fields(lines, COORDINATE_WIDTH) // 2
+            original = OriginalBlock(lines, COORDINATE_WIDTH, _interleave(sidecar.x[start:end], sidecar.y[start:end]))
+            yield format_block(_interleave(x[start:end], y[start:end]), COORDINATE_WIDTH, self.num_columns,
+                               original)
+            start = end
+
+    def __getstate__(self):
+        # Views of the sidecar can not be pickled, they are mapped again from the file
+        sidecar = self._sidecar
+        spilled = sidecar is not None and self._x is sidecar.x and self._y is sidecar.y
+        return (self._raw, self._count, None if spilled else self._x, None if spilled else self._y, self._original,
+                sidecar)
+
+    def __setstate__(self, state):
+        self._raw, self._count, self._x, self._y, self._original, self._sidecar = state
+        if self._x is None:
+            self._x = self._sidecar.x
+            self._y = self._sidecar.y
 
     def __str__(self):
-        s = f"Storage Area Surface Line= {self.count}\n"
-        # Format points - one pair per line for surface line, 16 char width
-        for i, point in enumerate(self.points):
-            s += f"{point[0]:>16}{point[1]:>16}"
-            if i < len(self.points) - 1:
-                s += "\n"
-        s += "\n"  # Add final newline
-        return s
+        return "".join(self.iter_chunks())
+
+
+def _decode_values(lines):
+    """Returns (array of the values of the lines of a coordinate block, number of fields). Blank fields, e.g.
+    trailing spaces, are skipped."""
+    fields = split_fields(lines, COORDINATE_WIDTH)
+    return array("d", map(float, [field for field in fields if not field.isspace()])), len(fields)
+
+
+def _interleave(x, y):
+    """Returns the values of x and y as a list in the order they are written, x1, y1, x2, y2, ..."""
+    values = [None] * (len(x) + len(y))
+    values[0::2] = x
+    values[1::2] = y
+    return values
 
 
-class StorageType(object):
+class SurfaceLine(CoordinateBlock):
+    """Storage area surface line, one (x, y) pair per line"""
+    __slots__ = ()
+
+    prefix = "Storage Area Surface Line="
+    num_columns = 2
+
+    @staticmethod
+    def test(line):
+        stripped_line = line.strip()
+        if stripped_line[:20] == "Storage Area Surface":
+            return True
+        return False
+
+
+class StorageType(Part):
+    __slots__ = ("type_value",)
+
     def __init__(self):
         self.type_value = None
 
@@ -304,7 +282,9 @@ class StorageType(object):
         return f"Storage Area Type= {self.type_value}\n"
 
 
-class Area(object):
+class Area(Part):
+    __slots__ = ("value",)
+
     def __init__(self):
         self.value = None
 
@@ -325,7 +305,9 @@ class Area(object):
         return f"Storage Area Area={self.value}\n"
 
 
-class MinElev(object):
+class MinElev(Part):
+    __slots__ = ("value",)
+
     def __init__(self):
         self.value = None
 
@@ -346,7 +328,9 @@ class MinElev(object):
         return f"Storage Area Min Elev={self.value}\n"
 
 
-class Is2D(object):
+class Is2D(Part):
+    __slots__ = ("is_2d_flag",)
+
     def __init__(self):
         self.is_2d_flag = None
 
@@ -367,7 +351,9 @@ class Is2D(object):
         return f"Storage Area Is2D={self.is_2d_flag}\n"
 
 
-class PointGenerationData(object):
+class PointGenerationData(Part):
+    __slots__ = ("data",)
+
     def __init__(self):
         self.data = None
 
@@ -388,10 +374,12 @@ class PointGenerationData(object):
         return f"Storage Area Point Generation Data={self.data}\n"
 
 
-class Points2D(object):
-    def __init__(self):
-        self.count = None
-        self.points = []  # [(x1, y1), (x2, y2), ... ]
+class Points2D(CoordinateBlock):
+    """2D flow area computation points, two (x, y) pairs per line"""
+    __slots__ = ()
+
+    prefix = "Storage Area 2D Points="
+    num_columns = 4
 
     @staticmethod
     def test(line):
@@ -403,77 +391,10 @@ class Points2D(object):
             return True
         return False
 
-    def import_geo(self, line, geo_file):
-        parts = line.split("=")
-        if len(parts) > 1:
-            self.count = int(parts[1].strip())
-
-        # Read the 2D points - typically formatted as continuous coordinate pairs
-        line = next(geo_file)
-        points_read = 0
-
-        while points_read < self.count:
-            if line.strip() and not self._starts_new_storage_area_component(line):
-                # Process line with coordinates - fixed width format
-                clean_line = line.rstrip().replace(
-                    ",", ""
-                )  # Remove any commas if present, but keep leading spaces
-                # Parse fixed-width format - 16 chars per coordinate
-                coords = []
-                pos = 0
-                while pos < len(clean_line):
-                    coord_chunk = clean_line[pos : pos + 16].strip()
-                    if coord_chunk:
-                        coords.append(coord_chunk)
-                    pos += 16
-
-                # Group into pairs (x, y)
-                for i in range(0, len(coords) - 1, 2):
-                    if i + 1 < len(coords) and points_read < self.count:
-                        self.points.append((coords[i], coords[i + 1]))
-                        points_read += 1
-            else:
-                break  # Found a new storage area component or end of section
 
-            if points_read < self.count:
-                try:
-                    line = next(geo_file)
-                except StopIteration:
-                    break  # End of file reached
+class PerimeterTime(Part):
+    __slots__ = ("time_info",)
 
-        if DEBUG:
-            print(f"Imported {len(self.points)} 2D points for storage area")
-
-        # Return the next line after the 2D points data
-        try:
-            return next(geo_file)
-        except StopIteration:
-            return line  # Return the last line if we're at the end of the file
-
-    def _starts_new_storage_area_component(self, line):
-        """Check if line starts a new storage area component"""
-        storage_area_components = [
-            "Storage Area=",
-            "River Reach=",
-            "Type RM Length L Ch R =",
-            "SA/2D Flow Area=",
-        ]
-        return any(line.startswith(comp) for comp in storage_area_components)
-
-    def __str__(self):
-        s = f"Storage Area 2D Points= {self.count}\n"
-        # Format points - 2 pairs per line as seen in the example, 16 char width
-        for i in range(0, len(self.points), 2):
-            if i + 1 < len(self.points):
-                s += f"{self.points[i][0]:>16}{self.points[i][1]:>16}{self.points[i + 1][0]:>16}{self.points[i + 1][1]:>16}\n"
-            else:
-                # This should only happen if there's an odd number of points, which shouldn't happen
-                # since points should always come in pairs
-                s += f"{self.points[i][0]:>16}{self.points[i][1]:>16}\n"
-        return s
-
-
-class PerimeterTime(object):
     def __init__(self):
         self.time_info = None
 
@@ -494,7 +415,9 @@ class PerimeterTime(object):
         return f"Storage Area 2D PointsPerimeterTime={self.time_info}\n"
 
 
-class Mannings(object):
+class Mannings(Part):
+    __slots__ = ("value",)
+
     def __init__(self):
         self.value = None
 
@@ -515,7 +438,9 @@ class Mannings(object):
         return f"Storage Area Mannings={self.value}\n"
 
 
-class CellVolumeFilter(object):
+class CellVolumeFilter(Part):
+    __slots__ = ("value",)
+
     def __init__(self):
         self.value = None
 
@@ -536,7 +461,9 @@ class CellVolumeFilter(object):
         return f"2D Cell Volume Filter Tolerance={self.value}\n"
 
 
-class CellMinAreaFraction(object):
+class CellMinAreaFraction(Part):
+    __slots__ = ("value",)
+
     def __init__(self):
         self.value = None
 
@@ -557,7 +484,9 @@ class CellMinAreaFraction(object):
         return f"2D Cell Minimum Area Fraction={self.value}\n"
 
 
-class FaceProfileFilter(object):
+class FaceProfileFilter(Part):
+    __slots__ = ("value",)
+
     def __init__(self):
         self.value = None
 
@@ -578,7 +507,9 @@ class FaceProfileFilter(object):
         return f"2D Face Profile Filter Tolerance={self.value}\n"
 
 
-class FaceAreaElevProfileFilter(object):
+class FaceAreaElevProfileFilter(Part):
+    __slots__ = ("value",)
+
     def __init__(self):
         self.value = None
 
@@ -599,7 +530,9 @@ class FaceAreaElevProfileFilter(object):
         return f"2D Face Area Elevation Profile Filter Tolerance={self.value}\n"
 
 
-class FaceAreaElevConveyanceRatio(object):
+class FaceAreaElevConveyanceRatio(Part):
+    __slots__ = ("value",)
+
     def __init__(self):
         self.value = None
 
@@ -620,7 +553,9 @@ class FaceAreaElevConveyanceRatio(object):
         return f"2D Face Area Elevation Conveyance Ratio={self.value}\n"
 
 
-class FaceMinLengthRatio(object):
+class FaceMinLengthRatio(Part):
+    __slots__ = ("value",)
+
     def __init__(self):
         self.value = None
 
@@ -638,4 +573,115 @@ class FaceMinLengthRatio(object):
         return next(geo_file)
 
     def __str__(self):
-        return f"2D Face Min Length Ratio={self.value}\n"
\ No newline at end of file
+        return f"2D Face Min Length Ratio={self.value}\n"
+
+
+class StorageArea(CompositeFeature):
+    __slots__ = ("_header", "_surface_line", "_storage_type", "_area", "_min_elev", "_is_2d",
+                 "_point_generation_data", "_points_2d", "_perimeter_time", "_mannings", "_cell_volume_filter",
+                 "_cell_min_area_fraction", "_face_profile_filter", "_face_area_elev_profile_filter",
+                 "_face_area_elev_conveyance_ratio", "_face_min_length_ratio", "geo_list")
+
+    # Storage area components, only created if the storage area has them
+    header = OptionalPart(Header)
+    surface_line = OptionalPart(SurfaceLine)
+    storage_type = OptionalPart(StorageType)
+    area = OptionalPart(Area)
+    min_elev = OptionalPart(MinElev)
+    is_2d = OptionalPart(Is2D)
+    point_generation_data = OptionalPart(PointGenerationData)
+    points_2d = OptionalPart(Points2D)
+    perimeter_time = OptionalPart(PerimeterTime)
+    mannings = OptionalPart(Mannings)
+    cell_volume_filter = OptionalPart(CellVolumeFilter)
+    cell_min_area_fraction = OptionalPart(CellMinAreaFraction)
+    face_profile_filter = OptionalPart(FaceProfileFilter)
+    face_area_elev_profile_filter = OptionalPart(FaceAreaElevProfileFilter)
+    face_area_elev_conveyance_ratio = OptionalPart(FaceAreaElevConveyanceRatio)
+    face_min_length_ratio = OptionalPart(FaceMinLengthRatio)
+
+    # (attribute, class) of the components
+    component_types = [
+        ("header", Header),
+        ("surface_line", SurfaceLine),
+        ("storage_type", StorageType),
+        ("area", Area),
+        ("min_elev", MinElev),
+        ("is_2d", Is2D),
+        ("point_generation_data", PointGenerationData),
+        ("points_2d", Points2D),
+        ("perimeter_time", PerimeterTime),
+        ("mannings", Mannings),
+        ("cell_volume_filter", CellVolumeFilter),
+        ("cell_min_area_fraction", CellMinAreaFraction),
+        ("face_profile_filter", FaceProfileFilter),
+        ("face_area_elev_profile_filter", FaceAreaElevProfileFilter),
+        ("face_area_elev_conveyance_ratio", FaceAreaElevConveyanceRatio),
+        ("face_min_length_ratio", FaceMinLengthRatio),
+    ]
+
+    # Text before "=" of a line, without leading white space -> (attribute, class) of the component it starts, or
+    # None if it starts a new feature. Other lines are kept as text.
+    #
+    # The type, min elev, point generation data, perimeter time, mannings and the 2D cell and face lines other than
+    # the volume filter are deliberately not routed. Their tests compare slices of the wrong length and have never
+    # matched, so these lines have always been kept as text and e.g. storage_area.mannings is always empty. Routing
+    # them would fix that old bug, but would change what scripts see and how the lines are written, as these
+    # components do not write padded values back as they were read.
+    component_routes = {
+        "Storage Area Surface Line": ("surface_line", SurfaceLine),
+        "Storage Area Area": ("area", Area),
+        "Storage Area Is2D": ("is_2d", Is2D),
+        "Storage Area 2D Points": ("points_2d", Points2D),
+        "2D Cell Volume Filter Tolerance": ("cell_volume_filter", CellVolumeFilter),
+        **dict.fromkeys([prefix[:-1] for prefix in NEW_FEATURE_PREFIXES]),
+    }
+
+    def __init__(self, debug=False):
+        # Set global debug
+        global DEBUG
+        DEBUG = debug
+
+        for attribute, _ in self.component_types:
+            setattr(self, "_" + attribute, None)
+
+        self.geo_list = []  # holds all parts and unknown lines (as strings)
+
+    def import_geo(self, line, geo_file):
+        # Add the header first since we know this is the start of a storage area
+        if Header.test(line):
+            self.header = Header()
+            line = self.header.import_geo(line, geo_file)
+            self.geo_list.append(self.header)
+
+        # Route each line to its component with one lookup, see component_routes
+        routes = self.component_routes
+        try:
+            while True:
+                key = line.partition("=")[0]
+                route = routes.get(key, False)
+                if route is False and key[:1].isspace():
+                    # Indented lines, as PrefixMatcher and the ends_before prefixes of scan_blocks() allow
+                    route = routes.get(key.lstrip(), False)
+                if route is None:
+                    break
+                if route:
+                    attribute, component_class = route
+                    component = component_class()
+                    line = component.import_geo(line, geo_file)
+                    setattr(self, attribute, component)
+                    self.geo_list.append(component)
+                else:
+                    # Unknown or empty line, add as text and continue
+                    self.geo_list.append(line)
+                    line = next(geo_file)
+
+        except StopIteration:
+            # End of file reached
+            line = ""
+
+        return line
+
+    @staticmethod
+    def test(line):
+        return Header.test(line)
@@ -1,3 +1,8 @@
+from array import array
+from operator import eq
+from weakref import WeakValueDictionary
+
+
 def split_by_n(line, n):
     """
 
@@ -5,15 +10,7 @@ def split_by_n(line, n):
     :param n:
     :return:
     """
-    values = []
-    line = line[:-1]
-    length = len(line)
-    for i in range(0, length, n):
-        if i+n < length:
-            values.append(fl_int(line[i:i+n]))
-        else:
-            values.append(fl_int(line[i:]))
-    return values
+    return decode_fixed([line], n)
 
 
 def split_by_n_str(line, n):
@@ -23,18 +20,9 @@ def split_by_n_str(line, n):
     :param n: int
     :return: list of strings
     """
-    values = []
-    line = line[:-1]
-    length = len(line)
-    for i in range(0, length, n):
-        if i+n < length:
-            values.append(line[i:i+n])
-        else:
-            values.append(line[i:])
-    return values
+    return split_fields([line], n)
 
 
-# TODO - combine with split_by_n()
 def split_block_obs(line, n):
     """
     Is aware of blank blocks and will return '' in addition to a float or int. Also used for iefa.
@@ -42,20 +30,74 @@ def split_block_obs(line, n):
     :param n: int - size of block
     :return: list or int, float, or ''
     """
-    values = []
-    line = line[:-1]
-    length = len(line)
-    for i in range(0, length, n):
-        if i+n < length:
-            new_value = line[i:i+n].strip()
-        else:
-            new_value = line[i:].strip()
-        if new_value == '':
-            values.append(new_value)
-        else:
-            values.append(fl_int(new_value))
+    return decode_fixed([line], n, blanks=True)
+
+
+def read_block(line, geo_file):
+    """
+    Reads the lines of a fixed width numeric block, i.e. the lines following '#Sta/Elev=', '#Mann=', etc. that
+    start with a space, digit, '-' or '.'
+
+    :param line: first line of the block
+    :param geo_file: geometry file object
+    :return: (list of lines in the block, first line after the block)
+    """
+    lines = []
+    while line[:1] == ' ' or line[:1].isdigit() or line[:1] == '-' or line[:1] == '.':
+        lines.append(line)
+        line = next(geo_file)
+    return lines, line
 
-    return values
+
+def split_fields(lines, n):
+    """
+    Splits all lines of a block in to n length strings at once. The newline at the end of each line is dropped,
+    the last field of a line may be shorter than n.
+
+    :param lines: list of lines, see read_block()
+    :param n: int - size of fields
+    :return: list of strings
+    """
+    return [line[i:i + n] for line in [line[:-1] for line in lines] for i in range(0, len(line), n)]
+
+
+def count_fields(lines, n):
+    """
+    Returns the number of n length fields in the lines of a block without splitting them, same as
+    len(split_fields(lines, n))
+
+    :param lines: list of lines, see read_block()
+    :param n: int - size of fields
+    :return: int
+    """
+    return sum([(len(line) + n - 2) // n for line in lines])
+
+
+def decode_fixed(lines, n, blanks=False):
+    """
+    Decodes all n length numeric fields of a block with fl_int()
+
+    :param lines: list of lines, see read_block()
+    :param n: int - size of fields
+    :param blanks: if True blank fields are returned as '', as in obstructions and iefa. Otherwise they raise
+                   ValueError
+    :return: list of int, float, or ''
+    """
+    fields = split_fields(lines, n)
+    if blanks:
+        return [fl_int(field) if not field.isspace() and field else '' for field in fields]
+    return [fl_int(field) for field in fields]
+
+
+def decode_floats(lines, n):
+    """
+    Decodes all n length numeric fields of a block in to an array of doubles
+
+    :param lines: list of lines, see read_block()
+    :param n: int - size of fields
+    :return: array.array('d')
+    """
+    return array('d', map(float, split_fields(lines, n)))
 
 
 def fl_int(value):
@@ -73,38 +115,410 @@ def fl_int(value):
 def print_list_by_group(values, width, num_columns):
     """
     Returns string of items in list values padded left to width in width, with num_columns of items per line.
-    Lines are separated by newlines. Width of items in values are shortened to 'width'.
+    Lines are separated by newlines. Same as format_block().
 
     :param values: list of values to convert to string
     :param width: width of white space padded columns
     :param num_columns: number of columns per line
     :return: string broken into multiple lines with \n
     """
-    length = len(values)
-    s = ''
-    for row in range(0, length, num_columns):
-        # Make sure we don't overrun length of values if len(values) % num_columns != 0
-        last_column = length - row
-        if last_column > num_columns:
-            last_column = num_columns
-        # Loop through and add every item in the row
-        for column in range(0, last_column):
-            temp = ('{:>'+str(width)+'}').format(values[row + column])
-
-            # Strip leading 0 from 0.12345 - with or without spaces or '-'
-            if temp[:2] == '0.' and len(temp) > width:
-                temp = temp[1:width+1]
-            elif temp[:2] == '0.':
-                temp = ' ' + temp[1:]
-            elif len(temp) > width:
-                temp = temp[:width]
-            temp = temp.replace(' 0.', '  .')
-            temp = temp.replace('-0.', ' -.')
-
-            s += temp
-        # End of row, add newline
-        s += '\n'
-    return s
+    return format_block(values, width, num_columns)
+
+
+class Part(object):
+    """
+    Base of the parts of features. Setting an attribute of a part sets its _changed flag, which mark_unchanged()
+    clears once the part is imported. Lists and arrays of an unchanged part are wrapped in TrackedList and
+    TrackedArray, which set the flag when they are changed in place. ParseRASGeo.write() copies the original text of
+    features with no changed parts, see blocks.SourceTracker. The flag is None for read-only parts, see
+    mark_read_only().
+    """
+    __slots__ = ('_changed',)
+
+    def __setattr__(self, name, value, _set=object.__setattr__):
+        if getattr(self, '_changed', True) is None:
+            _read_only(self)
+        _set(self, name, value)
+        _set(self, '_changed', True)
+
+
+def _read_only(part):
+    raise AttributeError(type(part).__name__ + ' is read-only, assign a new part to the feature instead')
+
+
+def is_changed(part):
+    """
+    Returns True if part has been changed since mark_unchanged() was called on it, or is not a Part
+    """
+    return getattr(part, '_changed', True) is not False
+
+
+def mark_changed(part):
+    """
+    Marks part as changed. Raises AttributeError if part is read-only.
+
+    :param part: Part
+    """
+    if part._changed is None:
+        _read_only(part)
+    object.__setattr__(part, '_changed', True)
+
+
+def mark_unchanged(part):
+    """
+    Marks part as unchanged and wraps its lists and arrays so changing them in place marks it as changed
+
+    :param part: Part
+    """
+    for name in _attribute_names(part):
+        value = getattr(part, name, None)
+        tracked = _tracked_types.get(type(value))
+        if tracked is not None:
+            object.__setattr__(part, name, tracked(part, value))
+    object.__setattr__(part, '_changed', False)
+
+
+def mark_read_only(part):
+    """
+    Makes part read-only: setting its attributes or changing its lists and arrays in place raises AttributeError
+
+    :param part: Part
+    """
+    mark_unchanged(part)
+    object.__setattr__(part, '_changed', None)
+
+
+def _attribute_names(part):
+    """
+    Returns the names of the attributes of part that may hold lists or arrays. Lines kept in _raw until they are
+    decoded are never changed in place, nor are the values of Decoded attributes before they are decoded as they
+    are replaced when the lines are decoded.
+    """
+    cls = type(part)
+    names = _slot_names.get(cls)
+    if names is None:
+        slot_names = []
+        decoded = set()
+        for base in cls.__mro__:
+            slots = base.__dict__.get('__slots__', ())
+            slot_names.extend([slots] if isinstance(slots, str) else slots)
+            decoded.update([value.attribute for value in base.__dict__.values() if isinstance(value, Decoded)])
+        slot_names = [name for name in slot_names if name not in ('_raw', '_changed', '__dict__', '__weakref__')]
+        names = _slot_names[cls] = (slot_names, [name for name in slot_names if name not in decoded])
+    names = names[1] if getattr(part, '_raw', None) is not None else names[0]
+    if hasattr(part, '__dict__'):
+        return names + list(part.__dict__)
+    return names
+
+
+# class of part -> (names of its slots, names of its slots not holding Decoded values), see _attribute_names()
+_slot_names = {}
+
+
+def _marking(method, mark):
+    """
+    Returns method of a list or array wrapped to call mark(container) first
+    """
+    def marking(self, *args, **kwargs):
+        mark(self)
+        return method(self, *args, **kwargs)
+    marking.__name__ = method.__name__
+    marking.__doc__ = method.__doc__
+    return marking
+
+
+class TrackedList(list):
+    """
+    A list of a Part that marks the part as changed when the list is changed in place. Pickled as a plain list.
+    """
+    __slots__ = ('_owner',)
+
+    def __init__(self, owner, values=()):
+        list.__init__(self, values)
+        self._owner = owner
+
+    def __reduce_ex__(self, protocol):
+        return list, (list(self),)
+
+
+class TrackedArray(array):
+    """
+    An array.array of a Part that marks the part as changed when the array is changed in place. Pickled as a plain
+    array.
+    """
+    __slots__ = ('_owner',)
+
+    def __new__(cls, owner, values):
+        self = array.__new__(cls, values.typecode, values)
+        self._owner = owner
+        return self
+
+    def __reduce_ex__(self, protocol):
+        return array(self.typecode, self).__reduce_ex__(protocol)
+
+
+class IndexedList(list):
+    """
+    A list that increments its generation when it is changed in place, used for ParseRASGeo.geo_list so its
+    feature_index.FeatureIndex is rebuilt when features are added, removed or replaced. Pickled as a plain list.
+    """
+    __slots__ = ('generation', '__weakref__')
+
+    def __init__(self, values=()):
+        list.__init__(self, values)
+        # Number of changes of the list and of the indexed values of its features, see feature_index.FeatureIndex
+        self.generation = 0
+
+    def adopt(self, obj):
+        """
+        Registers obj as belonging to this list, so setting its Indexed attributes increments the generation of the
+        list. An object belongs to the last list that adopted it.
+
+        :param obj: feature or part with Indexed attributes
+        """
+        _indexed_lists[id(obj)] = self
+
+    def __reduce_ex__(self, protocol):
+        return list, (list(self),)
+
+
+# id of feature or part -> IndexedList it belongs to, see IndexedList.adopt()
+_indexed_lists = WeakValueDictionary()
+
+
+def _mark_owner(container):
+    mark_changed(container._owner)
+
+
+def _next_generation(container):
+    container.generation += 1
+
+
+_LIST_CHANGES = ('__setitem__', '__delitem__', '__iadd__', '__imul__', 'append', 'extend', 'insert', 'pop', 'remove',
+                 'reverse', 'sort', 'clear')
+for _name in _LIST_CHANGES:
+    setattr(TrackedList, _name, _marking(getattr(list, _name), _mark_owner))
+    setattr(IndexedList, _name, _marking(getattr(list, _name), _next_generation))
+for _name in ('__setitem__', '__delitem__', '__iadd__', '__imul__', 'append', 'extend', 'insert', 'pop', 'remove',
+              'reverse', 'byteswap', 'frombytes', 'fromfile', 'fromlist', 'fromunicode'):
+    setattr(TrackedArray, _name, _marking(getattr(array, _name), _mark_owner))
+
+# type of container -> wrapper used by mark_unchanged()
+_tracked_types = {list: TrackedList, array: TrackedArray}
+
+
+class Indexed(object):
+    """
+    Attribute that ParseRASGeo.get_cross_sections(), get_culverts(), etc. find features by, e.g. the station of a
+    header. Changing the value once it is set increments the generation of the IndexedList that the feature or part
+    belongs to, which tells its feature_index.FeatureIndex to rebuild. Values are stored in the attribute of the
+    same name with a leading underscore. The attribute is None until it is first set.
+    """
+    def __set_name__(self, owner, name):
+        self.attribute = '_' + name
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        return getattr(obj, self.attribute, None)
+
+    def __set__(self, obj, value):
+        if hasattr(obj, self.attribute):
+            indexed_list = _indexed_lists.get(id(obj))
+            if indexed_list is not None:
+                indexed_list.generation += 1
+        setattr(obj, self.attribute, value)
+
+
+class Decoded(object):
+    """
+    Attribute of a part of a feature that is decoded from the lines of its block on first access. The part keeps
+    the lines in _raw until then, and its decode() method sets the values of all its decoded attributes at once.
+    Values are stored in the attribute of the same name with a leading underscore. Setting the attribute decodes
+    the block first, so the other attributes are not overwritten later. Decoding does not mark the part as changed.
+    """
+    def __set_name__(self, owner, name):
+        self.attribute = '_' + name
+
+    def __get__(self, part, owner=None):
+        if part is None:
+            return self
+        if part._raw is not None:
+            changed = is_changed(part)
+            part.decode()
+            if not changed:
+                mark_unchanged(part)
+        return getattr(part, self.attribute)
+
+    def __set__(self, part, value):
+        if part._raw is not None:
+            part.decode()
+        setattr(part, self.attribute, value)
+
+
+class OptionalPart(object):
+    """
+    Part of a feature that is only created if the feature has it, e.g. CrossSection.skew. The part is stored in
+    the attribute of the same name with a leading underscore, which is None until the part is imported. Reading the
+    attribute of a feature without the part returns an empty read-only part that is shared by all features of the
+    class and not stored in them, e.g. xs.skew.angle is None. Assign a new part to add it to a feature, it is not
+    written unless it is also added to the geo_list of the feature.
+    """
+    def __init__(self, part_class):
+        """
+        :param part_class: class of the part
+        """
+        self.part_class = part_class
+        self.empty = None  # read-only part_class() returned for features without the part, created on first use
+
+    def __set_name__(self, owner, name):
+        self.attribute = '_' + name
+
+    def __get__(self, feature, owner=None):
+        if feature is None:
+            return self
+        part = getattr(feature, self.attribute)
+        if part is None:
+            part = self.empty
+            if part is None:
+                part = self.empty = self.part_class()
+                mark_read_only(part)
+        return part
+
+    def __set__(self, feature, part):
+        setattr(feature, self.attribute, part)
+
+
+class PrefixMatcher(object):
+    """
+    Tests lines against a set of prefixes that end with '=', e.g. the first lines of the features that end a lateral
+    weir. The text before the '=' of a line is looked up in a set instead of testing every prefix.
+    """
+    __slots__ = ('keys',)
+
+    def __init__(self, prefixes):
+        """
+        :param prefixes: iterable of prefixes, each ending with its only '='
+        """
+        prefixes = list(prefixes)
+        assert all(prefix.find('=') == len(prefix) - 1 for prefix in prefixes)
+        self.keys = frozenset(prefix[:-1] for prefix in prefixes)
+
+    def __call__(self, line):
+        """
+        Returns True if line starts with one of the prefixes after any leading white space, same as
+        line.strip().startswith(prefixes)
+        """
+        key = line.partition('=')[0]
+        if key in self.keys:
+            return True
+        return key[:1].isspace() and key.lstrip() in self.keys
+
+
+class OriginalBlock(object):
+    """
+    Text of a fixed width numeric block as it was read, and the values decoded from it. format_block() writes values
+    that have not changed as they were read, e.g. '0.035' stays '0.035' rather than becoming '    .035'.
+    """
+    __slots__ = ('text', 'width', 'values')
+
+    def __init__(self, lines, width, values):
+        """
+        :param lines: list of lines of the block, see read_block()
+        :param width: width of the fields
+        :param values: values decoded from lines, in the order they are written
+        """
+        self.text = ''.join(lines)
+        self.width = width
+        self.values = values
+
+    def unchanged(self, values):
+        """
+        Returns True if values are the values that were read
+        """
+        return len(values) == len(self.values) and all(map(eq, values, self.values))
+
+    def fields(self):
+        """
+        Returns the original text of every value
+        """
+        return split_fields(self.text.splitlines(True), self.width)
+
+    def tokens(self):
+        """
+        Returns (value, text) of every value, text padded to the width of the fields as format_block() writes it
+        """
+        return list(zip(self.values, [field.rjust(self.width) for field in self.fields()]))
+
+
+def format_block(values, width, num_columns, original=None):
+    """
+    Formats all values of a fixed width numeric block at once, e.g. the lines following '#Sta/Elev='. This is the
+    reverse of decode_fixed().
+
+    :param values: sequence of values, e.g. a list or array.array
+    :param width: width of white space padded columns, 8 or 16
+    :param num_columns: number of columns per line
+    :param original: optional OriginalBlock the values were read from. The original text is returned if no value
+                     has changed, otherwise values equal to the value read at the same position keep their text.
+    :return: string broken into multiple lines with \n
+    """
+    if original is None:
+        fields = [format_fixed(value, width) for value in values]
+    elif original.unchanged(values):
+        return original.text
+    else:
+        tokens = original.tokens()
+        fields = [tokens[i][1] if i < len(tokens) and value == tokens[i][0] else format_fixed(value, width)
+                  for i, value in enumerate(values)]
+    return ''.join([''.join(fields[i:i + num_columns]) + '\n' for i in range(0, len(fields), num_columns)])
+
+
+def format_fixed(value, width):
+    """
+    Returns value padded left to width. Leading zeros are removed from decimals, e.g. '0.035' becomes '    .035',
+    as HEC-RAS does. Whole floats are written as ints. Floats that are too wide are rounded to fit, other values
+    are shortened to width.
+
+    :param value: value to convert to string
+    :param width: width of white space padded column
+    :return: string of width characters
+    """
+    if type(value) is float and value.is_integer():
+        # Written without decimals as fl_int() reads them
+        text = str(int(value))
+    else:
+        text = str(value)
+    # Strip leading 0 from 0.12345 and -0.12345
+    if text[:2] == '0.':
+        text = text[1:]
+    elif text[:3] == '-0.':
+        text = '-' + text[2:]
+    if len(text) > width:
+        rounded = _round_to_width(value, width) if isinstance(value, float) else None
+        text = text[:width] if rounded is None else rounded
+    return text.rjust(width)
+
+
+def _round_to_width(value, width):
+    """
+    Returns float value rounded to as many decimals as fit in width, without leading or trailing zeros, or None
+    if it does not fit with no decimals
+    """
+    for decimals in range(width - 1, -1, -1):
+        text = '{:.{}f}'.format(value, decimals)
+        if text[:2] == '0.':
+            text = text[1:]
+        elif text[:3] == '-0.':
+            text = '-' + text[2:]
+        if len(text) <= width:
+            if decimals:
+                text = text.rstrip('0').rstrip('.')
+            # Values that round to zero
+            if text in ('', '-'):
+                text = '0'
+            return text
+    return None
 
 
 def pad_left(guts, pad_number):
@@ -115,3 +529,18 @@ def pad_left(guts, pad_number):
     :return: string
     """
     return ('{:>'+str(pad_number)+'}').format(guts)
+
+
+def chunks_of(item):
+    """
+    Returns the text of a feature, part or unknown line as an iterable of strings, so large features are written
+    without building their text in one string. Items with an iter_chunks() method are streamed, others are
+    converted with str().
+
+    :param item: feature, part or line
+    :return: iterable of str
+    """
+    iter_chunks = getattr(item, 'iter_chunks', None)
+    if iter_chunks is None:
+        return (str(item),)
+    return iter_chunks()
@@ -0,0 +1,123 @@
+"""
+Sidecar index of the blocks of a geometry file, see ParseRASGeo.build_index().
+
+The index records the type, river, reach, station, byte offset and length of every feature in the geometry
+file, along with the size and modification time of the file. Unknown lines are not recorded, they are the lines
+between the features. ParseRASGeo(lazy=True) reads it
+instead of scanning the geometry file if it is up to date, so only the features that are asked for are read.
+"""
+import json
+import os
+
+from .blocks import GeoBuffer, LazyFeature, node_station, scan_blocks
+from .registry import NODE_PREFIX, feature_types
+from .features import RiverReach
+
+# Bump when the layout of the index changes, old indexes are then ignored
+INDEX_VERSION = 2
+
+
+def index_filename_for(geo_filename):
+    """
+    Returns the default name of the index of geo_filename, e.g. 'model.g01.idx'
+    """
+    return geo_filename + '.idx'
+
+
+def build(geo_filename, index_filename=None):
+    """
+    Scans geo_filename and writes its index
+
+    :param geo_filename: name of geometry file
+    :param index_filename: name of index file, defaults to index_filename_for(geo_filename)
+    :return: name of index file
+    """
+    if index_filename is None:
+        index_filename = index_filename_for(geo_filename)
+
+    buffer = GeoBuffer(geo_filename, use_mmap=True)
+    try:
+        entries = [[feature_type.feature_class.__name__, river, reach, station, start, end - start]
+                   for feature_type, river, reach, station, start, end in scan(buffer) if feature_type is not None]
+    finally:
+        buffer.close()
+
+    stat = os.stat(geo_filename)
+    with open(index_filename, 'wt') as index_file:
+        json.dump({'version': INDEX_VERSION, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+                   'blocks': entries}, index_file, separators=(',', ':'))
+    return index_filename
+
+
+def scan(buffer):
+    """
+    Scans a geometry file that has no index. Yields the same blocks as read(). River/reaches are imported to
+    find the river and reach of the features that follow them.
+
+    :param buffer: blocks.GeoBuffer
+    :return: generator of (FeatureType or None, river, reach, station, start, end)
+    """
+    river = None
+    reach = None
+    for feature_type, start, end in scan_blocks(buffer.data):
+        station = None
+        if feature_type is None:
+            # Unknown lines are not on a river
+            yield None, None, None, None, start, end
+            continue
+        if feature_type.prefix == NODE_PREFIX:
+            station = node_station(buffer.data, start)
+        elif feature_type.feature_class is RiverReach:
+            feature = LazyFeature(feature_type, buffer, start, end, river, reach).load()
+            river, reach = feature.header.river_name, feature.header.reach_name
+        yield feature_type, river, reach, station, start, end
+
+
+def read(buffer, index_filename=None):
+    """
+    Reads the index of a geometry file. Returns the same blocks as scan(), the unknown lines between the indexed
+    features are found in buffer.
+
+    :param buffer: blocks.GeoBuffer of the geometry file
+    :param index_filename: name of index file, defaults to index_filename_for(buffer.filename)
+    :return: list of (FeatureType or None, river, reach, station, start, end), or None if there is no index, it
+             is out of date or it refers to features that are not registered
+    """
+    geo_filename = buffer.filename
+    if index_filename is None:
+        index_filename = index_filename_for(geo_filename)
+    try:
+        with open(index_filename, 'rt') as index_file:
+            index = json.load(index_file)
+    except (OSError, ValueError):
+        return None
+
+    stat = os.stat(geo_filename)
+    if (index.get('version') != INDEX_VERSION or index.get('size') != stat.st_size or
+            index.get('mtime_ns') != stat.st_mtime_ns):
+        return None
+
+    by_name = {feature_type.feature_class.__name__: feature_type for feature_type in feature_types}
+    blocks = []
+    pos = 0
+    for name, river, reach, station, start, length in index['blocks']:
+        if name not in by_name or start < pos:
+            return None
+        blocks.extend(_unknown_lines(buffer.data, pos, start))
+        pos = start + length
+        blocks.append((by_name[name], river, reach, station, start, pos))
+    blocks.extend(_unknown_lines(buffer.data, pos, len(buffer.data)))
+    return blocks
+
+
+def _unknown_lines(data, start, end):
+    """
+    Returns a block for every line between byte offsets start and end, which are between features, see read()
+    """
+    blocks = []
+    while start < end:
+        eol = data.find(b'\n', start, end)
+        eol = end if eol < 0 else eol + 1
+        blocks.append((None, None, None, None, start, eol))
+        start = eol
+    return blocks
@@ -0,0 +1,217 @@
+"""
+Tunable values of a geometry, e.g. Manning's n values or weir coefficients, for sensitivity and Monte Carlo
+analysis.
+
+A Field is a single value of a feature that can be read and changed in place. The selector functions below
+return the fields of one kind for a whole geometry:
+
+    fields = parameters.mannings_n(geo) + parameters.skew_angles(geo)
+    template = geo.compile_template(fields)
+
+Selectors may also be passed to ParseRASGeo.parameter_vector() to get the values as a flat vector for optimizers.
+"""
+from .features.tools import fl_int, format_fixed
+
+
+class Field(object):
+    """
+    A single tunable value of a feature
+    """
+    def __init__(self, feature, owner, attribute, index=None, position=None, width=None, formatter=None, name=None,
+                 original=None):
+        """
+        :param feature: top level feature the value belongs to, e.g. a CrossSection
+        :param owner: object holding the value, e.g. CrossSection.mannings_n
+        :param attribute: name of the attribute of owner holding the value, or holding a list of tuples
+        :param index: index of the tuple in the list, None if attribute holds the value itself
+        :param position: position of the value in the tuple
+        :param width: width of the fixed width column the value is written in
+        :param formatter: callable(value) returning the value as it is written, for values that are not written
+                          with str() or in a fixed width column
+        :param name: description of the field, e.g. 'Boulder Creek/Upper/12345.6 mannings_n[1]'
+        :param original: optional (value, text) of the value as it was read, the value is written as text while it
+                         is unchanged
+        """
+        self.feature = feature
+        self.owner = owner
+        self.attribute = attribute
+        self.index = index
+        self.position = position
+        self.width = width
+        self.formatter = formatter
+        self.name = name
+        self.original = original
+
+    def get(self):
+        """
+        Returns the current value
+        """
+        value = getattr(self.owner, self.attribute)
+        if self.index is None:
+            return value
+        return value[self.index][self.position]
+
+    def set(self, value):
+        """
+        Changes the value in place
+        """
+        if self.index is None:
+            setattr(self.owner, self.attribute, value)
+            return
+        values = getattr(self.owner, self.attribute)
+        old = values[self.index]
+        values[self.index] = old[:self.position] + (value,) + old[self.position + 1:]
+
+    def format(self, value):
+        """
+        Returns value as it is written in the geometry file
+        """
+        if self.original is not None and value == self.original[0]:
+            return self.original[1]
+        if self.width is not None:
+            return format_fixed(value, self.width)
+        if self.formatter is not None:
+            return self.formatter(value)
+        return str(value)
+
+    def __repr__(self):
+        return '<Field ' + str(self.name) + '>'
+
+
+def _node_name(node):
+    """
+    Returns 'river/reach/station' of a node for Field names
+    """
+    station = node.header.station
+    return str(node.river) + '/' + str(node.reach) + '/' + str(getattr(station, 'id', station))
+
+
+def _format_skew(angle):
+    # Same as Skew.__str__()
+    return str(fl_int(angle))
+
+
+def mannings_n(geo, river=None, reach=None):
+    """
+    Returns a Field for every Manning's n value of every cross section
+
+    :param geo: ParseRASGeo
+    :param river: Optional string of the name of river
+    :param reach: Optional string of the name of reach
+    :return: list of Field
+    """
+    return _mannings_n_fields(geo, river, reach, lambda xs, station: True)
+
+
+def channel_n(geo, river=None, reach=None):
+    """
+    Returns a Field for every Manning's n value of the main channel of every cross section, i.e. the values that
+    start at or right of the left bank station and left of the right bank station, as CrossSection.channel_n.
+    Run CrossSection.define_channel_n() first where n values do not change at the bank stations.
+
+    :param geo: ParseRASGeo
+    :param river: Optional string of the name of river
+    :param reach: Optional string of the name of reach
+    :return: list of Field
+    """
+    return _mannings_n_fields(geo, river, reach,
+                              lambda xs, station: xs.bank_sta.left <= station < xs.bank_sta.right)
+
+
+def overbank_n(geo, river=None, reach=None):
+    """
+    Returns a Field for every Manning's n value of every cross section that is not in the main channel, see
+    channel_n()
+
+    :param geo: ParseRASGeo
+    :param river: Optional string of the name of river
+    :param reach: Optional string of the name of reach
+    :return: list of Field
+    """
+    return _mannings_n_fields(geo, river, reach,
+                              lambda xs, station: not xs.bank_sta.left <= station < xs.bank_sta.right)
+
+
+def _mannings_n_fields(geo, river, reach, wanted):
+    """
+    Returns a Field for the Manning's n values for which wanted(xs, station) is True. Cross sections without bank
+    stations are skipped if wanted uses them.
+    """
+    fields = []
+    for xs in geo.get_cross_sections(river=river, reach=reach):
+        name = _node_name(xs)
+        # (value, text) of the values as read, unchanged values keep their text, see tools.format_block()
+        tokens = [] if xs.mannings_n.original is None else xs.mannings_n.original.tokens()
+        for i, (station, _, _) in enumerate(xs.mannings_n.values):
+            try:
+                if not wanted(xs, station):
+                    continue
+            except TypeError:
+                # Bank stations are None
+                break
+            position = 3 * i + 1
+            fields.append(Field(xs, xs.mannings_n, 'values', i, 1, width=8,
+                                name=name + ' mannings_n[' + str(i) + ']',
+                                original=tokens[position] if position < len(tokens) else None))
+    return fields
+
+
+def skew_angles(geo, river=None, reach=None):
+    """
+    Returns a Field for the skew angle of every skewed cross section
+
+    :param geo: ParseRASGeo
+    :param river: Optional string of the name of river
+    :param reach: Optional string of the name of reach
+    :return: list of Field
+    """
+    return [Field(xs, xs.skew, 'angle', formatter=_format_skew, name=_node_name(xs) + ' skew')
+            for xs in geo.get_cross_sections(river=river, reach=reach) if xs.skew.angle is not None]
+
+
+def culvert_manning_top(geo, river=None, reach=None):
+    """
+    Returns a Field for the Manning's n of the top of every culvert group of every culvert
+
+    :param geo: ParseRASGeo
+    :param river: Optional string of the name of river
+    :param reach: Optional string of the name of reach
+    :return: list of Field
+    """
+    fields = []
+    for culvert in geo.get_culverts(river=river, reach=reach):
+        name = _node_name(culvert)
+        for i, group in enumerate(culvert.culvert_groups):
+            fields.append(Field(culvert, group, 'manning_top',
+                                name=name + ' culvert_groups[' + str(i) + '].manning_top'))
+    return fields
+
+
+def lateral_weir_coefficients(geo):
+    """
+    Returns a Field for the weir coefficient of every lateral weir that has one
+
+    :param geo: ParseRASGeo
+    :return: list of Field
+    """
+    return [Field(weir, weir.coef, 'coefficient', name=_node_name(weir) + ' coef', original=weir.coef.original)
+            for weir in geo.get_lateral_weirs() if weir.coef.coefficient is not None]
+
+
+def culvert_loss_coefficients(geo, river=None, reach=None):
+    """
+    Returns a Field for the entrance and exit loss coefficients of every culvert group of every culvert
+
+    :param geo: ParseRASGeo
+    :param river: Optional string of the name of river
+    :param reach: Optional string of the name of reach
+    :return: list of Field
+    """
+    fields = []
+    for culvert in geo.get_culverts(river=river, reach=reach):
+        name = _node_name(culvert)
+        for i, group in enumerate(culvert.culvert_groups):
+            prefix = name + ' culvert_groups[' + str(i) + ']'
+            fields.append(Field(culvert, group, 'entrance_loss', name=prefix + '.entrance_loss'))
+            fields.append(Field(culvert, group, 'exit_loss_coef', name=prefix + '.exit_loss_coef'))
+    return fields
@@ -1,4 +1,5 @@
 from .features.boundary import Boundary
+from .features.tools import chunks_of
 
 
 def format_float_fixed_width(val, width=8):
@@ -180,8 +181,7 @@ class SteadyFlow:
         Writes steady flow data to outfilename.
         """
         with open(outfilename, "wt", newline="\r\n") as outfile:
-            for item in self.flow_list:
-                outfile.write(str(item))
+            outfile.writelines(chunk for item in self.flow_list for chunk in chunks_of(item))
 
     def __str__(self):
         """
@@ -216,8 +216,7 @@ class UnsteadyFlow:
         Writes unsteady flow data to outfilename.
         """
         with open(outfilename, "wt", newline="\r\n") as outfile:
-            for line in self.uflow_list:
-                outfile.write(str(line))
+            outfile.writelines(chunk for item in self.uflow_list for chunk in chunks_of(item))
 
     def get_boundaries(
         self, river=None, reach=None, station_value=None, hydrograph_type=None
@@ -10,10 +10,22 @@ mike.bannister@respec.com
 """
 import os.path
 import warnings
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, repeat
 
 from .features import (
     Bridge, CrossSection, Culvert, Junction, InlineWeir, LateralWeir, RiverReach, StorageArea
 )
+from . import cache as geo_cache
+from . import index as geo_index
+from .blocks import (GeoBuffer, LazyFeature, SourceTracker, import_blocks, scan_blocks, track_changes,
+                     unchanged_since)
+from .feature_index import adopt, FeatureIndex
+from .template import GeoTemplate
+from .features.station import Station
+from .features.tools import IndexedList, chunks_of
+from .registry import feature_types, lookup_feature
 
 
 # TODO - create geolist object
@@ -25,94 +37,454 @@ class CrossSectionNotFound(Exception):
 class CulvertNotFound(Exception):
     pass
 
+def iter_features(geo_filename, types=None, debug=False):
+    """
+    Yields the features and unknown lines of a geometry file one at a time without keeping them, for reading
+    large numbers of geometry files with bounded memory. The file is memory mapped and features that are not
+    wanted are skipped without being decoded or imported.
+
+    for river, reach, xs in iter_features('model.g01', types=[CrossSection]):
+        print(river, reach, xs.header.station)
+
+    :param geo_filename: name of geometry file
+    :param types: Optional iterable of classes to return, e.g. [CrossSection, Culvert]. Include str for unknown
+                  lines. Defaults to all features and lines.
+    :param debug: passed to the features
+    :return: generator of (river, reach, feature or line). river and reach are those of the most recent
+             RiverReach, or None before the first one.
+    """
+    _check_filename(geo_filename, 'iter_features')
+    if types is None:
+        types = (object,)
+    else:
+        types = tuple(types)
+
+    buffer = GeoBuffer(geo_filename, use_mmap=True)
+    try:
+        for river, reach, item, _, _ in _walk(buffer, lambda feature_class: issubclass(feature_class, types), debug):
+            if type(item) is not LazyFeature and isinstance(item, types):
+                yield river, reach, item
+    finally:
+        buffer.close()
+
+
+def transform(geo_filename, out_geo_filename, callbacks, debug=False):
+    """
+    Copies a geometry file, altering features on the way. Only features with a callback are imported, each
+    one is written as soon as its callback returns, everything else is copied as is. Features the callback did
+    not change are copied as is too. Memory use is that of one feature rather than the whole geometry.
+
+    def scale_n(xs):
+        xs.mannings_n.values = [(sta, n * 1.1, other) for sta, n, other in xs.mannings_n.values]
+
+    transform('model.g01', 'model.g02', {CrossSection: scale_n})
+
+    :param geo_filename: name of geometry file to read
+    :param out_geo_filename: name of geometry file to write, may not be geo_filename
+    :param callbacks: dict of {feature class: callable(feature)}. The callable alters the feature in place.
+    :param debug: passed to the features
+    :return: number of features passed to callbacks
+    """
+    _check_filename(geo_filename, 'transform')
+    if os.path.exists(out_geo_filename) and os.path.samefile(geo_filename, out_geo_filename):
+        raise AttributeError('transform can not overwrite the file it is reading: ' + str(geo_filename))
+
+    def find_callback(feature_class):
+        for cls in feature_class.__mro__:
+            if cls in callbacks:
+                return callbacks[cls]
+        return None
+
+    num_transformed = 0
+    buffer = GeoBuffer(geo_filename, use_mmap=True)
+    try:
+        with open(out_geo_filename, 'wt', newline='\r\n') as outfile:
+            for _, _, item, start, end in _walk(buffer, lambda feature_class: find_callback(feature_class) is not None,
+                                                debug):
+                callback = None
+                if type(item) is not LazyFeature and not isinstance(item, str):
+                    callback = find_callback(type(item))
+                if callback is None:
+                    outfile.write(buffer.text(start, end))
+                    continue
+                items = track_changes(item)
+                callback(item)
+                num_transformed += 1
+                if unchanged_since(item, items):
+                    outfile.write(buffer.text(start, end))
+                else:
+                    outfile.writelines(chunks_of(item))
+    finally:
+        buffer.close()
+    return num_transformed
+
+
+def _walk(buffer, load, debug=False):
+    """
+    Yields (river, reach, item, start, end) for every feature and unknown line in buffer, start and end are the
+    byte offsets of its text. Features are imported if load(feature class) is True and left as LazyFeature
+    otherwise, unknown lines are str. River/reaches are always imported to keep track of the river and reach.
+
+    :param buffer: blocks.GeoBuffer
+    :param load: callable(feature class) returning bool
+    :param debug: passed to the features
+    """
+    river = None
+    reach = None
+    for feature_type, start, end in scan_blocks(buffer.data):
+        if feature_type is None:
+            yield river, reach, buffer.text(start, end), start, end
+            continue
+
+        item = LazyFeature(feature_type, buffer, start, end, river, reach, debug)
+        if feature_type.feature_class is RiverReach or load(feature_type.feature_class):
+            item = item.load()
+        if isinstance(item, RiverReach):
+            river, reach = item.header.river_name, item.header.reach_name
+        yield river, reach, item, start, end
+
+
+def _check_filename(geo_filename, caller):
+    """
+    Raises AttributeError if geo_filename is blank or does not exist
+    """
+    if geo_filename == '' or geo_filename is None:
+        raise AttributeError('Filename passed to ' + caller + ' is blank.')
+    if not os.path.isfile(geo_filename):
+        raise AttributeError('File ' + str(geo_filename) + ' does not appear to exist.')
+
+
 class ParseRASGeo(object):
-    def __init__(self, geo_filename, chatty=False, debug=False):
+    def __init__(self, geo_filename, chatty=False, debug=False, lazy=False, mmap=False, workers=None, cache=None,
+                 spill_dir=None):
+        """
+        :param geo_filename: name of geometry file
+        :param chatty: prints the number of features imported if True
+        :param debug: prints debugging information while importing if True
+        :param lazy: if True features other than river/reaches are located but not imported until they are first
+                     returned by get_cross_sections(), get_culverts(), etc. Until then geo_list holds
+                     blocks.LazyFeature placeholders which write the original text of the feature.
+        :param mmap: if True the blocks of the file used by lazy or workers are memory mapped rather than read into
+                     memory. With lazy=True the map stays open while the geometry is in use, so only the features
+                     that are imported are paged in. Ignored otherwise, as importing every feature is faster from
+                     the text file than from a map.
+        :param workers: number of processes used to import features. Features are split into ranges that are
+                        imported by a concurrent.futures.ProcessPoolExecutor, geo_list is in the same order as it
+                        would be with one process. At most os.cpu_count() processes are used, features are
+                        imported in this process if that is one. Ignored if lazy is True. Features registered with
+                        register_feature() must be registered when their module is imported to be available to
+                        worker processes on platforms that do not fork.
+        :param cache: True to use the cache in cache.DEFAULT_CACHE_DIR, or name of a cache directory. The imported
+                      geometry is loaded from the cache if the file has not changed since it was stored, otherwise
+                      the file is imported and stored. May not be combined with lazy or spill_dir.
+        :param spill_dir: name of a directory to move the 2D points of storage areas to as soon as each storage
+                          area is imported, see spill_points_2d(). The points of only one storage area are held in
+                          memory at a time, and their lines are streamed to the sidecar as they were read. The
+                          sidecars are named after geo_filename, e.g. spill_dir/my_model.g01.sa0.pts.
+        """
         # add  test for file existence
-        self.geo_list = []
-        num_xs = 0
-        num_river = 0
-        num_bridge = 0
-        num_culvert = 0
-        num_lat_weir = 0
-        num_inline_weir = 0
-        num_junc = 0
-        num_storage_area = 0
-        num_unknown = 0
-        river = None
-        reach = None
+        self.geo_list = IndexedList()
+        self.debug = debug
+        self._counts = dict.fromkeys(feature_types, 0)
+        self._num_unknown = 0
+        self._buffer = None  # blocks.GeoBuffer used by LazyFeatures in geo_list
+        self._sources = None  # blocks.SourceTracker of features imported from blocks, used by write()
+        self._index = None  # feature_index.FeatureIndex of geo_list, built by the first get_...() call
+        self.parameter_fields = []  # parameters.Field of the last parameter_vector(), in vector order
+        # Start of the names of the sidecars of storage areas spilled as they are imported, see _spill_imported()
+        self._spill_prefix = None if spill_dir is None else os.path.join(spill_dir, os.path.basename(geo_filename))
 
         if debug:
             print('Debugging is turned on')
 
-        if geo_filename == '' or geo_filename is None:
-            raise AttributeError('Filename passed to ParseRASGeo is blank.')
+        _check_filename(geo_filename, 'ParseRASGeo')
+        if cache and lazy:
+            raise AttributeError('cache and lazy may not be used together')
+        if cache and spill_dir is not None:
+            raise AttributeError('cache and spill_dir may not be used together')
+
+        if cache:
+            cache_dir = geo_cache.cache_dir_for(cache)
+            key = geo_cache.cache_key(geo_filename)
+            geo_list = geo_cache.load(cache_dir, key)
+            if geo_list is not None:
+                self._adopt(geo_list)
+            else:
+                self._parse(geo_filename, lazy, mmap, workers)
+                geo_cache.store(cache_dir, key, self.geo_list)
+        else:
+            self._parse(geo_filename, lazy, mmap, workers)
+
+        if chatty:
+            for feature_type in feature_types:
+                print(str(self._counts[feature_type]) + ' ' + feature_type.label + ' imported')
+            print(str(self._num_unknown) + ' unknown lines imported')
+
+    def _parse(self, geo_filename, lazy, mmap, workers):
+        """
+        Imports geo_filename into geo_list, see __init__()
+        """
+        if lazy or (workers is not None and workers > 1):
+            self._scan(geo_filename, lazy, mmap, workers)
+        else:
+            self._import(geo_filename)
 
-        if not os.path.isfile(geo_filename):
-            raise AttributeError('File ' + str(geo_filename) + ' does not appear to exist.')
+    def _adopt(self, geo_list):
+        """
+        Uses geo_list loaded from the cache and counts its features
+        """
+        feature_type_of = {feature_type.feature_class: feature_type for feature_type in feature_types}
+        self.geo_list = IndexedList(geo_list)
+        for item in geo_list:
+            if isinstance(item, str):
+                self._num_unknown += 1
+            elif type(item) in feature_type_of:
+                self._counts[feature_type_of[type(item)]] += 1
+
+    def _import(self, geo_filename):
+        """
+        Imports all features in geo_filename into geo_list
+        """
+        river = None
+        reach = None
 
         # TODO - add 'debug' to all objects
         with open(geo_filename, 'rt') as geo_file:
             for line in geo_file:
-                if RiverReach.test(line):
-                    rr = RiverReach(debug)
-                    rr.import_geo(line, geo_file)
-                    river, reach = rr.header.river_name, rr.header.reach_name
-                    num_river += 1
-                    self.geo_list.append(rr)
-                elif CrossSection.test(line):
-                    xs = CrossSection(river, reach, debug)
-                    xs.import_geo(line, geo_file)
-                    num_xs += 1
-                    self.geo_list.append(xs)
-                elif Culvert.test(line):
-                    culvert = Culvert(river, reach, debug)
-                    culvert.import_geo(line, geo_file)
-                    num_culvert += 1
-                    self.geo_list.append(culvert)
-                elif Bridge.test(line):
-                    bridge = Bridge(river, reach)
-                    bridge.import_geo(line, geo_file)
-                    num_bridge += 1
-                    self.geo_list.append(bridge)
-                elif LateralWeir.test(line):
-                    lat_weir = LateralWeir(river, reach)
-                    lat_weir.import_geo(line, geo_file)
-                    num_lat_weir += 1
-                    self.geo_list.append(lat_weir)
-                elif InlineWeir.test(line):
-                    lat_weir = InlineWeir(river, reach)
-                    lat_weir.import_geo(line, geo_file)
-                    num_inline_weir += 1
-                    self.geo_list.append(lat_weir)
-                elif Junction.test(line):
-                    junc = Junction()
-                    junc.import_geo(line, geo_file)
-                    num_junc += 1
-                    self.geo_list.append(junc)
-                elif StorageArea.test(line):
-                    sa = StorageArea(debug)
-                    sa.import_geo(line, geo_file)
-                    num_storage_area += 1
-                    self.geo_list.append(sa)
-                else:
-                    # Unknown line encountered. Store it as text.
-                    self.geo_list.append(line)
-                    num_unknown += 1
-        if chatty:
-            print(str(num_river)+' rivers/reaches imported')
-            print(str(num_junc)+' junctions imported')
-            print(str(num_xs)+' cross sections imported')
-            print(str(num_bridge)+' bridge imported')
-            print(str(num_culvert)+' culverts imported')
-            print(str(num_lat_weir)+' lateral weirs imported')
-            print(str(num_inline_weir)+' inline weirs imported')
-            print(str(num_storage_area) + ' storage areas imported')
-            print(str(num_unknown) + ' unknown lines imported')
+                while line:
+                    feature_type = lookup_feature(line)
+                    if feature_type is None:
+                        # Unknown line encountered. Store it as text.
+                        self.geo_list.append(line)
+                        self._num_unknown += 1
+                        break
+
+                    feature = feature_type.factory(river, reach, self.debug)
+                    line = feature.import_geo(line, geo_file)
+                    if isinstance(feature, RiverReach):
+                        river, reach = feature.header.river_name, feature.header.reach_name
+                    self._counts[feature_type] += 1
+                    self._spill_imported(len(self.geo_list), feature)
+                    self.geo_list.append(feature)
+
+                    # import_geo() returns the next line to be read, e.g. the first line of the next storage
+                    # area. Nodes and river/reaches end on a blank line they write back themselves.
+                    if line == '\n':
+                        break
+
+    def _scan(self, geo_filename, lazy, use_mmap, workers=None):
+        """
+        Splits geo_filename into features with blocks.scan_blocks() and adds them to geo_list, as LazyFeature if
+        lazy is True. River/reaches are always imported as they set the river and reach of the features that
+        follow them.
+        """
+        if workers is not None:
+            # More processes than CPUs only add the cost of sending features between them
+            workers = min(workers, os.cpu_count() or 1)
+        parallel = not lazy and workers is not None and workers > 1
+
+        buffer = GeoBuffer(geo_filename, use_mmap)
+        self._sources = SourceTracker(geo_filename)
+        blocks = None
+        if lazy:
+            blocks = geo_index.read(buffer)
+        if blocks is None:
+            blocks = geo_index.scan(buffer)
+
+        for feature_type, river, reach, station, start, end in blocks:
+            if feature_type is None:
+                self.geo_list.append(buffer.text(start, end))
+                self._num_unknown += 1
+                continue
+
+            feature = LazyFeature(feature_type, buffer, start, end, river, reach, self.debug, station)
+            if feature_type.feature_class is RiverReach or not (lazy or parallel):
+                feature = feature.load()
+                self._spill_imported(len(self.geo_list), feature)
+                self._sources.add(feature, start, end)
+            self._counts[feature_type] += 1
+            self.geo_list.append(feature)
+
+        if parallel:
+            self._load_parallel(geo_filename, workers)
+
+        if lazy:
+            self._buffer = buffer
+        else:
+            buffer.close()
+
+    @staticmethod
+    def build_index(geo_filename, index_filename=None):
+        """
+        Writes a sidecar index of geo_filename holding the type, river, reach, station, byte offset and length of
+        every feature. ParseRASGeo(geo_filename, lazy=True) then opens the geometry without scanning it and
+        get_cross_sections(river=..., station_value=...) only reads the matching cross sections. The index is
+        ignored once geo_filename changes and must be rebuilt.
+
+        :param geo_filename: name of geometry file
+        :param index_filename: name of index file, defaults to geo_filename + '.idx'
+        :return: name of index file
+        """
+        _check_filename(geo_filename, 'build_index')
+        return geo_index.build(geo_filename, index_filename)
+
+    def _load_parallel(self, geo_filename, workers):
+        """
+        Imports all LazyFeatures in geo_list using worker processes. Features are split into ranges of about the
+        same number of bytes, several per worker so the load evens out.
+        """
+        indexes = [i for i, item in enumerate(self.geo_list) if type(item) is LazyFeature]
+        if not indexes:
+            return
+        chunk_bytes = sum(self.geo_list[i].end - self.geo_list[i].start for i in indexes) / (workers * 4.0)
+
+        chunks = []
+        chunk = []
+        size = 0
+        for i in indexes:
+            feature = self.geo_list[i]
+            chunk.append(i)
+            size += feature.end - feature.start
+            if size >= chunk_bytes:
+                chunks.append(chunk)
+                chunk = []
+                size = 0
+        if chunk:
+            chunks.append(chunk)
+
+        blocks = [[(self.geo_list[i].start, self.geo_list[i].end, self.geo_list[i].river, self.geo_list[i].reach)
+                   for i in chunk] for chunk in chunks]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(import_blocks, repeat(geo_filename), blocks, repeat(self.debug))
+            for chunk, features in zip(chunks, results):
+                for i, feature in zip(chunk, features):
+                    self._spill_imported(i, feature)
+                    self._sources.add(feature, self.geo_list[i].start, self.geo_list[i].end)
+                    # The feature replaces its placeholder, the index does not change
+                    list.__setitem__(self.geo_list, i, feature)
+
+    def _features(self, feature_class, river=None, reach=None, station_id=None, station_value=None):
+        """
+        Yields the features in geo_list that are instances of feature_class and may match river, reach and
+        station, in the order of geo_list. Features are found with a feature_index.FeatureIndex, callers must
+        still check the features they get. LazyFeature placeholders are imported and replaced in geo_list as
+        they are reached.
+
+        :param feature_class: class of features to return
+        :param river: Optional string of the name of river
+        :param reach: Optional string of the name of reach
+        :param station_id: Optional string of the station as text
+        :param station_value: Optional number or 2-tuple (low, high) of numbers or None
+        """
+        index = self._feature_index()
+        for i in index.positions(feature_class, river, reach, station_id, station_value):
+            item = self._load(i)
+            if isinstance(item, feature_class):
+                yield item
+
+    def _feature_index(self):
+        """
+        Returns the FeatureIndex of geo_list, building it if geo_list has changed
+        """
+        if self._index is None or not self._index.is_current(self.geo_list):
+            self._index = FeatureIndex(self.geo_list)
+        return self._index
+
+    def _load(self, i):
+        """
+        Returns geo_list[i], importing it first if it is a LazyFeature
+        """
+        item = self.geo_list[i]
+        if type(item) is LazyFeature:
+            feature = item.load()
+            self._spill_imported(i, feature)
+            # The feature replaces its placeholder, the index does not change
+            list.__setitem__(self.geo_list, i, feature)
+            adopt(self.geo_list, feature)
+            self._sources.add(feature, item.start, item.end)
+            return feature
+        return item
+
+    def reindex(self):
+        """
+        Rebuilds the indexes behind get_cross_sections(), get_culverts(), etc. The indexes are rebuilt
+        automatically when geo_list is changed or the river, reach or station of a feature is set, this is only
+        needed after changing a list assigned to geo_list by hand.
+        """
+        self._index = FeatureIndex(self.geo_list)
 
     def write(self, out_geo_filename):
-        with open(out_geo_filename, 'wt', newline='\r\n') as outfile:
-            for line in self.geo_list:
-                outfile.write(str(line))
+        """
+        Writes geo_list to out_geo_filename. Features imported from blocks of the geometry file (lazy or
+        workers) that have not been changed since are copied from the original file instead of being
+        re-serialized, so the time to write depends on the number of changed features.
+
+        :param out_geo_filename: name of geometry file to write, may be the file that was imported
+        """
+        # The source is copied or mapped before open() truncates out_geo_filename, which may be the source
+        source, own_source = self._open_source(out_geo_filename)
+        try:
+            with open(out_geo_filename, 'wt', newline='\r\n') as outfile:
+                # Features are streamed in chunks, see features.tools.chunks_of()
+                outfile.writelines(chunk for _, chunks in self._item_chunks(source) for chunk in chunks)
+        finally:
+            if own_source:
+                source.close()
+
+    def _open_source(self, out_geo_filename=None):
+        """
+        Returns (blocks.GeoBuffer of the source file or None, True if the caller must close it) for
+        _item_chunks(). The file is read into memory if out_geo_filename is the source and is about to be
+        overwritten.
+
+        :param out_geo_filename: Optional name of the file that will be written
+        """
+        overwrites = out_geo_filename is not None and os.path.exists(out_geo_filename)
+        source = self._buffer
+        if source is not None:
+            if overwrites and source.is_file(out_geo_filename):
+                # LazyFeatures still read from the file being overwritten
+                source.detach()
+            return source, False
+        if self._sources is not None and self._sources.source_unchanged():
+            return GeoBuffer(self._sources.filename, use_mmap=not overwrites or
+                             not os.path.samefile(out_geo_filename, self._sources.filename)), True
+        return None, False
+
+    def _item_chunks(self, source):
+        """
+        Yields (item, iterable of the text to write) for every item in geo_list, see write()
+
+        :param source: blocks.GeoBuffer of the source file, see _open_source(). Features that have not changed
+                       are copied from it, all features are serialized if it is None.
+        """
+        for item in self.geo_list:
+            span = None
+            if source is not None and not isinstance(item, str) and type(item) is not LazyFeature:
+                span = self._sources.clean_span(item)
+            yield item, chunks_of(item) if span is None else (source.text(*span),)
+
+    def compile_template(self, fields):
+        """
+        Returns a template.GeoTemplate that writes variants of this geometry with different values of fields,
+        for Monte Carlo and sensitivity runs. Only the fields are formatted for each variant, the rest of the
+        geometry is rendered once. Changes made to the geometry after compiling are not in the template.
+
+        fields = parameters.mannings_n(geo)
+        nominal = [field.get() for field in fields]
+        template = geo.compile_template(fields)
+        for i in range(1000):
+            template.write('model.g' + str(i), [n * random.uniform(0.8, 1.2) for n in nominal])
+
+        :param fields: list of parameters.Field
+        :return: template.GeoTemplate
+        """
+        source, own_source = self._open_source()
+        try:
+            return GeoTemplate(((item, ''.join(chunks)) for item, chunks in self._item_chunks(source)), fields)
+        finally:
+            if own_source:
+                source.close()
 
     def get_cross_sections(
             self,
@@ -130,15 +502,16 @@ class ParseRASGeo(object):
         :param interpolated: Optional bool to select based on if the CrossSection was interpolated
         :return: List of matching CrossSection instances
         """
-        # Linear Search is the most efficient strategy at the moment
-        cross_sections = (item for item in self.geo_list if isinstance(item, CrossSection))
+        if isinstance(station_value, tuple):
+            assert len(station_value) == 2
+
+        cross_sections = self._features(CrossSection, river, reach, station_id, station_value)
         if station_id is not None:
             cross_sections = (
                 xs for xs in cross_sections if xs.header.station.id == station_id
             )
         if station_value is not None:
             if isinstance(station_value, tuple):
-                assert len(station_value) == 2
                 if station_value[0] is not None:
                     cross_sections = (
                         xs for xs in cross_sections
@@ -166,6 +539,67 @@ class ParseRASGeo(object):
 
         return list(cross_sections)
 
+    def lookup_many(self, keys, tolerance=0.001, types=(CrossSection, Culvert, InlineWeir, LateralWeir)):
+        """
+        Returns the nodes matching many (river, reach, station) keys at once, e.g. the rows of a calibration
+        table. Stations match if they differ by no more than tolerance, the closest one is returned.
+
+        nodes = geo.lookup_many([('Boulder Creek', 'Upper', 12345.6), ('Boulder Creek', 'Upper', 12100)])
+
+        :param keys: iterable of (river, reach, station) tuples, or a table such as a pandas DataFrame with
+                     'river', 'reach' and 'station' columns. Stations may be numbers or text, e.g. '12345.6*'
+        :param tolerance: largest difference between station values that is a match
+        :param types: tuple of node classes to look for
+        :return: list with the matching node, or None if there is no match, for each key in the order of keys
+        """
+        if hasattr(keys, 'columns'):
+            keys = zip(keys['river'], keys['reach'], keys['station'])
+
+        index = self._feature_index()
+        nodes = []
+        for river, reach, station in keys:
+            if isinstance(station, str):
+                station = Station(station).value
+            i = index.nearest(tuple(types), river, reach, station, tolerance)
+            nodes.append(None if i is None else self._load(i))
+        return nodes
+
+    def parameter_vector(self, selector):
+        """
+        Returns the values of tunable fields as a flat vector of floats, for calibration with an optimizer. The
+        fields are kept in parameter_fields in the order of the vector, and apply_vector() writes a vector back
+        to them.
+
+        x0 = geo.parameter_vector([parameters.channel_n, parameters.overbank_n])
+        result = scipy.optimize.minimize(run_model, x0)
+        geo.apply_vector(result.x)
+
+        :param selector: callable(geo) returning a list of parameters.Field, e.g. parameters.channel_n, or a list
+                         of such callables and Fields
+        :return: array.array of doubles, numpy.asarray() uses it without copying
+        """
+        if callable(selector):
+            selector = [selector]
+        fields = []
+        for item in selector:
+            if callable(item):
+                fields.extend(item(self))
+            else:
+                fields.append(item)
+        self.parameter_fields = fields
+        return array('d', [float(field.get()) for field in fields])
+
+    def apply_vector(self, x):
+        """
+        Writes the values of x to the fields of the last parameter_vector()
+
+        :param x: sequence of numbers, in the order of parameter_fields
+        """
+        if len(x) != len(self.parameter_fields):
+            raise ValueError('Expected ' + str(len(self.parameter_fields)) + ' values, got ' + str(len(x)))
+        for field, value in zip(self.parameter_fields, x):
+            field.set(float(value))
+
     def return_xs_by_id(self, xs_id, rnd=False, digits=0):
         """
         Returns XS with ID xs_id. Rounds XS ids to digits decimal places if (rnd==True)
@@ -178,14 +612,15 @@ class ParseRASGeo(object):
             "return_xs_by_id is deprecated, use get_cross_sections instead",
             FutureWarning,
         )
-        for item in self.geo_list:
-            if isinstance(item, CrossSection):
-                if rnd:
-                    if round(item.header.station.value, digits) == round(xs_id, digits):
-                        return item
-                else:
-                    if item.header.station.value == xs_id:
-                        return item
+        # Values that round to the same digits are less than 10**-digits apart
+        near = (xs_id - 10 ** -digits, xs_id + 10 ** -digits) if rnd else xs_id
+        for item in self._features(CrossSection, station_value=near):
+            if rnd:
+                if round(item.header.station.value, digits) == round(xs_id, digits):
+                    return item
+            else:
+                if item.header.station.value == xs_id:
+                    return item
         raise CrossSectionNotFound
 
     def return_xs(self, xs_id, river, reach, strip=False, rnd=False, digits=0):
@@ -229,7 +664,7 @@ class ParseRASGeo(object):
         :param reach: Optional string of the name of reach
         :return: List of matching Culvert instances
         """
-        culverts = (item for item in self.geo_list if isinstance(item, Culvert))
+        culverts = self._features(Culvert, river, reach, station_value=station)
         if station is not None:
             culverts = (c for c in culverts if c.header.station == station)
         if river is not None:
@@ -263,20 +698,20 @@ class ParseRASGeo(object):
         """
         Returns list of all Junction in geometry
         """
-        return [item for item in self.geo_list if isinstance(item, Junction)]
+        return list(self._features(Junction))
 
 
     def get_bridges(self):
         """
         Returns list of all Bridge in geometry
         """
-        return [item for item in self.geo_list if isinstance(item, Bridge)]
+        return list(self._features(Bridge))
 
     def get_lateral_weirs(self):
         """
         Returns list of all LateralWeir in geometry
         """
-        return [item for item in self.geo_list if isinstance(item, LateralWeir)]
+        return list(self._features(LateralWeir))
 
     def get_inline_weirs(self, river=None, reach=None):
         """
@@ -284,7 +719,7 @@ class ParseRASGeo(object):
         :param river: Optional string of the name of river
         :param reach: Optional string of the name of reach
         """
-        inline_weirs = (item for item in self.geo_list if isinstance(item, InlineWeir))
+        inline_weirs = self._features(InlineWeir, river, reach)
         if river is not None:
             inline_weirs = (iw for iw in inline_weirs if iw.river == river)
         if reach is not None:
@@ -298,7 +733,7 @@ class ParseRASGeo(object):
         :param river: Optional string of the name of river
         :param reach: Optional string of the name of reach
         """
-        reaches = (item for item in self.geo_list if isinstance(item, RiverReach))
+        reaches = self._features(RiverReach, river, reach)
         if river is not None:
             reaches = (r for r in reaches if r.header.river_name == river)
         if reach is not None:
@@ -310,7 +745,41 @@ class ParseRASGeo(object):
         """
         Returns list of all StorageArea in geometry
         """
-        return [item for item in self.geo_list if isinstance(item, StorageArea)]
+        return list(self._features(StorageArea))
+
+    def spill_points_2d(self, prefix, min_points=1):
+        """
+        Moves the 2D points of the storage areas to memory mapped sidecar files, see
+        features.storage_area.CoordinateBlock.spill(), to bound the memory used by geometries with large 2D flow
+        areas. The points are read from the sidecars when they are used or written. The sidecars are named
+        prefix + '.sa<n>.pts', where n is the position of the storage area in get_storage_areas(). See spill_dir of
+        __init__() to spill the points while the geometry is imported instead.
+
+        :param prefix: path and start of the names of the sidecar files, e.g. 'scratch/my_model.g01'
+        :param min_points: storage areas with fewer 2D points are not spilled
+        :return: list of names of the sidecar files
+        """
+        filenames = []
+        for i, storage_area in enumerate(self.get_storage_areas()):
+            if storage_area._points_2d is None or storage_area.points_2d.count < min_points:
+                continue
+            filename = prefix + '.sa' + str(i) + '.pts'
+            storage_area.points_2d.spill(filename)
+            filenames.append(filename)
+        return filenames
+
+    def _spill_imported(self, i, feature):
+        """
+        Spills the 2D points of feature to the spill_dir given to __init__(), if any, when it is a storage area
+        that was just imported as geo_list[i]. The sidecar is named as by spill_points_2d().
+        """
+        if self._spill_prefix is None or not isinstance(feature, StorageArea) or feature._points_2d is None:
+            return
+        position = 0
+        for item in islice(self.geo_list, i):
+            if issubclass(item.feature_class if type(item) is LazyFeature else type(item), StorageArea):
+                position += 1
+        feature.points_2d.spill(self._spill_prefix + '.sa' + str(position) + '.pts')
 
     def _return_node(self, node_type, node_id, river, reach, strip=False, rnd=False, digits=0):
         """
@@ -350,24 +819,29 @@ class ParseRASGeo(object):
         if rnd:
             wanted_node_id = round(node_id, digits)
 
-        for item in self.geo_list:
-            if isinstance(item, node_type):
-                test_river = item.river
-                test_reach = item.reach
-                
-                # TODO: get rid of if-else statements after changing xs_id to station in cross_section.py
-                if node_type.__name__ is 'CrossSection':
-                    test_node_id = item.header.station.value
-                else:
-                    test_node_id = item.header.station
+        # Values that round to the same digits are less than 10**-digits apart
+        near = (node_id - 10 ** -digits, node_id + 10 ** -digits) if rnd else node_id
+        if strip:
+            nodes = self._features(node_type, station_value=near)
+        else:
+            nodes = self._features(node_type, river, reach, station_value=near)
+        for item in nodes:
+            test_river = item.river
+            test_reach = item.reach
+            
+            # TODO: get rid of if-else statements after changing xs_id to station in cross_section.py
+            if node_type.__name__ is 'CrossSection':
+                test_node_id = item.header.station.value
+            else:
+                test_node_id = item.header.station
 
-                if strip:
-                    test_river = test_river.strip()
-                    test_reach = test_reach.strip()
-                if rnd:
-                    test_node_id = round(test_node_id, digits)
+            if strip:
+                test_river = test_river.strip()
+                test_reach = test_reach.strip()
+            if rnd:
+                test_node_id = round(test_node_id, digits)
 
-                # Rounding and strip is done, see if this is the right XS
-                if test_node_id == wanted_node_id and test_river == wanted_river and test_reach == wanted_reach:
-                    return item
+            # Rounding and strip is done, see if this is the right XS
+            if test_node_id == wanted_node_id and test_river == wanted_river and test_reach == wanted_reach:
+                return item
         raise NodeNotFound
\ No newline at end of file
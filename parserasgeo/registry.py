@@ -0,0 +1,133 @@
+"""
+Registry of the top level features ParseRASGeo knows how to import.
+
+Every feature registers the text its first line starts with (everything before the first '='). Nodes share
+'Type RM Length L Ch R =' and are told apart by the node type digit that follows it. ParseRASGeo routes each
+line of a geometry file with a single dictionary lookup instead of asking every feature class in turn.
+
+Third party features may be added with register_feature() without editing prg.py:
+
+    import parserasgeo as prg
+    prg.register_feature(MyFeature, 'My Feature=', label='my features')
+"""
+from .features import (
+    Bridge, CrossSection, Culvert, Junction, InlineWeir, LateralWeir, RiverReach, StorageArea
+)
+from .features import lateral_weir, storage_area
+
+NODE_PREFIX = 'Type RM Length L Ch R ='
+
+
+class FeatureType(object):
+    """
+    A registered feature, see register_feature()
+    """
+    def __init__(self, feature_class, prefix, node_type, factory, label, ends_before):
+        self.feature_class = feature_class
+        self.prefix = prefix
+        self.node_type = node_type
+        self.factory = factory
+        self.label = label
+        self.ends_before = ends_before
+
+    def __repr__(self):
+        return 'FeatureType(' + self.feature_class.__name__ + ', ' + repr(self.prefix) + ')'
+
+
+# (text before '=') -> FeatureType, or for nodes -> {node type digit: FeatureType}
+_by_tag = {}
+# All registered features, in order of registration
+feature_types = []
+
+
+def register_feature(feature_class, prefix, node_type=None, factory=None, label=None, ends_before=None):
+    """
+    Registers a top level feature with ParseRASGeo. Registering a prefix (and node type) that is already in use
+    replaces the previous feature.
+
+    :param feature_class: class of the feature, must implement import_geo(line, geo_file) and __str__()
+    :param prefix: string the first line of the feature starts with, up to and including the first '='
+    :param node_type: node type for 'Type RM Length L Ch R =' lines, e.g. 1 for cross sections
+    :param factory: callable(river, reach, debug) returning a new feature, defaults to feature_class(river, reach)
+    :param label: description used by ParseRASGeo(chatty=True), defaults to the class name
+    :param ends_before: tuple of prefixes of the line following the feature. Defaults to None, the feature
+                        ends with (and includes) the first blank line outside of a description
+    :return: FeatureType
+    """
+    tag, sep, _ = prefix.partition('=')
+    if not sep:
+        raise ValueError('Feature prefix must end with "=", got: ' + repr(prefix))
+    if (node_type is None) == (prefix == NODE_PREFIX):
+        raise ValueError('node_type must be given for, and only for, ' + repr(NODE_PREFIX) + ' features')
+    if factory is None:
+        def factory(river, reach, debug):
+            return feature_class(river, reach)
+    if label is None:
+        label = feature_class.__name__
+
+    feature_type = FeatureType(feature_class, prefix, node_type, factory, label, ends_before)
+
+    # Tags are also stored as bytes for lookup_feature_at()
+    raw_tag = tag.encode('ascii')
+    if node_type is None:
+        old = _by_tag.get(tag)
+        _by_tag[tag] = _by_tag[raw_tag] = feature_type
+    else:
+        nodes = _by_tag.setdefault(tag, {})
+        _by_tag[raw_tag] = nodes
+        old = nodes.get(str(node_type))
+        nodes[str(node_type)] = nodes[str(node_type).encode('ascii')] = feature_type
+    if old is not None:
+        feature_types.remove(old)
+    feature_types.append(feature_type)
+    return feature_type
+
+
+def lookup_feature(line):
+    """
+    Returns the FeatureType that starts on line, or None if line does not start a registered feature
+
+    :param line: line of geometry file
+    :return: FeatureType or None
+    """
+    tag, sep, _ = line.partition('=')
+    if not sep:
+        return None
+    feature_type = _by_tag.get(tag)
+    if type(feature_type) is dict:
+        # Node type digit, e.g. 'Type RM Length L Ch R = 1 ,...'
+        return feature_type.get(line[24:25])
+    return feature_type
+
+
+def lookup_feature_at(data, start, end):
+    """
+    Same as lookup_feature() for the line data[start:end] of a bytes like geometry file, e.g. bytes or mmap.
+    Only the text before '=' is copied out of data.
+
+    :param data: bytes like object holding geometry file
+    :param start: offset of start of line
+    :param end: offset of end of line
+    :return: FeatureType or None
+    """
+    equals = data.find(b'=', start, end)
+    if equals < 0:
+        return None
+    feature_type = _by_tag.get(data[start:equals])
+    if type(feature_type) is dict:
+        return feature_type.get(data[start + 24:start + 25])
+    return feature_type
+
+
+# Built in features. Order of registration is the order they are reported with chatty=True
+register_feature(RiverReach, 'River Reach=', factory=lambda river, reach, debug: RiverReach(debug),
+                 label='rivers/reaches')
+register_feature(Junction, 'Junct Name=', factory=lambda river, reach, debug: Junction(), label='junctions')
+register_feature(CrossSection, NODE_PREFIX, node_type=1, factory=CrossSection, label='cross sections')
+register_feature(Bridge, NODE_PREFIX, node_type=3, label='bridge')
+register_feature(Culvert, NODE_PREFIX, node_type=2, factory=Culvert, label='culverts')
+register_feature(LateralWeir, NODE_PREFIX, node_type=6, label='lateral weirs',
+                 ends_before=lateral_weir.NEW_FEATURE_PREFIXES)
+register_feature(InlineWeir, NODE_PREFIX, node_type=5, label='inline weirs')
+register_feature(StorageArea, 'Storage Area=', factory=lambda river, reach, debug: StorageArea(debug),
+                 label='storage areas', ends_before=storage_area.NEW_FEATURE_PREFIXES)
@@ -0,0 +1,173 @@
+"""
+Compiled geometry templates for writing many variants of a geometry quickly, see ParseRASGeo.compile_template().
+
+The geometry is rendered once with a marker in place of every field. The text between the markers is kept as
+encoded bytes, so writing a variant only formats the fields and joins the pieces. Fields that are converted to
+numbers while rendering, e.g. Skew.angle which passes through fl_int(), are marked with unique numbers instead.
+Features that can not be marked either way are rendered in full for every variant.
+"""
+import locale
+import re
+
+_MARKER = re.compile('\x00([0-9]{6})\x00')
+# Numeric markers are _NUMBER_BASE + number of field
+_NUMBER_BASE = 900000000
+
+
+class _Marker(object):
+    """
+    Stands in for the value of a field while the geometry is rendered. Always renders as eight characters, the
+    width of a fixed width column.
+    """
+    def __init__(self, number):
+        self.text = '\x00{:06d}\x00'.format(number)
+
+    def __str__(self):
+        return self.text
+
+    def __format__(self, spec):
+        return self.text
+
+
+class GeoTemplate(object):
+    """
+    A geometry with a set of fields that change from variant to variant
+    """
+    def __init__(self, items, fields, encoding=None):
+        """
+        :param items: iterable of (item, text) of every item in geo_list, text is what the item writes as
+        :param fields: list of parameters.Field
+        :param encoding: encoding of the geometry file, defaults to the preferred encoding of the system
+        """
+        if len(fields) >= 10 ** 6:
+            raise ValueError('Templates are limited to 999999 fields, got ' + str(len(fields)))
+        self.fields = list(fields)
+        self.encoding = locale.getpreferredencoding(False) if encoding is None else encoding
+
+        by_feature = {}
+        for i, field in enumerate(self.fields):
+            by_feature.setdefault(id(field.feature), []).append(i)
+
+        # bytes, index of a field, or (feature, [indexes of its fields]) for features rendered in full
+        self._pieces = []
+        literal = []
+        for item, text in items:
+            indexes = by_feature.pop(id(item), None)
+            if indexes is None:
+                literal.append(text)
+                continue
+
+            marked = self._render_marked(item, indexes)
+            if marked is None:
+                self._add_literal(literal)
+                self._pieces.append((item, indexes))
+                continue
+            parts = _MARKER.split(marked)
+            # parts alternates between literal text and field numbers
+            for j, part in enumerate(parts):
+                if j % 2 == 0:
+                    literal.append(part)
+                else:
+                    self._add_literal(literal)
+                    self._pieces.append(int(part))
+        self._add_literal(literal)
+
+        if by_feature:
+            raise ValueError(str(len(by_feature)) + ' field(s) belong to features that are not in the geometry')
+
+    def _render_marked(self, feature, indexes):
+        """
+        Returns str(feature) with markers in place of its fields, or None if the fields are not rendered exactly
+        once each
+        """
+        text = self._try_render(feature, indexes, _Marker)
+        if text is None:
+            # Fields in fixed width columns are formatted directly, others may be converted to numbers first
+            text = self._try_render(feature, indexes, lambda i: _Marker(i) if self.fields[i].width is not None
+                                    else _NUMBER_BASE + i)
+            if text is None:
+                return None
+            for i in indexes:
+                if self.fields[i].width is None:
+                    number = str(_NUMBER_BASE + i)
+                    if text.count(number) != 1:
+                        return None
+                    text = text.replace(number, _Marker(i).text)
+
+        if len(_MARKER.findall(text)) != len(indexes):
+            return None
+        for i in indexes:
+            if text.count(_Marker(i).text) != 1:
+                return None
+        return text
+
+    def _try_render(self, feature, indexes, marker):
+        """
+        Returns str(feature) with the field numbered i set to marker(i), or None if the feature can not be
+        rendered that way. The fields are restored afterwards.
+        """
+        originals = [self.fields[i].get() for i in indexes]
+        try:
+            for i in indexes:
+                self.fields[i].set(marker(i))
+            return str(feature)
+        except (TypeError, ValueError):
+            return None
+        finally:
+            for i, value in zip(indexes, originals):
+                self.fields[i].set(value)
+
+    def _add_literal(self, literal):
+        """
+        Adds the text in literal as one encoded piece and empties literal
+        """
+        if literal:
+            self._pieces.append(self._encode(''.join(literal)))
+            del literal[:]
+
+    def _encode(self, text):
+        return text.replace('\n', '\r\n').encode(self.encoding)
+
+    def render(self, values):
+        """
+        Returns the geometry file with values in place of the fields
+
+        :param values: sequence of values, one for each field in the order of fields
+        :return: bytes of the geometry file
+        """
+        if len(values) != len(self.fields):
+            raise ValueError('Expected ' + str(len(self.fields)) + ' values, got ' + str(len(values)))
+        fields = self.fields
+        out = []
+        for piece in self._pieces:
+            if type(piece) is bytes:
+                out.append(piece)
+            elif type(piece) is int:
+                out.append(fields[piece].format(values[piece]).encode(self.encoding))
+            else:
+                out.append(self._encode(self._render_feature(piece[0], piece[1], values)))
+        return b''.join(out)
+
+    def _render_feature(self, feature, indexes, values):
+        """
+        Returns str(feature) with the values of its fields, leaving the feature unchanged
+        """
+        originals = [self.fields[i].get() for i in indexes]
+        try:
+            for i in indexes:
+                self.fields[i].set(values[i])
+            return str(feature)
+        finally:
+            for i, value in zip(indexes, originals):
+                self.fields[i].set(value)
+
+    def write(self, out_geo_filename, values):
+        """
+        Writes the geometry file with values in place of the fields
+
+        :param out_geo_filename: name of geometry file to write
+        :param values: sequence of values, one for each field in the order of fields
+        """
+        data = self.render(values)
+        with open(out_geo_filename, 'wb') as outfile:
+            outfile.write(data)
@@ -0,0 +1,22 @@
+import os
+import shutil
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.path.pardir))
+
+# Python 2 script, run by hand against a folder of geometries
+collect_ignore = ['geo_test.py']
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+
+
+@pytest.fixture
+def small_g01(tmp_path):
+    """
+    Copy of data/small.g01 in a temporary directory, so indexes and sidecars written next to it are thrown away
+    """
+    filename = str(tmp_path / 'small.g01')
+    shutil.copyfile(os.path.join(DATA_DIR, 'small.g01'), filename)
+    return filename
@@ -0,0 +1,62 @@
+"""
+Loading imported geometries from the on-disk cache
+"""
+import os
+from pathlib import Path
+
+import pytest
+
+import parserasgeo as prg
+from parserasgeo import cache
+
+
+def written(geo, tmp_path, name='out.g01'):
+    filename = tmp_path / name
+    geo.write(str(filename))
+    return filename.read_bytes()
+
+
+def test_cache_round_trip(small_g01, tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    eager = written(prg.ParseRASGeo(small_g01), tmp_path, 'eager.g01')
+    stored = prg.ParseRASGeo(small_g01, cache=cache_dir)
+    assert len(os.listdir(cache_dir)) == 1
+    loaded = prg.ParseRASGeo(small_g01, cache=cache_dir)
+    assert written(stored, tmp_path, 'stored.g01') == eager
+    assert written(loaded, tmp_path, 'loaded.g01') == eager
+    assert len(loaded.get_cross_sections()) == 10
+
+
+def test_changed_file_is_a_miss(small_g01, tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    key = cache.cache_key(small_g01)
+    prg.ParseRASGeo(small_g01, cache=cache_dir)
+    source = Path(small_g01).read_text()
+    Path(small_g01).write_text(source.replace('Geom Title=Sample', 'Geom Title=Changed'))
+    assert cache.cache_key(small_g01) != key
+    geo = prg.ParseRASGeo(small_g01, cache=cache_dir)
+    assert geo.geo_list[0] == 'Geom Title=Changed\n'
+    assert len(os.listdir(cache_dir)) == 2
+
+
+def test_cache_that_can_not_be_written(small_g01, tmp_path):
+    not_a_dir = tmp_path / 'file'
+    not_a_dir.write_text('x')
+    geo = prg.ParseRASGeo(small_g01, cache=str(not_a_dir))
+    assert len(geo.get_cross_sections()) == 10
+    assert cache.store(str(not_a_dir), 'key', []) is False
+    assert cache.load(str(not_a_dir), 'key') is None
+    assert cache.evict(str(not_a_dir)) == 0
+
+
+def test_evict(small_g01, tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    prg.ParseRASGeo(small_g01, cache=cache_dir)
+    assert cache.evict(cache_dir) == 0
+    assert cache.evict(cache_dir, max_bytes=0) == 1
+    assert os.listdir(cache_dir) == []
+
+
+def test_cache_and_lazy(small_g01, tmp_path):
+    with pytest.raises(AttributeError):
+        prg.ParseRASGeo(small_g01, lazy=True, cache=str(tmp_path / 'cache'))
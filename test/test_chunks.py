@@ -0,0 +1,34 @@
+"""
+Features are written by streaming the chunks of iter_chunks()
+"""
+import io
+from pathlib import Path
+
+import pytest
+
+import parserasgeo as prg
+
+
+def test_chunks_join_to_text(small_g01):
+    geo = prg.ParseRASGeo(small_g01)
+    for item in geo.geo_list:
+        if not isinstance(item, str):
+            assert ''.join(item.iter_chunks()) == str(item)
+
+
+@pytest.mark.parametrize('options', [{'lazy': True}, {'lazy': True, 'mmap': True}], ids=['lazy', 'lazy-mmap'])
+def test_write_over_source(small_g01, options):
+    source = Path(small_g01).read_text()
+    geo = prg.ParseRASGeo(small_g01, **options)
+    geo.get_cross_sections()[0].header.lob_length = 12.5
+    geo.write(small_g01)
+    assert Path(small_g01).read_text() == source.replace('= 1 ,5050.5  ,100.5,', '= 1 ,5050.5  ,12.5,', 1)
+
+
+def test_write_to(small_g01):
+    geo = prg.ParseRASGeo(small_g01)
+    for item in geo.geo_list:
+        if not isinstance(item, str):
+            fp = io.StringIO()
+            item.write_to(fp)
+            assert fp.getvalue() == str(item)
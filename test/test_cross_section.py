@@ -0,0 +1,42 @@
+"""
+Cross section sub-blocks are kept as lines and decoded on first access
+"""
+import pytest
+
+import parserasgeo as prg
+
+BLOCKS = ['cutline', 'iefa', 'mannings_n', 'obstruct', 'sta_elev']
+
+
+@pytest.fixture
+def xs(small_g01):
+    return prg.ParseRASGeo(small_g01).get_cross_sections()[0]
+
+
+def test_blocks_are_not_decoded_on_import(xs):
+    assert [getattr(xs, name)._raw is not None for name in BLOCKS] == [True] * 5
+
+
+def test_decoded_on_first_access(xs):
+    assert xs.cutline.points[0] == ('            1000', '            2000')
+    assert xs.iefa.iefa_list[0] == (0, 10, 101)
+    assert xs.mannings_n.values == [(0, 0.06, 0), (10, 0.035, 0), (30, 0.06, 0)]
+    assert xs.obstruct.blocked == [(5, 8, 102)]
+    assert list(xs.sta_elev.elevations[:2]) == [100, 95]
+    assert [getattr(xs, name)._raw for name in BLOCKS] == [None] * 5
+
+
+def test_text_before_and_after_decoding(small_g01, xs):
+    before = str(xs)
+    for name in BLOCKS:
+        getattr(xs, name).decode()
+    assert str(xs) == before
+    with open(small_g01) as geo_file:
+        assert before in geo_file.read()
+
+
+def test_assigning_decodes_first(xs):
+    xs.sta_elev.elevations = xs.sta_elev.elevations[:]
+    assert len(xs.sta_elev.stations) == 12
+    xs.sta_elev.stations[0] = -1.0
+    assert str(xs.sta_elev).splitlines()[1].startswith('      -1     100      10      95')
@@ -0,0 +1,67 @@
+"""
+Finding features with the indexes behind get_cross_sections() and friends
+"""
+import pytest
+
+import parserasgeo as prg
+from parserasgeo.features.station import Station
+
+
+@pytest.fixture(params=[{}, {'lazy': True}], ids=['eager', 'lazy'])
+def geo(small_g01, request):
+    return prg.ParseRASGeo(small_g01, **request.param)
+
+
+def stations(cross_sections):
+    return [(xs.reach, xs.header.station.id) for xs in cross_sections]
+
+
+def test_queries(geo):
+    assert len(geo.get_cross_sections()) == 10
+    assert stations(geo.get_cross_sections(station_value=5040)) == [('Upper', '5040'), ('Lower', '5040')]
+    assert stations(geo.get_cross_sections(station_id='5030*')) == [('Upper', '5030*'), ('Lower', '5030*')]
+    assert stations(geo.get_cross_sections(station_value=(5020, 5035), reach='Lower')) == \
+        [('Lower', '5030*'), ('Lower', '5020.5')]
+    assert stations(geo.get_cross_sections(station_value=(None, 5015))) == [('Upper', '5010'), ('Lower', '5010')]
+    assert stations(geo.get_cross_sections(interpolated=True)) == [('Upper', '5030*'), ('Lower', '5030*')]
+    assert geo.get_cross_sections(river='Other') == []
+    assert len(geo.get_culverts(station=5035)) == 2
+    assert len(geo.get_inline_weirs(reach='Upper')) == 1
+
+
+def test_changed_station_is_found(geo):
+    xs = geo.get_cross_sections(station_value=5040, reach='Upper')[0]
+    xs.header.station = Station('5041')
+    assert geo.get_cross_sections(station_value=5041) == [xs]
+    assert xs not in geo.get_cross_sections(station_value=5040)
+
+
+def test_changed_reach_is_found(geo):
+    xs = geo.get_cross_sections(station_value=5040, reach='Upper')[0]
+    xs.reach = 'Middle'
+    assert geo.get_cross_sections(reach='Middle') == [xs]
+
+
+def test_changed_geo_list_is_found(geo):
+    xs = geo.get_cross_sections(station_value=5010)[0]
+    geo.geo_list.remove(xs)
+    assert len(geo.get_cross_sections(station_value=5010)) == 1
+    geo.geo_list.append(xs)
+    assert geo.get_cross_sections(station_value=5010)[1] is xs
+
+
+def test_changes_to_another_geometry(small_g01, geo):
+    index = geo._feature_index()
+    other = prg.ParseRASGeo(small_g01)
+    other.get_cross_sections()[0].header.station = Station('6000')
+    other.get_cross_sections()[0].reach = 'Middle'
+    other.geo_list.append('Foo=1\n')
+    assert geo._feature_index() is index
+
+
+def test_changed_header_of_loaded_feature(small_g01):
+    geo = prg.ParseRASGeo(small_g01, lazy=True)
+    geo.get_cross_sections(station_value=5040)
+    xs = geo.get_cross_sections(station_value=5010, reach='Upper')[0]
+    xs.header.station = Station('5011')
+    assert geo.get_cross_sections(station_value=5011) == [xs]
@@ -0,0 +1,62 @@
+"""
+Sidecar feature index written by ParseRASGeo.build_index()
+"""
+import json
+import os
+from pathlib import Path
+
+import parserasgeo as prg
+from parserasgeo import index
+from parserasgeo.blocks import GeoBuffer
+
+
+def read_index(small_g01):
+    buffer = GeoBuffer(small_g01)
+    try:
+        return index.read(buffer), list(index.scan(buffer))
+    finally:
+        buffer.close()
+
+
+def test_index_matches_scan(small_g01):
+    assert prg.ParseRASGeo.build_index(small_g01) == small_g01 + '.idx'
+    read, scanned = read_index(small_g01)
+    assert read == scanned
+
+
+def test_index_holds_features_only(small_g01):
+    prg.ParseRASGeo.build_index(small_g01)
+    with open(small_g01 + '.idx') as index_file:
+        assert len(json.load(index_file)['blocks']) == 23
+
+
+def test_index_round_trip(small_g01, tmp_path):
+    prg.ParseRASGeo.build_index(small_g01)
+    geo = prg.ParseRASGeo(small_g01, lazy=True, mmap=True)
+    xs = geo.get_cross_sections(river='Creek', reach='Lower', station_value=5040)
+    assert [x.header.station.value for x in xs] == [5040]
+    out = tmp_path / 'out.g01'
+    geo.write(str(out))
+    assert out.read_bytes() == Path(small_g01).read_bytes()
+
+
+def test_stale_index_is_ignored(small_g01):
+    prg.ParseRASGeo.build_index(small_g01)
+    source = Path(small_g01).read_bytes()
+    Path(small_g01).write_bytes(source.replace(b'Geom Title=Sample', b'Geom Title=Changed file'))
+    read, scanned = read_index(small_g01)
+    assert read is None
+    geo = prg.ParseRASGeo(small_g01, lazy=True)
+    assert geo.geo_list[0] == 'Geom Title=Changed file\n'
+    assert len(geo.get_cross_sections(station_value=5040)) == 2
+
+
+def test_custom_index_filename(small_g01, tmp_path):
+    index_filename = str(tmp_path / 'other.idx')
+    assert prg.ParseRASGeo.build_index(small_g01, index_filename) == index_filename
+    assert os.path.exists(index_filename) and not os.path.exists(small_g01 + '.idx')
+    buffer = GeoBuffer(small_g01)
+    try:
+        assert index.read(buffer, index_filename) == list(index.scan(buffer))
+    finally:
+        buffer.close()
@@ -0,0 +1,41 @@
+"""
+Streaming the features of a geometry file with iter_features()
+"""
+from collections import Counter
+
+import pytest
+
+import parserasgeo as prg
+from parserasgeo.features import CrossSection, Culvert, LateralWeir, RiverReach
+
+
+def test_all_features(small_g01):
+    counts = Counter(type(item).__name__ for _, _, item in prg.iter_features(small_g01))
+    assert counts == {'str': 4, 'RiverReach': 2, 'CrossSection': 10, 'Culvert': 2, 'Bridge': 2, 'InlineWeir': 2,
+                      'LateralWeir': 2, 'Junction': 1, 'StorageArea': 2}
+
+
+def test_same_features_as_import(small_g01):
+    geo = prg.ParseRASGeo(small_g01)
+    assert [str(item) for _, _, item in prg.iter_features(small_g01)] == [str(item) for item in geo.geo_list]
+
+
+def test_types(small_g01):
+    items = list(prg.iter_features(small_g01, types=[CrossSection, Culvert]))
+    assert Counter(type(item) for _, _, item in items) == {CrossSection: 10, Culvert: 2}
+    assert [(river, reach.strip()) for river, reach, _ in items].count(('Creek', 'Lower')) == 6
+
+
+def test_river_and_reach(small_g01):
+    for river, reach, item in prg.iter_features(small_g01, types=[str, LateralWeir, RiverReach]):
+        if isinstance(item, RiverReach):
+            assert (river, reach) == (item.header.river_name, item.header.reach_name)
+        elif isinstance(item, LateralWeir):
+            assert (river, reach) == (item.river, item.reach)
+        elif item.startswith('Geom Title='):
+            assert (river, reach) == (None, None)
+
+
+def test_missing_file(tmp_path):
+    with pytest.raises(AttributeError):
+        list(prg.iter_features(str(tmp_path / 'missing.g01')))
@@ -0,0 +1,57 @@
+"""
+Lateral weirs end at the next feature, and their lines are routed to their parts
+"""
+import pytest
+
+import parserasgeo as prg
+from parserasgeo.features.lateral_weir import (LateralWeir, LateralWeirCenterline, LateralWeirCoef,
+                                               LateralWeirPosition, LateralWeirSE, NEW_FEATURE_PREFIXES)
+from parserasgeo.features.tools import PrefixMatcher
+
+
+@pytest.mark.parametrize('line, expected', [
+    ('Culvert=2,4,6\n', True),
+    ('  Culvert=2,4,6\n', True),
+    ('Culvert Bottom n=0.02\n', False),
+    ('Culverts=2\n', False),
+    ('Bridge=1\n', True),
+    ('\n', False),
+    ('no equals sign\n', False),
+])
+def test_prefix_matcher(line, expected):
+    matcher = PrefixMatcher(['Culvert=', 'Bridge='])
+    assert matcher(line) is expected
+    assert matcher(line) == line.strip().startswith(('Culvert=', 'Bridge='))
+
+
+def test_prefix_matcher_needs_one_equals_sign():
+    with pytest.raises(AssertionError):
+        PrefixMatcher(['Culvert'])
+
+
+def test_lateral_weir_position_does_not_end_the_weir():
+    assert 'Lateral Weir Pos=' not in NEW_FEATURE_PREFIXES
+
+
+@pytest.mark.parametrize('options', [{}, {'lazy': True}, {'workers': 2}], ids=['eager', 'lazy', 'workers'])
+def test_lateral_weir_parts(small_g01, options):
+    weirs = prg.ParseRASGeo(small_g01, **options).get_lateral_weirs()
+    assert len(weirs) == 2
+    weir = weirs[0]
+    assert isinstance(weir, LateralWeir)
+    assert [item for item in weir.geo_list if isinstance(item, str)] == ['\n']
+    assert isinstance(weir.pos, LateralWeirPosition)
+    assert isinstance(weir.coef, LateralWeirCoef)
+    assert weir.coef.coefficient == 2.6
+    assert isinstance(weir.se, LateralWeirSE)
+    assert weir.se.station_elevation_points == [('0', '100'), ('10', '101'), ('20', '100')]
+    assert isinstance(weir.centerline, LateralWeirCenterline)
+    assert [(x.strip(), y.strip()) for x, y in weir.centerline.points] == [('1000', '2000'), ('1100', '2100')]
+
+
+def test_lateral_weir_round_trip(small_g01):
+    source = open(small_g01).read()
+    start = source.index('Type RM Length L Ch R = 6 ')
+    end = source.index('\n\n', start) + 2
+    weir = prg.ParseRASGeo(small_g01).get_lateral_weirs()[0]
+    assert str(weir) == source[start:end]
@@ -0,0 +1,40 @@
+"""
+Looking up many nodes at once with lookup_many()
+"""
+import pytest
+
+import parserasgeo as prg
+
+
+@pytest.fixture(params=[{}, {'lazy': True}], ids=['eager', 'lazy'])
+def geo(small_g01, request):
+    return prg.ParseRASGeo(small_g01, **request.param)
+
+
+def test_lookup_many(geo):
+    nodes = geo.lookup_many([('Creek', 'Lower', 5040.0004), ('Creek', 'Lower', '5030*'),
+                             ('Creek', 'Upper', 5035), ('Creek', 'Upper', 5041)])
+    assert [type(node).__name__ for node in nodes] == ['CrossSection', 'CrossSection', 'Culvert', 'NoneType']
+    assert nodes[0].header.station.id == '5040'
+    assert nodes[1].header.station.id == '5030*'
+
+
+class Table(object):
+    """Columns of a table, as a pandas DataFrame has them"""
+    columns = ['river', 'reach', 'station']
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def __getitem__(self, column):
+        return [row[self.columns.index(column)] for row in self.rows]
+
+
+def test_lookup_many_table(geo):
+    nodes = geo.lookup_many(Table([('Creek', 'Upper', 5050.5), ('Creek', 'Lower', 5032)]))
+    assert [type(node).__name__ for node in nodes] == ['CrossSection', 'LateralWeir']
+
+
+def test_tolerance(geo):
+    assert geo.lookup_many([('Creek', 'Lower', 5040.5)]) == [None]
+    assert geo.lookup_many([('Creek', 'Lower', 5040.5)], tolerance=1)[0].header.station.id == '5040'
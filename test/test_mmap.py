@@ -0,0 +1,56 @@
+"""
+Memory mapped geometry files
+"""
+from pathlib import Path
+
+import parserasgeo as prg
+from parserasgeo.blocks import GeoBuffer
+
+
+def written(geo, tmp_path, name='out.g01'):
+    filename = tmp_path / name
+    geo.write(str(filename))
+    return filename.read_bytes()
+
+
+def test_buffer(small_g01):
+    source = Path(small_g01).read_bytes()
+    mapped = GeoBuffer(small_g01, use_mmap=True)
+    read = GeoBuffer(small_g01)
+    try:
+        assert len(mapped) == len(read) == len(source)
+        assert mapped.text(0, 19) == read.text(0, 19) == 'Geom Title=Sample\n'
+        assert mapped.is_file(small_g01)
+        mapped.detach()
+        assert mapped.data == source
+    finally:
+        mapped.close()
+        read.close()
+
+
+def test_empty_file(tmp_path):
+    empty = tmp_path / 'empty.g01'
+    empty.write_bytes(b'')
+    buffer = GeoBuffer(str(empty), use_mmap=True)
+    assert len(buffer) == 0
+    buffer.close()
+
+
+def test_lazy_mmap_round_trip(small_g01, tmp_path):
+    geo = prg.ParseRASGeo(small_g01, lazy=True, mmap=True)
+    assert written(geo, tmp_path) == Path(small_g01).read_bytes()
+
+
+def test_lazy_mmap_write_over_source(small_g01):
+    source = Path(small_g01).read_bytes()
+    geo = prg.ParseRASGeo(small_g01, lazy=True, mmap=True)
+    geo.get_cross_sections()[0].header.lob_length = 12.5
+    geo.write(small_g01)
+    assert Path(small_g01).read_bytes() == source.replace(b'= 1 ,5050.5  ,100.5,', b'= 1 ,5050.5  ,12.5,', 1)
+    # Features not imported yet are read from the copy of the file taken before it was overwritten
+    assert len(geo.get_storage_areas()) == 2
+
+
+def test_mmap_without_lazy_imports_text(small_g01, tmp_path):
+    assert written(prg.ParseRASGeo(small_g01, mmap=True), tmp_path, 'mmap.g01') == \
+        written(prg.ParseRASGeo(small_g01), tmp_path, 'eager.g01')
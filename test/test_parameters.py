@@ -0,0 +1,62 @@
+"""
+Selectors of tunable values and the flat parameter vectors of calibration loops
+"""
+from pathlib import Path
+
+import pytest
+
+import parserasgeo as prg
+from parserasgeo import parameters
+
+
+@pytest.mark.parametrize('selector, count, first', [
+    (parameters.mannings_n, 30, 0.06),
+    (parameters.channel_n, 10, 0.035),
+    (parameters.overbank_n, 20, 0.06),
+    (parameters.skew_angles, 10, 30),
+    (parameters.culvert_manning_top, 2, 0.013),
+    (parameters.lateral_weir_coefficients, 2, 2.6),
+    (parameters.culvert_loss_coefficients, 4, 0.5),
+])
+@pytest.mark.parametrize('options', [{}, {'lazy': True}], ids=['eager', 'lazy'])
+def test_selectors(small_g01, selector, count, first, options):
+    fields = selector(prg.ParseRASGeo(small_g01, **options))
+    assert len(fields) == count
+    assert fields[0].get() == first
+
+
+def test_selector_by_reach(small_g01):
+    geo = prg.ParseRASGeo(small_g01)
+    assert len(parameters.mannings_n(geo, river='Creek', reach='Lower')) == 15
+
+
+def test_apply_vector(small_g01, tmp_path):
+    geo = prg.ParseRASGeo(small_g01, lazy=True)
+    x0 = geo.parameter_vector([parameters.channel_n, parameters.lateral_weir_coefficients])
+    assert list(x0) == [0.035] * 10 + [2.6] * 2
+    geo.apply_vector([value * 2 for value in x0])
+    assert list(geo.parameter_vector([parameters.channel_n, parameters.lateral_weir_coefficients])) == \
+        [0.07] * 10 + [5.2] * 2
+
+    out = tmp_path / 'out.g01'
+    geo.write(str(out))
+    text = out.read_text()
+    assert text.count('Lateral Weir Coef=5.2\n') == 2
+    assert text.count('       0     .06       0      10     .07       0      30     .06       0\n') == 10
+
+
+def test_apply_vector_length(small_g01):
+    geo = prg.ParseRASGeo(small_g01)
+    geo.parameter_vector(parameters.skew_angles)
+    with pytest.raises(ValueError):
+        geo.apply_vector([1.0])
+
+
+def test_unchanged_values_keep_their_text(small_g01, tmp_path):
+    geo = prg.ParseRASGeo(small_g01, lazy=True)
+    x0 = geo.parameter_vector(parameters.lateral_weir_coefficients)
+    geo.apply_vector(x0)
+    out = tmp_path / 'out.g01'
+    geo.write(str(out))
+    assert out.read_bytes() == Path(small_g01).read_bytes()
+
@@ -0,0 +1,46 @@
+"""
+Optional parts of features, which read as a shared empty part when the feature does not have them
+"""
+import pytest
+
+import parserasgeo as prg
+from parserasgeo.features import CrossSection
+from parserasgeo.features.cross_section import IEFA, Levee
+
+
+@pytest.fixture
+def cross_sections(small_g01):
+    return prg.ParseRASGeo(small_g01).get_cross_sections()
+
+
+def test_missing_part_is_not_stored(cross_sections):
+    first, second = cross_sections[:2]
+    assert first.levee.value is None
+    assert type(first.levee) is Levee
+    assert first.levee is second.levee
+    assert first._levee is None
+    assert first.levee not in first.geo_list
+
+
+def test_missing_part_is_read_only(cross_sections):
+    xs = cross_sections[0]
+    with pytest.raises(AttributeError):
+        xs.levee.value = 'T'
+    xs = CrossSection('Creek', 'Upper')
+    with pytest.raises(AttributeError):
+        xs.iefa.iefa_list.append((0, 10, 101))
+    assert CrossSection('Creek', 'Upper').iefa.iefa_list == []
+
+
+def test_assigned_part(cross_sections):
+    xs = cross_sections[0]
+    xs.levee = Levee()
+    xs.levee.value = 'T'
+    assert xs.levee.value == 'T'
+    assert cross_sections[1].levee.value is None
+
+
+def test_imported_parts_are_stored(cross_sections):
+    xs = cross_sections[0]
+    assert type(xs._iefa) is IEFA and xs.iefa is xs._iefa
+    assert [getattr(xs, name) in xs.geo_list for name, _ in xs.part_types if name != 'levee'] == [True] * 10
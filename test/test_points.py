@@ -0,0 +1,87 @@
+"""
+PointsView must behave like the list of (x, y) tuples it replaced
+"""
+from array import array
+
+from parserasgeo.features.points import PointsView
+
+
+class Coordinates(object):
+    def __init__(self, points):
+        self.x = array('d', [x for x, _ in points])
+        self.y = array('d', [y for _, y in points])
+
+
+POINTS = [(30, 1.5), (10, 2), (20.25, 3)]
+
+
+def make_view():
+    return PointsView(Coordinates(POINTS), 'x', 'y')
+
+
+def test_reading():
+    view = make_view()
+    assert len(view) == 3
+    assert view == POINTS
+    assert view[0] == (30, 1.5)
+    assert view[-1] == (20.25, 3)
+    assert view[1:] == POINTS[1:]
+    assert list(view) == POINTS
+    assert (10, 2) in view
+    assert view.index((10, 2)) == 1
+    assert view.count((10, 2)) == 1
+    assert list(reversed(view)) == POINTS[::-1]
+    assert isinstance(view[1][0], int)
+
+
+def test_writing():
+    view = make_view()
+    expected = list(POINTS)
+    for change in (lambda points: points.append((40, 4)),
+                   lambda points: points.extend([(50, 5), (60, 6)]),
+                   lambda points: points.insert(0, (0, 0))):
+        change(view)
+        change(expected)
+    view[1] = (31, 1)
+    expected[1] = (31, 1)
+    view[2:4] = [(11, 1), (12, 1), (13, 1)]
+    expected[2:4] = [(11, 1), (12, 1), (13, 1)]
+    del view[0]
+    del expected[0]
+    assert view.pop() == expected.pop()
+    view.remove((12, 1))
+    expected.remove((12, 1))
+    view += [(70, 7)]
+    expected += [(70, 7)]
+    assert view == expected
+    view.reverse()
+    expected.reverse()
+    assert view == expected
+    view.clear()
+    assert view == []
+
+
+def test_sort():
+    view = make_view()
+    view.sort()
+    assert view == sorted(POINTS)
+    view.sort(key=lambda point: point[1], reverse=True)
+    assert view == sorted(POINTS, key=lambda point: point[1], reverse=True)
+
+
+def test_copy():
+    view = make_view()
+    copy = view.copy()
+    assert type(copy) is list
+    assert copy == POINTS
+    copy.append((0, 0))
+    assert len(view) == 3
+
+
+def test_add():
+    view = make_view()
+    assert view + [(0, 0)] == POINTS + [(0, 0)]
+    assert [(0, 0)] + view == [(0, 0)] + POINTS
+    assert view + view == POINTS + POINTS
+    assert sorted(view) == sorted(POINTS)
+    assert len(view) == 3
@@ -0,0 +1,86 @@
+"""
+Routing of the first lines of features through the registry, and registering features of other packages
+"""
+
+import pytest
+
+import parserasgeo as prg
+from parserasgeo import registry
+from parserasgeo.features.feature import Feature
+from parserasgeo.registry import lookup_feature, lookup_feature_at
+
+
+@pytest.mark.parametrize('line, feature_class', [
+    ('River Reach=Creek           ,Upper           \n', 'RiverReach'),
+    ('Type RM Length L Ch R = 1 ,5050.5  ,100.5,110.5,120.5\n', 'CrossSection'),
+    ('Type RM Length L Ch R = 2 ,5035    ,,,\n', 'Culvert'),
+    ('Type RM Length L Ch R = 3 ,5034    ,,,\n', 'Bridge'),
+    ('Type RM Length L Ch R = 5 ,5033    ,,,\n', 'InlineWeir'),
+    ('Type RM Length L Ch R = 6 ,5032    ,,,\n', 'LateralWeir'),
+    ('Type RM Length L Ch R = 9 ,5032    ,,,\n', None),
+    ('Junct Name=J1              \n', 'Junction'),
+    ('Storage Area=Pond1           ,1000,2000\n', 'StorageArea'),
+    ('Storage Area Surface Line= 3 \n', None),
+    ('Geom Title=Sample\n', None),
+    ('no equals sign\n', None),
+])
+def test_lookup_feature(line, feature_class):
+    feature_type = lookup_feature(line)
+    if feature_class is None:
+        assert feature_type is None
+    else:
+        assert feature_type.feature_class.__name__ == feature_class
+    data = line.encode('ascii')
+    assert lookup_feature_at(b'xx' + data, 2, 2 + len(data)) is feature_type
+
+
+class ViewingRectangle(Feature):
+    """Lines up to and including the blank line that follows 'Viewing Rectangle='"""
+    def __init__(self, river, reach):
+        self.lines = []
+
+    @staticmethod
+    def test(line):
+        return line.startswith('Viewing Rectangle=')
+
+    def import_geo(self, line, geo_file):
+        while line != '\n':
+            self.lines.append(line)
+            line = next(geo_file)
+        return line
+
+    def __str__(self):
+        return ''.join(self.lines) + '\n'
+
+
+@pytest.fixture
+def viewing_rectangles():
+    feature_type = prg.register_feature(ViewingRectangle, 'Viewing Rectangle=', label='viewing rectangles')
+    yield feature_type
+    registry.feature_types.remove(feature_type)
+    del registry._by_tag['Viewing Rectangle'], registry._by_tag[b'Viewing Rectangle']
+
+
+@pytest.mark.parametrize('options', [{}, {'lazy': True}], ids=['eager', 'lazy'])
+def test_register_feature(small_g01, tmp_path, viewing_rectangles, options):
+    geo = prg.ParseRASGeo(small_g01, **options)
+    assert lookup_feature('Viewing Rectangle=       0     1000     1000        0\n') is viewing_rectangles
+    found = [item.load() if hasattr(item, 'load') else item for item in geo.geo_list
+             if getattr(item, 'feature_class', type(item)) is ViewingRectangle]
+    assert len(found) == 1
+    assert found[0].lines == ['Viewing Rectangle=       0     1000     1000        0\n']
+
+    out = tmp_path / 'out.g01'
+    geo.write(str(out))
+    assert out.read_text().startswith('Geom Title=Sample\nProgram Version=5.07\n'
+                                      'Viewing Rectangle=       0     1000     1000        0\n\nRiver Reach=')
+
+
+@pytest.mark.parametrize('prefix, node_type', [
+    ('Viewing Rectangle', None),
+    ('Type RM Length L Ch R =', None),
+    ('Viewing Rectangle=', 7),
+])
+def test_register_feature_errors(prefix, node_type):
+    with pytest.raises(ValueError):
+        prg.register_feature(ViewingRectangle, prefix, node_type=node_type)
@@ -0,0 +1,59 @@
+"""
+Importing and writing a geometry without changes must reproduce the file
+"""
+from pathlib import Path
+
+import parserasgeo as prg
+from parserasgeo.blocks import LazyFeature
+from parserasgeo.features import CrossSection
+
+# Lines that eager import does not write back as they were read, e.g. padded river and reach names
+EAGER_REWRITTEN = ('River Reach=', 'Storage Area=', 'Storage Area Surface Line=', 'Storage Area 2D Points=')
+
+
+def written(geo, tmp_path, name='out.g01'):
+    filename = tmp_path / name
+    geo.write(str(filename))
+    return filename.read_bytes()
+
+
+def test_lazy_round_trip(small_g01, tmp_path):
+    geo = prg.ParseRASGeo(small_g01, lazy=True)
+    assert written(geo, tmp_path) == Path(small_g01).read_bytes()
+
+
+def test_lazy_round_trip_after_loading(small_g01, tmp_path):
+    geo = prg.ParseRASGeo(small_g01, lazy=True)
+    assert len(geo.get_cross_sections()) == 10
+    assert len(geo.get_storage_areas()) == 2
+    assert written(geo, tmp_path) == Path(small_g01).read_bytes()
+
+
+def test_lazy_features_are_loaded_on_first_access(small_g01):
+    geo = prg.ParseRASGeo(small_g01, lazy=True)
+    assert sum(type(item) is LazyFeature for item in geo.geo_list) == 21
+    xs = geo.get_cross_sections(river='Creek', reach='Lower', station_value=5040)[0]
+    assert type(xs) is CrossSection
+    assert sum(type(item) is LazyFeature for item in geo.geo_list) == 20
+
+
+def test_lazy_write_over_source(small_g01):
+    source = Path(small_g01).read_bytes()
+    geo = prg.ParseRASGeo(small_g01, lazy=True)
+    geo.write(small_g01)
+    assert Path(small_g01).read_bytes() == source
+
+
+def test_eager_round_trip(small_g01, tmp_path):
+    source = Path(small_g01).read_bytes().splitlines()
+    output = written(prg.ParseRASGeo(small_g01), tmp_path).splitlines()
+    assert len(output) == len(source)
+    for source_line, line in zip(source, output):
+        if not source_line.decode().startswith(EAGER_REWRITTEN):
+            assert line == source_line
+
+
+def test_eager_round_trip_is_stable(small_g01, tmp_path):
+    once = written(prg.ParseRASGeo(small_g01), tmp_path, 'once.g01')
+    twice = written(prg.ParseRASGeo(str(tmp_path / 'once.g01')), tmp_path, 'twice.g01')
+    assert twice == once
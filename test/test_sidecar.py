@@ -0,0 +1,99 @@
+"""
+Spilling storage area 2D points to memory mapped sidecar files
+"""
+import os
+import pickle
+from array import array
+
+import pytest
+
+import parserasgeo as prg
+from parserasgeo.features.sidecar import CoordinateSidecar
+
+
+def written(geo, tmp_path, name='out.g01'):
+    filename = tmp_path / name
+    geo.write(str(filename))
+    return filename.read_text()
+
+
+def test_spill_round_trip(small_g01, tmp_path):
+    expected = written(prg.ParseRASGeo(small_g01), tmp_path, 'expected.g01')
+    geo = prg.ParseRASGeo(small_g01)
+    prefix = str(tmp_path / 'scratch')
+    filenames = geo.spill_points_2d(prefix)
+    assert filenames == [prefix + '.sa0.pts', prefix + '.sa1.pts']
+    assert all(os.path.exists(filename) for filename in filenames)
+    points_2d = geo.get_storage_areas()[0].points_2d
+    assert list(points_2d.y) == [2000, 2010, 2020, 2030, 2040]
+    assert written(geo, tmp_path) == expected
+
+
+def test_spill_min_points(small_g01, tmp_path):
+    geo = prg.ParseRASGeo(small_g01)
+    assert geo.spill_points_2d(str(tmp_path / 'scratch'), min_points=6) == []
+
+
+def test_spilled_points_are_read_only(small_g01, tmp_path):
+    geo = prg.ParseRASGeo(small_g01)
+    geo.spill_points_2d(str(tmp_path / 'scratch'))
+    with pytest.raises(TypeError):
+        geo.get_storage_areas()[0].points_2d.x[0] = 1.0
+
+
+@pytest.mark.parametrize('edit, line', [
+    (lambda block: setattr(block, 'x', array('d', [1, 1010, 1020, 1030, 1040])),
+     '               1            2000            1010            2010\n'),
+    (lambda block: setattr(block, 'points', list(block.points) + [(1050, 2050)]),
+     '            1040            2040            1050            2050\n'),
+])
+def test_spilled_points_edits(small_g01, tmp_path, edit, line):
+    geo = prg.ParseRASGeo(small_g01)
+    geo.spill_points_2d(str(tmp_path / 'scratch'))
+    edit(geo.get_storage_areas()[0].points_2d)
+    assert line in written(geo, tmp_path)
+
+
+def test_spilled_points_are_pickled_by_name(small_g01, tmp_path):
+    geo = prg.ParseRASGeo(small_g01)
+    geo.spill_points_2d(str(tmp_path / 'scratch'))
+    points_2d = geo.get_storage_areas()[0].points_2d
+    copy = pickle.loads(pickle.dumps(points_2d))
+    assert copy._sidecar.filename == points_2d._sidecar.filename
+    assert list(copy.x) == [1000, 1010, 1020, 1030, 1040]
+    assert str(copy) == str(points_2d)
+
+
+def test_create_streams_chunks(tmp_path):
+    filename = str(tmp_path / 'block.pts')
+    sidecar = CoordinateSidecar.create(filename, [1.0, 2.0], [3.0, 4.0], iter(['line 1\n', 'line 2\n']))
+    assert list(sidecar.x) == [1, 2] and list(sidecar.y) == [3, 4]
+    assert ''.join(sidecar.text_chunks()) == 'line 1\nline 2\n'
+
+
+def test_spill_before_decoding(small_g01, tmp_path):
+    points_2d = prg.ParseRASGeo(small_g01).get_storage_areas()[0].points_2d
+    text = str(points_2d)
+    points_2d.spill(str(tmp_path / 'scratch.pts'))
+    assert points_2d._raw is None and points_2d._original is None
+    assert list(points_2d.x) == [1000, 1010, 1020, 1030, 1040]
+    assert str(points_2d) == text
+
+
+@pytest.mark.parametrize('options', [{}, {'lazy': True}, {'lazy': True, 'mmap': True}, {'workers': 2}],
+                         ids=['eager', 'lazy', 'lazy-mmap', 'workers'])
+def test_spill_dir(small_g01, tmp_path, options):
+    expected = written(prg.ParseRASGeo(small_g01, **options), tmp_path, 'expected.g01')
+    spill_dir = tmp_path / 'spill'
+    spill_dir.mkdir()
+    geo = prg.ParseRASGeo(small_g01, spill_dir=str(spill_dir), **options)
+    storage_areas = geo.get_storage_areas()
+    assert sorted(os.listdir(str(spill_dir))) == ['small.g01.sa0.pts', 'small.g01.sa1.pts']
+    assert [storage_area.points_2d._sidecar is not None for storage_area in storage_areas] == [True, True]
+    assert list(storage_areas[1].points_2d.x) == [1000, 1010, 1020, 1030, 1040]
+    assert written(geo, tmp_path) == expected
+
+
+def test_spill_dir_and_cache(small_g01, tmp_path):
+    with pytest.raises(AttributeError):
+        prg.ParseRASGeo(small_g01, cache=str(tmp_path / 'cache'), spill_dir=str(tmp_path))
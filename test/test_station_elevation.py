@@ -0,0 +1,46 @@
+"""
+Cross section station/elevation points stored in arrays of doubles
+"""
+from array import array
+
+import pytest
+
+import parserasgeo as prg
+
+
+@pytest.fixture
+def sta_elev(small_g01):
+    return prg.ParseRASGeo(small_g01).get_cross_sections()[0].sta_elev
+
+
+def test_arrays(sta_elev):
+    assert isinstance(sta_elev.stations, array) and sta_elev.stations.typecode == 'd'
+    assert list(sta_elev.stations) == [0, 10, 20, 25.5, 30, 40, 50, 60, 70, 80, 90, 100]
+    assert sta_elev.points[:4] == [(0, 100), (10, 95), (20, 90), (25.5, 89.5)]
+    assert sta_elev.elevation(25.5) == 89.5
+    with pytest.raises(AttributeError):
+        sta_elev.elevation(26)
+    assert (sta_elev.min_elevation(), sta_elev.max_elevation()) == (89.5, 105)
+
+
+def test_shift_scale_clip(sta_elev):
+    sta_elev.shift(elevation=1, station=10)
+    assert sta_elev.points[0] == (10, 101)
+    sta_elev.scale(elevation=2)
+    assert sta_elev.points[0] == (10, 202)
+    sta_elev.clip(low=190, high=200)
+    assert (sta_elev.min_elevation(), sta_elev.max_elevation()) == (190, 200)
+
+
+def test_resample(sta_elev):
+    sta_elev.resample([-5, 5, 22.75, 200])
+    assert sta_elev.points == [(-5, 100), (5, 97.5), (22.75, 89.75), (200, 105)]
+
+
+def test_written_values(sta_elev):
+    sta_elev.points[0] = (0, 99.25)
+    sta_elev.points.append((110, 106))
+    assert str(sta_elev) == ('#Sta/Elev= 13 \n'
+                             '       0   99.25      10      95      20      90    25.5    89.5      30      95\n'
+                             '      40     100      50   101.2      60   102.5      70     103      80   103.5\n'
+                             '      90     104     100     105     110     106\n')
@@ -0,0 +1,66 @@
+"""
+Storage area coordinate blocks stored in arrays, and routing the lines of storage areas to their components
+"""
+from pathlib import Path
+
+import parserasgeo as prg
+from parserasgeo.features.storage_area import Area, CellVolumeFilter, Header, Is2D, Points2D, SurfaceLine
+
+
+def written(geo, tmp_path, name='out.g01'):
+    filename = tmp_path / name
+    geo.write(str(filename))
+    return filename.read_text()
+
+
+def test_coordinates(small_g01):
+    storage_area = prg.ParseRASGeo(small_g01).get_storage_areas()[0]
+    assert storage_area.surface_line.points == [(1000, 2000), (1100, 2000), (1100, 2100)]
+    assert storage_area.points_2d.count == 5
+    assert list(storage_area.points_2d.x) == [1000, 1010, 1020, 1030, 1040]
+
+
+def test_count(small_g01):
+    surface_line = prg.ParseRASGeo(small_g01).get_storage_areas()[0].surface_line
+    assert surface_line.count == 3
+    surface_line.points.append((1000, 2100))
+    assert surface_line.count == 4
+    surface_line.count = 7
+    assert surface_line.count == 7
+    assert str(surface_line).startswith('Storage Area Surface Line= 7\n')
+    surface_line.count = None
+    assert surface_line.count == 4
+
+
+def test_count_before_decoding(small_g01, tmp_path):
+    geo = prg.ParseRASGeo(small_g01, lazy=True)
+    geo.get_storage_areas()[0].surface_line.count = 2
+    assert 'Storage Area Surface Line= 2\n' in written(geo, tmp_path)
+
+
+def test_assign_points(small_g01):
+    surface_line = prg.ParseRASGeo(small_g01).get_storage_areas()[0].surface_line
+    surface_line.points = [(1, 2), (3.5, 4)]
+    assert surface_line.x.typecode == 'd'
+    assert str(surface_line) == ('Storage Area Surface Line= 2\n'
+                                 '               1               2\n'
+                                 '             3.5               4\n')
+
+
+def test_components(small_g01):
+    storage_area = prg.ParseRASGeo(small_g01).get_storage_areas()[0]
+    assert [type(item) for item in storage_area.geo_list] == \
+        [Header, SurfaceLine, str, Area, str, Is2D, str, Points2D, str, str, CellVolumeFilter, str, str]
+    assert storage_area.is_2d.is_2d_flag == -1
+    assert storage_area.cell_volume_filter.value == '0.003'
+    # Never routed, see StorageArea.component_routes
+    assert storage_area.mannings.value is None
+
+
+def test_indented_lines_are_routed(tmp_path):
+    source = (Path(__file__).parent / 'data' / 'small.g01').read_text()
+    indented = tmp_path / 'indented.g01'
+    indented.write_text(source.replace('Storage Area Area=', '  Storage Area Area=', 1))
+    storage_area = prg.ParseRASGeo(str(indented)).get_storage_areas()[0]
+    assert [type(item) for item in storage_area.geo_list[:4]] == [Header, SurfaceLine, str, Area]
+    assert isinstance(storage_area.points_2d, Points2D)
@@ -0,0 +1,60 @@
+"""
+Compiled templates that write variants of a geometry with different values
+"""
+import pytest
+
+import parserasgeo as prg
+from parserasgeo import parameters
+
+
+@pytest.mark.parametrize('options', [{}, {'lazy': True}], ids=['eager', 'lazy'])
+def test_template(small_g01, tmp_path, options):
+    geo = prg.ParseRASGeo(small_g01, **options)
+    fields = parameters.mannings_n(geo) + parameters.lateral_weir_coefficients(geo)
+    nominal = [field.get() for field in fields]
+    template = geo.compile_template(fields)
+
+    expected = tmp_path / 'expected.g01'
+    geo.write(str(expected))
+    variant = tmp_path / 'variant.g01'
+    template.write(str(variant), nominal)
+    assert variant.read_bytes() == expected.read_bytes()
+
+    template.write(str(variant), [value * 2 for value in nominal])
+    text = variant.read_text()
+    assert text.count('       0     .12       0      10     .07       0      30     .12       0\n') == 10
+    assert text.count('Lateral Weir Coef=5.2\n') == 2
+
+
+def test_template_leaves_geometry_unchanged(small_g01, tmp_path):
+    geo = prg.ParseRASGeo(small_g01, lazy=True)
+    fields = parameters.lateral_weir_coefficients(geo)
+    template = geo.compile_template(fields)
+    template.render([1.5, 1.75])
+    assert [field.get() for field in fields] == [2.6, 2.6]
+    out = tmp_path / 'out.g01'
+    geo.write(str(out))
+    assert out.read_text().count('Lateral Weir Coef=2.6\n') == 2
+
+
+def test_number_of_values(small_g01):
+    geo = prg.ParseRASGeo(small_g01)
+    template = geo.compile_template(parameters.lateral_weir_coefficients(geo))
+    with pytest.raises(ValueError):
+        template.render([1.0])
+
+
+def test_lateral_weir_coefficient_keeps_its_text(small_g01, tmp_path):
+    source = small_g01.replace('small.g01', 'coef.g01')
+    with open(small_g01, newline='') as geo_file:
+        text = geo_file.read().replace('Lateral Weir Coef=2.6\r\n', 'Lateral Weir Coef=2.60\r\n', 1)
+    with open(source, 'w', newline='') as geo_file:
+        geo_file.write(text)
+
+    geo = prg.ParseRASGeo(source)
+    fields = parameters.lateral_weir_coefficients(geo)
+    assert [field.get() for field in fields] == [2.6, 2.6]
+    variant = tmp_path / 'variant.g01'
+    geo.compile_template(fields).write(str(variant), [2.6, 3])
+    assert 'Lateral Weir Coef=2.60\n' in variant.read_text()
+    assert 'Lateral Weir Coef=3\n' in variant.read_text()
@@ -0,0 +1,75 @@
+"""
+Decoding and formatting fixed width numeric blocks
+"""
+from array import array
+from io import StringIO
+
+import pytest
+
+from parserasgeo.features.tools import (count_fields, decode_fixed, decode_floats, format_block, format_fixed,
+                                        OriginalBlock, print_list_by_group, read_block, split_block_obs, split_by_n,
+                                        split_by_n_str, split_fields)
+
+LINES = ['       0     100      10      95\n', '    25.5    89.5\n']
+
+
+def test_read_block():
+    geo_file = StringIO(''.join(LINES[1:]) + 'Bank Sta=10,30\n')
+    assert read_block(LINES[0], geo_file) == (LINES, 'Bank Sta=10,30\n')
+
+
+def test_split_fields():
+    assert split_fields(LINES, 8) == ['       0', '     100', '      10', '      95', '    25.5', '    89.5']
+    assert count_fields(LINES, 8) == 6
+    assert split_fields(['   1   2  3\n'], 4) == ['   1', '   2', '  3']
+    assert count_fields(['   1   2  3\n'], 4) == 3
+
+
+def test_decode():
+    assert decode_fixed(LINES, 8) == [0, 100, 10, 95, 25.5, 89.5]
+    assert [type(value) for value in decode_fixed(LINES, 8)[:2]] == [int, int]
+    assert decode_floats(LINES, 8) == array('d', [0, 100, 10, 95, 25.5, 89.5])
+    assert decode_fixed(['       5        \n'], 8, blanks=True) == [5, '']
+
+
+def test_line_functions():
+    assert split_by_n('       0    .035\n', 8) == [0, 0.035]
+    assert split_by_n_str('       0    .035\n', 8) == ['       0', '    .035']
+    assert split_block_obs('       0        \n', 8) == [0, '']
+
+
+@pytest.mark.parametrize('value, text', [
+    (0.035, '    .035'),
+    (-0.035, '   -.035'),
+    (1.0, '       1'),
+    (5, '       5'),
+    (100.5, '   100.5'),
+    (0.1 + 0.2, '      .3'),
+    (0.123456789, '.1234568'),
+    (123456.789, '123456.8'),
+    (1234567.89, ' 1234568'),
+    ('abcdefghij', 'abcdefgh'),
+])
+def test_format_fixed(value, text):
+    assert format_fixed(value, 8) == text
+
+
+def test_format_block():
+    values = decode_fixed(LINES, 8)
+    assert format_block(values, 8, 4) == '       0     100      10      95\n    25.5    89.5\n'
+    assert format_block(array('d', values), 8, 4) == format_block(values, 8, 4)
+    assert format_block(values, 8, 10) == '       0     100      10      95    25.5    89.5\n'
+    assert format_block([], 8, 10) == ''
+    assert print_list_by_group(values, 8, 4) == format_block(values, 8, 4)
+
+
+def test_original_block():
+    lines = ['   0.000   100.0      10   95.00\n']
+    original = OriginalBlock(lines, 8, decode_fixed(lines, 8))
+    assert original.unchanged([0, 100, 10, 95])
+    assert not original.unchanged([0, 100, 10])
+    assert original.fields() == ['   0.000', '   100.0', '      10', '   95.00']
+    assert original.tokens()[1] == (100, '   100.0')
+    assert format_block([0, 100, 10, 95], 8, 4, original) == lines[0]
+    # Values that did not change keep their text
+    assert format_block([0, 100, 10, 96.5, 1], 8, 4, original) == '   0.000   100.0      10    96.5\n       1\n'
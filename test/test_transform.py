@@ -0,0 +1,44 @@
+"""
+Copying a geometry file and altering features on the way with transform()
+"""
+import difflib
+from pathlib import Path
+
+import pytest
+
+import parserasgeo as prg
+from parserasgeo.features import CrossSection
+
+
+def changed_lines(source_filename, filename):
+    """Returns the lines of filename that differ from source_filename"""
+    source = Path(source_filename).read_text().splitlines()
+    output = Path(filename).read_text().splitlines()
+    return [line[1:] for line in difflib.unified_diff(source, output, lineterm='', n=0)
+            if line[:1] in '+-' and line[:3] not in ('---', '+++')]
+
+
+def test_unchanged_features_are_copied(small_g01, tmp_path):
+    out = tmp_path / 'out.g01'
+    count = prg.transform(small_g01, str(out), {object: lambda feature: None})
+    assert count == 23
+    assert out.read_bytes() == Path(small_g01).read_bytes()
+
+
+def test_changed_features_are_rewritten(small_g01, tmp_path):
+    def scale(xs):
+        if xs.header.station.value == 5040:
+            xs.mannings_n.values = [(sta, n * 2, other) for sta, n, other in xs.mannings_n.values]
+
+    out = str(tmp_path / 'out.g01')
+    assert prg.transform(small_g01, out, {CrossSection: scale}) == 10
+    # One cross section at 5040 on each reach
+    assert changed_lines(small_g01, out) == ['       0     .06       0      10    .035       0      30     .06       0',
+                                             '       0     .12       0      10     .07       0      30     .12       0'] * 2
+    # River/reaches are imported to follow the river and reach, but are copied
+    assert 'River Reach=Creek           ,Upper           ' in Path(out).read_text()
+
+
+def test_can_not_overwrite_source(small_g01):
+    with pytest.raises(AttributeError):
+        prg.transform(small_g01, small_g01, {CrossSection: lambda xs: None})
@@ -0,0 +1,80 @@
+"""
+Importing features in worker processes
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pytest
+
+import parserasgeo as prg
+from parserasgeo.blocks import LazyFeature
+from parserasgeo.features import StorageArea
+
+
+@pytest.fixture
+def pools(monkeypatch):
+    """
+    Pretends there are four CPUs so workers=2 uses a process pool, and records the pools that are created
+    """
+    created = []
+
+    def pool(method):
+        def executor(max_workers):
+            created.append(max_workers)
+            return ProcessPoolExecutor(max_workers, mp_context=multiprocessing.get_context(method))
+        monkeypatch.setattr('parserasgeo.prg.ProcessPoolExecutor', executor)
+        return created
+
+    monkeypatch.setattr(os, 'cpu_count', lambda: 4)
+    return pool
+
+
+def written(geo, tmp_path, name='out.g01'):
+    filename = tmp_path / name
+    geo.write(str(filename))
+    return filename.read_bytes()
+
+
+def test_workers_round_trip(small_g01, tmp_path):
+    geo = prg.ParseRASGeo(small_g01, workers=2)
+    assert written(geo, tmp_path) == Path(small_g01).read_bytes()
+
+
+@pytest.mark.parametrize('method', ['fork', 'spawn'])
+def test_process_pool(small_g01, tmp_path, pools, method):
+    created = pools(method)
+    geo = prg.ParseRASGeo(small_g01, workers=2)
+    assert created == [2]
+    assert not any(type(item) is LazyFeature for item in geo.geo_list)
+    assert len(geo.get_cross_sections()) == 10
+    assert geo.get_storage_areas()[1].header.name == 'Pond2'
+    assert written(geo, tmp_path) == Path(small_g01).read_bytes()
+
+
+def test_process_pool_tracks_changes(small_g01, tmp_path, pools):
+    pools('spawn')
+    geo = prg.ParseRASGeo(small_g01, workers=2)
+    geo.get_cross_sections()[0].header.lob_length = 12.5
+    source = Path(small_g01).read_bytes()
+    assert written(geo, tmp_path) == source.replace(b'= 1 ,5050.5  ,100.5,', b'= 1 ,5050.5  ,12.5,', 1)
+
+
+def test_workers_match_eager_import(small_g01, pools):
+    pools('fork')
+    eager = prg.ParseRASGeo(small_g01)
+    parallel = prg.ParseRASGeo(small_g01, workers=3)
+    assert [type(item) for item in parallel.geo_list] == [type(item) for item in eager.geo_list]
+    for xs, eager_xs in zip(parallel.get_cross_sections(), eager.get_cross_sections()):
+        assert (xs.river, xs.reach, xs.header.station.id) == \
+            (eager_xs.river, eager_xs.reach, eager_xs.header.station.id)
+        assert list(xs.sta_elev.points) == list(eager_xs.sta_elev.points)
+
+
+def test_one_cpu_imports_in_this_process(small_g01, monkeypatch):
+    monkeypatch.setattr(os, 'cpu_count', lambda: 1)
+    monkeypatch.setattr('parserasgeo.prg.ProcessPoolExecutor', None)
+    geo = prg.ParseRASGeo(small_g01, workers=4)
+    assert not any(type(item) is LazyFeature for item in geo.geo_list)
+    assert isinstance(geo.get_storage_areas()[0], StorageArea)
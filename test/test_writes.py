@@ -0,0 +1,120 @@
+"""
+Only features that were changed are written from their parts, the rest are copied from the source
+"""
+import difflib
+import pickle
+from pathlib import Path
+
+import pytest
+
+import parserasgeo as prg
+from parserasgeo.features import cross_section
+from parserasgeo.features.tools import is_changed
+
+MODES = pytest.mark.parametrize('options', [{'lazy': True}, {'lazy': True, 'mmap': True}, {'workers': 2}],
+                                ids=['lazy', 'lazy-mmap', 'workers'])
+
+
+# First lines of the top level features in small.g01
+FEATURE_PREFIXES = ('Type RM Length L Ch R', 'River Reach=', 'Junct Name=', 'Storage Area=')
+
+
+def changed_features(source_filename, filename):
+    """Returns the first lines of the features of source_filename with lines that differ in filename"""
+    source = Path(source_filename).read_text().splitlines()
+    output = Path(filename).read_text().splitlines()
+    starts = [i for i, line in enumerate(source) if line.startswith(FEATURE_PREFIXES)]
+    features = []
+    for tag, i1, _, _, _ in difflib.SequenceMatcher(None, source, output, autojunk=False).get_opcodes():
+        if tag != 'equal':
+            start = max(start for start in starts if start <= max(i1 - (tag == 'insert'), 0))
+            if source[start] not in features:
+                features.append(source[start])
+    return features
+
+
+def changed_lines(source_filename, filename):
+    """Returns the lines of filename that differ from source_filename"""
+    source = Path(source_filename).read_text().splitlines()
+    output = Path(filename).read_text().splitlines()
+    return [line[1:] for line in difflib.unified_diff(source, output, lineterm='', n=0)
+            if line[:1] in '+-' and line[:3] not in ('---', '+++')]
+
+
+def write_after(small_g01, tmp_path, options, edit):
+    geo = prg.ParseRASGeo(small_g01, **options)
+    edit(geo)
+    out = str(tmp_path / 'out.g01')
+    geo.write(out)
+    return out
+
+
+@MODES
+def test_unchanged_after_reading(small_g01, tmp_path, options):
+    def read_everything(geo):
+        for xs in geo.get_cross_sections():
+            xs.sta_elev.points
+            xs.mannings_n.values
+        for storage_area in geo.get_storage_areas():
+            storage_area.points_2d.x
+        geo.get_lateral_weirs()
+
+    assert changed_lines(small_g01, write_after(small_g01, tmp_path, options, read_everything)) == []
+
+
+@MODES
+def test_changed_header(small_g01, tmp_path, options):
+    def edit(geo):
+        geo.get_cross_sections()[3].header.lob_length = 12.5
+
+    changes = changed_lines(small_g01, write_after(small_g01, tmp_path, options, edit))
+    assert changes == ['Type RM Length L Ch R = 1 ,5020.5  ,100.5,110.5,120.5',
+                       'Type RM Length L Ch R = 1 ,5020.5  ,12.5,110.5,120.5']
+
+
+@MODES
+@pytest.mark.parametrize('edit', [
+    lambda xs: xs.mannings_n.values.__setitem__(0, (0, 0.5, 0)),
+    lambda xs: xs.sta_elev.points.__setitem__(0, (1.0, 2.0)),
+    lambda xs: xs.sta_elev.elevations.__setitem__(0, 99.0),
+    lambda xs: xs.sta_elev.shift(elevation=1),
+    lambda xs: xs.geo_list.insert(1, 'Foo=1\n'),
+], ids=['mannings-in-place', 'points-view', 'array', 'shift', 'geo-list'])
+def test_changed_parts(small_g01, tmp_path, options, edit):
+    out = write_after(small_g01, tmp_path, options, lambda geo: edit(geo.get_cross_sections()[3]))
+    assert changed_features(small_g01, out) == ['Type RM Length L Ch R = 1 ,5020.5  ,100.5,110.5,120.5']
+
+
+@MODES
+def test_changed_storage_area_points(small_g01, tmp_path, options):
+    def edit(geo):
+        geo.get_storage_areas()[0].surface_line.x[0] = 1.0
+
+    out = write_after(small_g01, tmp_path, options, edit)
+    # The storage area is written from its parts, see test_roundtrip.EAGER_REWRITTEN
+    assert changed_features(small_g01, out) == ['Storage Area=Pond1           ,1000,2000']
+    assert '               1            2000\n' in Path(out).read_text()
+
+
+def test_only_changed_feature_is_rewritten(small_g01, tmp_path):
+    def edit(geo):
+        for xs in geo.get_cross_sections(river='Creek', reach='Upper', station_value=5040):
+            xs.mannings_n.values = [(sta, n * 2, other) for sta, n, other in xs.mannings_n.values]
+
+    changes = changed_lines(small_g01, write_after(small_g01, tmp_path, {'lazy': True}, edit))
+    assert changes == ['       0     .06       0      10    .035       0      30     .06       0',
+                       '       0     .12       0      10     .07       0      30     .12       0']
+
+
+
+@MODES
+def test_parts_keep_their_class(small_g01, options):
+    geo = prg.ParseRASGeo(small_g01, **options)
+    xs = geo.get_cross_sections()[3]
+    xs.sta_elev.points
+    assert type(xs.header) is cross_section.Header
+    assert type(xs.sta_elev) is cross_section.StationElevation
+    assert type(pickle.loads(pickle.dumps(xs.header))) is cross_section.Header
+    assert not is_changed(xs.header)
+    xs.header.lob_length = 12.5
+    assert is_changed(xs.header) and type(xs.header) is cross_section.Header